@@ -1,19 +1,10 @@
-def filter_words(input_file, output_file, word_length):
-    words = []
-    with open(input_file, 'r') as infile:
-        for word in infile:
-            word = word.strip()
-            if len(word) == word_length:
-                words.append(word)
-    
-    words.sort()
-    
-    with open(output_file, 'w') as outfile:
-        for word in words:
-            outfile.write(word + '\n')
+import os
+import sys
 
-# Filter 5-letter words
-filter_words('sowpods.txt', '5_letter.txt', 5)
+# Regenerate the 3- and 5-letter dictionaries from sowpods.txt next to this file
+here = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(here)))
 
-# Filter 3-letter words
-filter_words('sowpods.txt', '3_letter.txt', 3)
\ No newline at end of file
+from src.scripts.filter_words import partition_words
+
+partition_words(os.path.join(here, 'sowpods.txt'), [3, 5], here)
@@ -1,6 +1,8 @@
 import os
 import urllib.request
-from src.scripts.build_graph import build_graph
+from src.scripts.build_graph import ALL_WORD_LENGTHS
+from src.scripts.build_manifest import rebuild_stale
+from src.scripts.filter_words import dictionary_path, partition_words
 
 def download_dictionary():
 	"""Download and prepare dictionary files"""
@@ -14,29 +16,23 @@ def download_dictionary():
 		url = "https://raw.githubusercontent.com/jesstess/Scrabble/master/sowpods.txt"
 		urllib.request.urlretrieve(url, sowpods_path)
 	
-	# Create length-specific dictionaries
-	def create_length_dictionary(length):
-		output_path = f"data/dictionaries/{length}_letter.txt"
-		if not os.path.exists(output_path):
-			print(f"Creating {length}-letter dictionary...")
-			with open(sowpods_path, 'r', encoding='utf-8') as infile:
-				words = [word.strip().lower() for word in infile if len(word.strip()) == length]
-			
-			with open(output_path, 'w', encoding='utf-8') as outfile:
-				outfile.write('\n'.join(words))
-			print(f"Created {length}-letter dictionary with {len(words)} words")
-	
-	# Create dictionaries for both 3 and 5 letter words
-	create_length_dictionary(3)
-	create_length_dictionary(5)
+	# Split the master list into per-length dictionaries in one pass
+	missing = [length for length in ALL_WORD_LENGTHS if not os.path.exists(dictionary_path(length))]
+	if missing:
+		print("Creating length dictionaries...")
+		counts = partition_words(sowpods_path, missing)
+		for length in missing:
+			print(f"Created {length}-letter dictionary with {counts.get(length, 0)} words")
 
 if __name__ == "__main__":
 	print("Setting up Word Ladder Adventure...")
 	download_dictionary()
 	
-	# Build initial graphs
+	# Build missing or out-of-date graphs
 	print("\nBuilding word graphs...")
-	build_graph(3)
-	build_graph(5)
+	# Lengths the word list has no words for get no dictionary and no graph
+	lengths = [length for length in ALL_WORD_LENGTHS if os.path.exists(dictionary_path(length))]
+	if not rebuild_stale(lengths):
+		print("All graphs are up to date")
 	
 	print("\nSetup complete! You can now run main.py")
\ No newline at end of file
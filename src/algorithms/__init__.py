@@ -0,0 +1,32 @@
+from src.algorithms.astar import AStarPathFinder
+from src.algorithms.bfs import BFSPathFinder
+from src.algorithms.ucs import UCSPathFinder
+from src.algorithms.bidirectional import (
+	BidirectionalAStarPathFinder,
+	BidirectionalBFSPathFinder,
+	BidirectionalUCSPathFinder
+)
+
+# Display name -> path finder class, in the order the UI lists them
+PATH_FINDERS = {
+	'A*': AStarPathFinder,
+	'UCS': UCSPathFinder,
+	'BFS': BFSPathFinder,
+	'Bi-A*': BidirectionalAStarPathFinder,
+	'Bi-UCS': BidirectionalUCSPathFinder,
+	'Bi-BFS': BidirectionalBFSPathFinder
+}
+
+def create_path_finder(algorithm: str, graph_data, **options):
+	"""Instantiate the path finder registered under algorithm (options go to its constructor)"""
+	try:
+		finder_class = PATH_FINDERS[algorithm]
+	except KeyError:
+		raise ValueError(f"Unknown algorithm: {algorithm}")
+	return finder_class(graph_data, **options)
+
+__all__ = [
+	'AStarPathFinder', 'BFSPathFinder', 'UCSPathFinder',
+	'BidirectionalAStarPathFinder', 'BidirectionalBFSPathFinder', 'BidirectionalUCSPathFinder',
+	'PATH_FINDERS', 'create_path_finder'
+]
@@ -1,64 +1,187 @@
-import heapq
-from typing import Dict, List, Set, Tuple
+from operator import getitem
+from string import ascii_lowercase as LETTERS
+from typing import Dict, List, Optional, Tuple
+from src.core.cost_model import get_cost_model
+from src.core.heap_queue import HeapQueue
+from src.core.indexed_heap import IndexedHeap
+from src.algorithms.base import PathFinder, hamming_distance
 
-class AStarPathFinder:
-	def __init__(self, graph_data: Dict):
-		self.graph = graph_data["graph"]
-		self.words = set(graph_data["words"])
-		self.stats = {
-			"nodes_explored": 0,
-			"path_length": 0,
-			"total_cost": 0,
-			"execution_time": 0
-		}
+# Relative slack taken off the position-aware and landmark bounds: graph
+# files store edge costs and landmark distances as float32, which can round
+# a ladder's cost slightly below a bound
+POSITION_BOUND_SLACK = 1e-6
+
+class AStarPathFinder(PathFinder):
+	HEURISTICS = ('hamming', 'position', 'alt')
+	weighted = True
+	reports_frontier = True
+	
+	def __init__(self, graph_data, heuristic: Optional[str] = None, cost_model=None, indexed_heap=False):
+		super().__init__(graph_data)
+		# Named edge weighting to search under; None uses the graph's own costs
+		model = get_cost_model(cost_model or self.graph.cost_model)
+		self.cost_model = cost_model if cost_model is None else model.name
+		self.model = model
+		self.heuristic = self._check_heuristic(heuristic or self._default_heuristic())
+		# Each differing letter needs at least one change, which costs at
+		# least min_edge_cost; capped at 1 to keep the plain Hamming count
+		self.hamming_scale = min(1.0, model.min_edge_cost(self.graph.word_length))
+		# Keep one frontier entry per node (decrease-key) instead of pushing duplicates
+		self.indexed_heap = indexed_heap
+		# h per node, computed when a search first reaches the node and reused
+		# when its g_score improves; valid for the nodes stamped by that search
+		self._h_scores = [0.0] * len(self.graph)
+	
+	def _default_heuristic(self) -> str:
+		"""The landmark bound where the graph's landmarks hold for the searched costs, else the position bound"""
+		if self.graph.landmarks and self.model.name == self.graph.cost_model:
+			return 'alt'
+		return 'position'
 	
-	def hamming_distance(self, word1: str, word2: str) -> int:
-		"""Calculate Hamming distance (number of differing positions)"""
-		return sum(1 for a, b in zip(word1, word2) if a != b)
+	def _check_heuristic(self, heuristic: str) -> str:
+		if heuristic not in self.HEURISTICS:
+			raise ValueError(f"Unknown heuristic: {heuristic}")
+		if heuristic == 'alt' and not self.graph.landmarks:
+			raise ValueError("ALT heuristic needs a graph built with landmarks")
+		if heuristic == 'alt' and self.model.name != self.graph.cost_model:
+			raise ValueError(f"ALT landmarks only hold for the '{self.graph.cost_model}' cost model")
+		return heuristic
 	
-	def find_path(self, start: str, target: str) -> Tuple[List[str], Dict]:
+	def landmark_heuristic(self, target_id: int):
 		"""
-		Find shortest path using A* with Hamming distance heuristic
-		f(n) = g(n) + h(n) where:
+		ALT lower bound on the cost from a node to target_id.
+		By the triangle inequality |d(L, target) - d(L, node)| <= d(node, target)
+		for every landmark L; the best landmark is combined with the scaled
+		Hamming bound.
+		"""
+		words = self.graph.search_words()
+		target = words[target_id]
+		tables = [
+			(distances, distances[target_id])
+			for distances in self.graph.landmark_distances
+		]
+		infinity = float('inf')
+		scale = self.hamming_scale
+		slack = 1.0 - POSITION_BOUND_SLACK
+		
+		def estimate(node: int) -> float:
+			best = scale * hamming_distance(words[node], target)
+			for distances, to_target in tables:
+				from_node = distances[node]
+				if from_node == to_target:
+					continue
+				if from_node == infinity or to_target == infinity:
+					# Landmark reaches only one of them: target is unreachable
+					return infinity
+				bound = slack * abs(to_target - from_node)
+				if bound > best:
+					best = bound
+			return best
+		
+		return estimate
+	
+	def position_heuristic(self, target_id: int):
+		"""
+		Position-aware lower bound: for every position where node differs
+		from the target, the cheapest way to change that letter into the
+		target's at that position, from the cost model's letter distances
+		"""
+		words = self.graph.search_words()
+		target = words[target_id]
+		distances = self.model.letter_distances(len(target))
+		scale = 1.0 - POSITION_BOUND_SLACK
+		# Per position, the bound from each letter to the target's letter
+		# there (0 for the target's letter itself), keyed by letter
+		rows = [
+			dict(zip(LETTERS, (scale * cost for cost in distances[i, :, ord(letter) - ord('a')].tolist())))
+			for i, letter in enumerate(target)
+		]
+		
+		def estimate(node: int) -> float:
+			return sum(map(getitem, rows, words[node]))
+		
+		return estimate
+	
+	def heuristic_for(self, target_id: int, heuristic: str = None):
+		"""h(node) for heuristic (default the configured one)"""
+		heuristic = heuristic or self.heuristic
+		if heuristic == 'alt':
+			return self.landmark_heuristic(target_id)
+		if heuristic == 'position':
+			return self.position_heuristic(target_id)
+		words = self.graph.search_words()
+		target = words[target_id]
+		scale = self.hamming_scale
+		return lambda node: scale * hamming_distance(words[node], target)
+	
+	def find_path(self, start: str, target: str, heuristic: str = None) -> Tuple[List[str], Dict]:
+		"""
+		Find cheapest path using A*, expanding by f(n) = g(n) + h(n) where:
 		g(n) = path cost to reach node
-		h(n) = Hamming distance to target (admissible heuristic)
+		h(n) = admissible lower bound on the cost from node to target: the
+		landmark bound ('alt'), the position-aware letter bound ('position')
+		or the scaled Hamming distance ('hamming'); heuristic overrides the
+		finder's choice for this query
 		"""
-		if start not in self.words or target not in self.words:
+		if heuristic is not None:
+			self._check_heuristic(heuristic)
+		start_id = self.graph.id_of(start)
+		target_id = self.graph.id_of(target)
+		if start_id is None or target_id is None:
 			return [], self.stats
-			
-		# Priority queue entries are (f_score, g_score, word, path)
-		# f_score = g_score + h_score (Hamming distance)
-		start_h = self.hamming_distance(start, target)
-		frontier = [(start_h, 0, start, [start])]  # Initial f_score is just h_score
-		visited = {start: 0}  # word -> g_score
-		self.stats["nodes_explored"] = 0
+		
+		frontier = IndexedHeap(len(self.graph)) if self.indexed_heap else HeapQueue()
+		return self._search(frontier, self.heuristic_for(target_id, heuristic), start_id, target_id)
+	
+	def _search(self, frontier, heuristic, start_id: int, target_id: int) -> Tuple[List[str], Dict]:
+		"""
+		Expand nodes by lowest f_score from frontier, any queue with
+		push(node, key), pop() -> (key, node) and len(). A closed node whose
+		g_score improves is simply queued again.
+		"""
+		offsets, neighbors, costs = self.graph.search_lists(self.graph.costs_for(self.cost_model))
+		push, pop = frontier.push, frontier.pop
+		
+		# g_scores[node] is the best g_score found so far, h_scores[node] its
+		# heuristic and parents[node] its predecessor on that path, for nodes
+		# stamped with this generation
+		arrays = self.search_arrays()
+		generation = arrays.start(start_id)
+		stamps, g_scores, parents = arrays.stamps, arrays.costs, arrays.parents
+		h_scores = self._h_scores
+		h_scores[start_id] = heuristic(start_id)
+		push(start_id, h_scores[start_id])  # Initial f_score is just h_score
+		explored = 0
+		peak_frontier = 1
 		
 		while frontier:
-			f_score, g_score, current_word, path = heapq.heappop(frontier)
-			self.stats["nodes_explored"] += 1
+			if len(frontier) > peak_frontier:
+				peak_frontier = len(frontier)
+			f_score, current = pop()
+			explored += 1
+			g_score = g_scores[current]
 			
-			if current_word == target:
-				self.stats["path_length"] = len(path) - 1
-				self.stats["total_cost"] = g_score
-				return path, self.stats
+			if current == target_id:
+				return self._finish(parents, target_id, explored, g_score, peak_frontier)
 			
-			# Skip if we've found a better path
-			if current_word in visited and g_score > visited[current_word]:
+			# Skip entries left behind when a better path to current was found
+			if f_score > g_score + h_scores[current]:
 				continue
 			
 			# Explore neighbors
-			for next_word, edge_cost in self.graph[current_word].items():
-				new_g_score = g_score + edge_cost
+			for i in range(offsets[current], offsets[current + 1]):
+				next_node = neighbors[i]
+				new_g_score = g_score + costs[i]
 				
-				if next_word not in visited or new_g_score < visited[next_word]:
-					visited[next_word] = new_g_score
-					h_score = self.hamming_distance(next_word, target)
-					f_score = new_g_score + h_score  # f(n) = g(n) + h(n)
-					heapq.heappush(frontier, (f_score, new_g_score, next_word, path + [next_word]))
+				if stamps[next_node] != generation:
+					stamps[next_node] = generation
+					h_score = h_scores[next_node] = heuristic(next_node)
+				elif new_g_score < g_scores[next_node]:
+					h_score = h_scores[next_node]
+				else:
+					continue
+				g_scores[next_node] = new_g_score
+				parents[next_node] = current
+				push(next_node, new_g_score + h_score)  # f(n) = g(n) + h(n)
 		
-		return [], self.stats
-	
-	def get_next_step(self, current: str, target: str) -> str:
-		"""Get next word in the path for hint system"""
-		path, _ = self.find_path(current, target)
-		return path[1] if len(path) > 1 else current
\ No newline at end of file
+		return self._finish(None, target_id, explored, peak_frontier=peak_frontier)
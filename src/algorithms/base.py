@@ -0,0 +1,65 @@
+from operator import ne
+from typing import Dict, List, Optional, Tuple
+from src.core.word_graph import SearchArrays, ensure_word_graph
+
+def hamming_distance(word1: str, word2: str) -> int:
+	"""Calculate Hamming distance (number of differing positions)"""
+	# map() keeps the comparison loop in C; heuristics call this on every node
+	return sum(map(ne, word1, word2))
+
+class PathFinder:
+	"""Interface shared by the path finders: find_path plus the hint lookup built on it"""
+	# Shortest means fewest steps (False) or cheapest by edge cost (True)
+	weighted = False
+	# Whether stats report the largest frontier a search held
+	reports_frontier = False
+	# Reusable search lists, allocated per finder by search_arrays()
+	_search_arrays: Tuple[SearchArrays, ...] = ()
+
+	def __init__(self, graph_data):
+		self.graph = ensure_word_graph(graph_data)
+		self.stats = self.empty_stats()
+
+	@classmethod
+	def empty_stats(cls) -> Dict:
+		"""The stats find_path reports, zeroed, as for a search that found nothing"""
+		stats = {
+			"nodes_explored": 0,
+			"path_length": 0,
+			"total_cost": 0,
+			"execution_time": 0
+		}
+		if cls.reports_frontier:
+			stats["peak_frontier"] = 0
+		return stats
+
+	def find_path(self, start: str, target: str) -> Tuple[List[str], Dict]:
+		raise NotImplementedError
+
+	def get_next_step(self, current: str, target: str) -> str:
+		"""Get next word in the path for hint system"""
+		path, _ = self.find_path(current, target)
+		return path[1] if len(path) > 1 else current
+
+	def search_arrays(self, index: int = 0) -> SearchArrays:
+		"""This finder's index-th set of reusable search lists, allocated on first use"""
+		while len(self._search_arrays) <= index:
+			self._search_arrays += (SearchArrays(len(self.graph)),)
+		return self._search_arrays[index]
+
+	def _finish(self, parents, target_id: int, explored: int, total_cost: Optional[float] = None,
+				peak_frontier: int = 0) -> Tuple[List[str], Dict]:
+		"""
+		Record a search's stats and return its path to target_id (none if
+		parents is None). total_cost defaults to the path's cost over the
+		graph's own edge costs.
+		"""
+		self.stats["nodes_explored"] = explored
+		if self.reports_frontier:
+			self.stats["peak_frontier"] = peak_frontier
+		if parents is None:
+			return [], self.stats
+		path = self.graph.reconstruct_path(parents, target_id)
+		self.stats["path_length"] = len(path) - 1
+		self.stats["total_cost"] = self.graph.path_cost(path) if total_cost is None else total_cost
+		return self.graph.path_to_words(path), self.stats
@@ -0,0 +1,97 @@
+import time
+from itertools import islice
+from multiprocessing import Pool
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from src.algorithms import create_path_finder
+from src.core.word_graph import WordGraph
+
+# (start, end, path, stats) for one query
+BatchResult = Tuple[str, str, List[str], Dict]
+
+# Per-process path finder, loaded once by _init_worker
+_worker_finder = None
+
+def _init_worker(graph_file: str, algorithm: str):
+	global _worker_finder
+	_worker_finder = create_path_finder(algorithm, WordGraph.load(graph_file))
+
+def _solve_chunk(pairs: List[Tuple[str, str]]) -> List[BatchResult]:
+	results = []
+	for start, end in pairs:
+		began = time.perf_counter()
+		path, stats = _worker_finder.find_path(start, end)
+		stats = dict(stats)
+		stats["execution_time"] = time.perf_counter() - began
+		results.append((start, end, path, stats))
+	return results
+
+def _chunks(pairs: Iterable[Tuple[str, str]], size: int) -> Iterator[List[Tuple[str, str]]]:
+	pairs = iter(pairs)
+	while True:
+		chunk = list(islice(pairs, size))
+		if not chunk:
+			return
+		yield chunk
+
+class BatchPathQuery:
+	"""
+	Solve many (start, end) pairs with one algorithm.
+	Queries fan out over a process pool in which every worker loads the
+	graph once; results stream back in input order while summary totals
+	nodes_explored and timings across the whole run.
+	"""
+	def __init__(self, graph_file: str, algorithm: str = 'A*', processes: Optional[int] = None,
+				 chunk_size: int = 64):
+		self.graph_file = graph_file
+		self.algorithm = algorithm
+		self.processes = processes
+		self.chunk_size = chunk_size
+		self.summary = self._empty_summary()
+
+	def _empty_summary(self) -> Dict:
+		return {
+			"queries": 0,
+			"paths_found": 0,
+			"nodes_explored": 0,
+			"total_path_length": 0,
+			"execution_time": 0.0,  # summed per-query search time
+			"wall_time": 0.0
+		}
+
+	def _record(self, result: BatchResult):
+		_, _, path, stats = result
+		self.summary["queries"] += 1
+		self.summary["nodes_explored"] += stats["nodes_explored"]
+		self.summary["execution_time"] += stats["execution_time"]
+		if path:
+			self.summary["paths_found"] += 1
+			self.summary["total_path_length"] += stats["path_length"]
+
+	def run(self, pairs: Iterable[Tuple[str, str]]) -> Iterator[BatchResult]:
+		"""Yield (start, end, path, stats) per pair, in input order"""
+		self.summary = self._empty_summary()
+		began = time.perf_counter()
+		chunks = _chunks(pairs, self.chunk_size)
+
+		if self.processes == 1:
+			# Run in-process: handy for debugging and tiny batches
+			_init_worker(self.graph_file, self.algorithm)
+			for chunk in chunks:
+				for result in _solve_chunk(chunk):
+					self._record(result)
+					yield result
+			self.summary["wall_time"] = time.perf_counter() - began
+			return
+
+		with Pool(self.processes, initializer=_init_worker,
+				  initargs=(self.graph_file, self.algorithm)) as pool:
+			for results in pool.imap(_solve_chunk, chunks):
+				for result in results:
+					self._record(result)
+					yield result
+		self.summary["wall_time"] = time.perf_counter() - began
+
+def find_paths(graph_file: str, pairs: Iterable[Tuple[str, str]], algorithm: str = 'A*',
+			   processes: Optional[int] = None) -> Iterator[BatchResult]:
+	"""Convenience wrapper: stream results for pairs without keeping the query object"""
+	return BatchPathQuery(graph_file, algorithm, processes).run(pairs)
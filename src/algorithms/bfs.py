@@ -1,46 +1,62 @@
 from collections import deque
-from typing import Dict, List, Set, Tuple
+from typing import Dict, List, Tuple
+from src.core.vector_bfs import VectorBFS
+from src.algorithms.base import PathFinder
 
-class BFSPathFinder:
-	def __init__(self, graph_data: Dict):
-		self.graph = graph_data["graph"]
-		self.words = set(graph_data["words"])
-		self.stats = {
-			"nodes_explored": 0,
-			"path_length": 0,
-			"execution_time": 0
-		}
+class BFSPathFinder(PathFinder):
+	weighted = False
+	
+	def __init__(self, graph_data, vectorized=False):
+		super().__init__(graph_data)
+		# Expand whole levels with NumPy instead of one node at a time
+		self.engine = VectorBFS(self.graph) if vectorized else None
 	
 	def find_path(self, start: str, target: str) -> Tuple[List[str], Dict]:
 		"""
 		Find shortest path using BFS
 		Returns: (path, statistics)
 		"""
-		if start not in self.words or target not in self.words:
+		start_id = self.graph.id_of(start)
+		target_id = self.graph.id_of(target)
+		if start_id is None or target_id is None:
 			return [], self.stats
-			
-		queue = deque([(start, [start])])
-		visited = {start}
-		self.stats["nodes_explored"] = 0
+		if self.engine is not None:
+			return self._find_path_vectorized(start_id, target_id)
+		
+		offsets, neighbors, _ = self.graph.search_lists()
+		
+		# A node is visited once stamped with this search's generation, and
+		# parents maps it to its predecessor on its BFS path
+		arrays = self.search_arrays()
+		generation = arrays.start(start_id)
+		stamps, parents = arrays.stamps, arrays.parents
+		queue = deque([start_id])
+		explored = 0
 		
 		while queue:
-			current_word, path = queue.popleft()
-			self.stats["nodes_explored"] += 1
+			current = queue.popleft()
+			explored += 1
 			
-			if current_word == target:
-				self.stats["path_length"] = len(path) - 1
-				return path, self.stats
+			if current == target_id:
+				return self._finish(parents, target_id, explored)
 			
 			# Explore neighbors
-			for next_word in self.graph[current_word]:
-				if next_word not in visited:
-					visited.add(next_word)
-					new_path = path + [next_word]
-					queue.append((next_word, new_path))
+			for next_node in neighbors[offsets[current]:offsets[current + 1]]:
+				if stamps[next_node] != generation:
+					stamps[next_node] = generation
+					parents[next_node] = current
+					queue.append(next_node)
 		
-		return [], self.stats
+		return self._finish(None, target_id, explored)
 	
-	def get_next_step(self, current: str, target: str) -> str:
-		"""Get next word in the path for hint system"""
-		path, _ = self.find_path(current, target)
-		return path[1] if len(path) > 1 else current
\ No newline at end of file
+	def _find_path_vectorized(self, start_id: int, target_id: int) -> Tuple[List[str], Dict]:
+		path, depths = self.engine.single_pair(start_id, target_id)
+		# Count expanded nodes like the queue version does: every level above
+		# the target's was expanded, the level that reached it was not
+		expanded_depth = len(depths) if path is None else len(path) - 1
+		self.stats["nodes_explored"] = int(((depths >= 0) & (depths < expanded_depth)).sum())
+		if path is None:
+			return [], self.stats
+		self.stats["path_length"] = len(path) - 1
+		self.stats["total_cost"] = self.graph.path_cost(path)
+		return self.graph.path_to_words(path), self.stats
@@ -0,0 +1,192 @@
+import heapq
+from typing import Dict, List, Tuple
+from src.core.cost_model import get_cost_model
+from src.algorithms.base import PathFinder, hamming_distance
+
+def _join_paths(graph, forward_parents, backward_parents, meet_from: int, meet_to: int) -> List[int]:
+	"""
+	Splice the two half paths at the meeting edge meet_from -> meet_to.
+	meet_from was reached by the forward search, meet_to by the backward one.
+	"""
+	path = graph.reconstruct_path(forward_parents, meet_from)
+	if meet_to != meet_from:
+		tail = graph.reconstruct_path(backward_parents, meet_to)
+		tail.reverse()
+		path.extend(tail)
+	return path
+
+class BidirectionalBFSPathFinder(PathFinder):
+	weighted = False
+	
+	def __init__(self, graph_data):
+		super().__init__(graph_data)
+
+	def find_path(self, start: str, target: str) -> Tuple[List[str], Dict]:
+		"""
+		Find shortest path using BFS from both ends at once.
+		Each round expands one whole level of the smaller frontier; once a
+		level touches the other search the best meeting point of that level
+		gives a shortest ladder.
+		Returns: (path, statistics)
+		"""
+		start_id = self.graph.id_of(start)
+		target_id = self.graph.id_of(target)
+		if start_id is None or target_id is None:
+			return [], self.stats
+
+		offsets, neighbors, _ = self.graph.search_lists()
+		self.stats["nodes_explored"] = 0
+
+		if start_id == target_id:
+			self.stats["path_length"] = 0
+			self.stats["total_cost"] = 0
+			return [start], self.stats
+
+		# One set of search lists per side: a node is reached by a side once
+		# stamped with that side's generation, and its depth sits in costs
+		sides = [self.search_arrays(0), self.search_arrays(1)]
+		generations = [sides[0].start(start_id), sides[1].start(target_id)]
+		frontiers = [[start_id], [target_id]]
+
+		while frontiers[0] and frontiers[1]:
+			# Grow whichever side has the smaller frontier
+			side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+			own, other = sides[side], sides[1 - side]
+			own_stamps, own_parents, own_depth = own.stamps, own.parents, own.costs
+			other_stamps, other_depth = other.stamps, other.costs
+			own_generation, other_generation = generations[side], generations[1 - side]
+
+			best_length = None
+			meeting = None
+			next_frontier = []
+			for current in frontiers[side]:
+				self.stats["nodes_explored"] += 1
+				next_depth = own_depth[current] + 1
+				for next_node in neighbors[offsets[current]:offsets[current + 1]]:
+					if other_stamps[next_node] == other_generation:
+						length = next_depth + other_depth[next_node]
+						if best_length is None or length < best_length:
+							best_length = length
+							meeting = (current, next_node)
+					if own_stamps[next_node] != own_generation:
+						own_stamps[next_node] = own_generation
+						own_parents[next_node] = current
+						own_depth[next_node] = next_depth
+						next_frontier.append(next_node)
+
+			if meeting is not None:
+				near, far = meeting if side == 0 else (meeting[1], meeting[0])
+				path = _join_paths(self.graph, sides[0].parents, sides[1].parents, near, far)
+				self.stats["path_length"] = len(path) - 1
+				self.stats["total_cost"] = self.graph.path_cost(path)
+				return self.graph.path_to_words(path), self.stats
+			frontiers[side] = next_frontier
+
+		return [], self.stats
+
+class BidirectionalUCSPathFinder(PathFinder):
+	weighted = True
+	
+	def __init__(self, graph_data, cost_model=None):
+		super().__init__(graph_data)
+		# Named edge weighting to search under; None uses the graph's own costs
+		self.cost_model = cost_model if cost_model is None else get_cost_model(cost_model).name
+
+	def potential(self, start: str, target: str):
+		"""
+		Node potential p(word) steering the search; plain UCS uses none.
+		The forward search orders nodes by g + p and the backward search
+		by g - p, so p must be consistent in both directions.
+		"""
+		return None
+
+	def find_path(self, start: str, target: str) -> Tuple[List[str], Dict]:
+		"""
+		Find cheapest path by running the weighted search from both ends.
+		mu is the cheapest start -> target cost seen where the two searches
+		touch. Both frontiers are keyed on potential-reduced costs, so the
+		search can stop as soon as the two frontier minima together reach mu.
+		Returns: (path, statistics)
+		"""
+		start_id = self.graph.id_of(start)
+		target_id = self.graph.id_of(target)
+		if start_id is None or target_id is None:
+			return [], self.stats
+
+		words = self.graph.search_words()
+		offsets, neighbors, costs = self.graph.search_lists(self.graph.costs_for(self.cost_model))
+		potential = self.potential(start, target)
+		self.stats["nodes_explored"] = 0
+
+		# One set of search lists per side: g_scores and parents hold for the
+		# nodes stamped with that side's generation
+		sides = [self.search_arrays(0), self.search_arrays(1)]
+		generations = [sides[0].start(start_id), sides[1].start(target_id)]
+		closed = [set(), set()]
+		# Priority queue entries are (key, g_score, node) where the key is
+		# g + p going forward and g - p going backward
+		frontiers = [
+			[(potential(words[start_id]) if potential else 0, 0, start_id)],
+			[(-potential(words[target_id]) if potential else 0, 0, target_id)]
+		]
+
+		best_cost = float('inf')
+		meeting = (start_id, start_id) if start_id == target_id else None
+		if meeting:
+			best_cost = 0
+
+		while frontiers[0] and frontiers[1]:
+			top_forward, top_backward = frontiers[0][0][0], frontiers[1][0][0]
+			if top_forward + top_backward >= best_cost:
+				break
+
+			side = 0 if top_forward <= top_backward else 1
+			sign = 1 if side == 0 else -1
+			own, other = sides[side], sides[1 - side]
+			own_stamps, own_g, own_parents = own.stamps, own.costs, own.parents
+			other_stamps, other_g = other.stamps, other.costs
+			own_generation, other_generation = generations[side], generations[1 - side]
+
+			_, g_score, current = heapq.heappop(frontiers[side])
+			# Skip stale entries
+			if current in closed[side] or g_score > own_g[current]:
+				continue
+			closed[side].add(current)
+			self.stats["nodes_explored"] += 1
+
+			for i in range(offsets[current], offsets[current + 1]):
+				next_node = neighbors[i]
+				new_g_score = g_score + costs[i]
+				if own_stamps[next_node] != own_generation or new_g_score < own_g[next_node]:
+					own_stamps[next_node] = own_generation
+					own_g[next_node] = new_g_score
+					own_parents[next_node] = current
+					p_score = sign * potential(words[next_node]) if potential else 0
+					heapq.heappush(frontiers[side], (new_g_score + p_score, new_g_score, next_node))
+
+				if other_stamps[next_node] != other_generation:
+					continue
+				through_cost = new_g_score + other_g[next_node]
+				if through_cost < best_cost:
+					best_cost = through_cost
+					meeting = (current, next_node) if side == 0 else (next_node, current)
+
+		if meeting is None:
+			return [], self.stats
+
+		path = _join_paths(self.graph, sides[0].parents, sides[1].parents, *meeting)
+		self.stats["path_length"] = len(path) - 1
+		self.stats["total_cost"] = best_cost
+		return self.graph.path_to_words(path), self.stats
+
+class BidirectionalAStarPathFinder(BidirectionalUCSPathFinder):
+	def potential(self, start: str, target: str):
+		"""
+		Average of the forward and backward Hamming heuristics,
+		p(word) = (h_target(word) - h_start(word)) / 2, which keeps both
+		searches consistent and lets them share one stopping rule.
+		Hamming counts are scaled by the cheapest possible edge (capped at 1).
+		"""
+		model = get_cost_model(self.cost_model or self.graph.cost_model)
+		scale = min(1.0, model.min_edge_cost(self.graph.word_length)) / 2
+		return lambda word: scale * (hamming_distance(word, target) - hamming_distance(word, start))
@@ -0,0 +1,108 @@
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+from src.algorithms import PATH_FINDERS, create_path_finder
+from src.algorithms.base import PathFinder
+from src.core.graph_repository import graph_repository
+from src.core.shortest_paths import ShortestPathTree
+from src.core.word_graph import ensure_word_graph
+
+# Algorithms whose search from a start word is a plain single-source
+# expansion, so one completed tree answers every target
+TREE_SEARCHES = {
+	'BFS': False,
+	'UCS': True
+}
+
+class SearchTreeCache:
+	"""
+	LRU caches of completed searches. BFS and UCS searches are kept as full
+	shortest-path trees keyed by (graph, algorithm, source), at most
+	max_entries of them; the goal-directed algorithms (A* and the
+	bidirectional searches) keep each (path, stats) they produced, keyed by
+	(graph, algorithm, source, target), at most max_results of them. One
+	finder per graph and algorithm runs the searches, built on first miss.
+	"""
+	def __init__(self, max_entries: int = 32, max_results: int = 1024):
+		self.max_entries = max_entries
+		self.max_results = max_results
+		self._entries = OrderedDict()
+		self._results = OrderedDict()
+		self._finders: Dict[Tuple, PathFinder] = {}
+		self.hits = 0
+		self.misses = 0
+	
+	def __len__(self) -> int:
+		return len(self._entries) + len(self._results)
+	
+	def clear(self):
+		self._entries.clear()
+		self._results.clear()
+		self._finders.clear()
+	
+	def discard(self, graph):
+		"""Drop every entry for graph, so a replaced graph (and its file mapping) can be freed"""
+		for entries in (self._entries, self._results, self._finders):
+			for key in [key for key in entries if key[0] is graph]:
+				del entries[key]
+	
+	def _lookup(self, entries: OrderedDict, limit: int, key, build):
+		entry = entries.get(key)
+		if entry is not None:
+			self.hits += 1
+			entries.move_to_end(key)
+			return entry
+		self.misses += 1
+		entry = build()
+		entries[key] = entry
+		if len(entries) > limit:
+			entries.popitem(last=False)
+		return entry
+	
+	def _finder(self, graph, algorithm: str) -> PathFinder:
+		finder = self._finders.get((graph, algorithm))
+		if finder is None:
+			finder = self._finders[(graph, algorithm)] = create_path_finder(algorithm, graph)
+		return finder
+	
+	def tree(self, graph, algorithm: str, source: int) -> ShortestPathTree:
+		"""Completed BFS ('BFS') or Dijkstra ('UCS') tree rooted at source"""
+		if algorithm not in TREE_SEARCHES:
+			raise ValueError(f"{algorithm} does not produce a single-source tree")
+		weighted = TREE_SEARCHES[algorithm]
+		return self._lookup(
+			self._entries, self.max_entries, (graph, algorithm, source),
+			lambda: ShortestPathTree.build(graph, source, weighted=weighted)
+		)
+	
+	def find_path(self, graph, algorithm: str, start: str, target: str) -> Tuple[List[str], Dict]:
+		"""Same contract as PathFinder.find_path, answered from the cache when possible"""
+		if algorithm not in PATH_FINDERS:
+			raise ValueError(f"Unknown algorithm: {algorithm}")
+		graph = ensure_word_graph(graph)
+		start_id = graph.id_of(start)
+		target_id = graph.id_of(target)
+		if start_id is None or target_id is None:
+			return [], PathFinder.empty_stats()
+		
+		if algorithm in TREE_SEARCHES:
+			tree = self.tree(graph, algorithm, start_id)
+			path = tree.path_from_root(target_id)
+			if not path:
+				return [], PathFinder.empty_stats()
+			return graph.path_to_words(path), {
+				"nodes_explored": tree.order[target_id] + 1,
+				"path_length": len(path) - 1,
+				"total_cost": tree.distances[target_id] if tree.weighted else graph.path_cost(path),
+				"execution_time": 0
+			}
+		
+		def search():
+			path, stats = self._finder(graph, algorithm).find_path(start, target)
+			return path, dict(stats)
+		path, stats = self._lookup(self._results, self.max_results, (graph, algorithm, start_id, target_id), search)
+		return list(path), dict(stats)
+
+# Shared by every screen so trees survive screen switches; graphs the
+# repository drops are dropped from it too
+search_tree_cache = SearchTreeCache()
+graph_repository.add_drop_listener(search_tree_cache.discard)
@@ -1,56 +1,91 @@
-import heapq
-from typing import Dict, List, Set, Tuple
+from typing import Dict, List, Tuple
+from src.core.cost_model import DEFAULT_COST_RESOLUTION, get_cost_model
+from src.core.heap_queue import HeapQueue
+from src.core.indexed_heap import IndexedHeap
+from src.core.bucket_queue import BucketQueue
+from src.algorithms.base import PathFinder
 
-class UCSPathFinder:
-	def __init__(self, graph_data: Dict):
-		self.graph = graph_data["graph"]
-		self.words = set(graph_data["words"])
-		self.stats = {
-			"nodes_explored": 0,
-			"path_length": 0,
-			"total_cost": 0,
-			"execution_time": 0
-		}
+class UCSPathFinder(PathFinder):
+	weighted = True
+	reports_frontier = True
+	
+	def __init__(self, graph_data, cost_model=None, indexed_heap=False, bucket_queue=False,
+				 cost_resolution=None):
+		super().__init__(graph_data)
+		# Named edge weighting to search under; None uses the graph's own costs
+		self.cost_model = cost_model if cost_model is None else get_cost_model(cost_model).name
+		# Keep one frontier entry per node (decrease-key) instead of pushing duplicates
+		self.indexed_heap = indexed_heap
+		# Dial's algorithm over integer costs in units of 1 / cost_resolution
+		# (default the graph's own resolution); paths are cheapest under the
+		# rounded costs, and equal-cost paths resolve first in, first out
+		self.bucket_queue = bucket_queue
+		if bucket_queue:
+			self.quantized_costs = self.graph.quantized_costs(self.cost_model, cost_resolution)
+			self.cost_resolution = cost_resolution or self.graph.cost_resolution or DEFAULT_COST_RESOLUTION
+			self.max_edge_cost = max(self.quantized_costs, default=0)
 	
 	def find_path(self, start: str, target: str) -> Tuple[List[str], Dict]:
 		"""
 		Find shortest path using UCS - expands node with lowest path cost g(n)
 		Returns: (path, statistics)
 		"""
-		if start not in self.words or target not in self.words:
+		start_id = self.graph.id_of(start)
+		target_id = self.graph.id_of(target)
+		if start_id is None or target_id is None:
 			return [], self.stats
-			
-		# Priority queue entries are (total_cost, word, path)
-		frontier = [(0, start, [start])]
-		visited = {start: 0}  # word -> total_cost to reach this word
-		self.stats["nodes_explored"] = 0
+		
+		if self.bucket_queue:
+			# Integer path costs, in units of 1 / cost_resolution
+			frontier, costs, scale = BucketQueue(self.max_edge_cost), self.quantized_costs, self.cost_resolution
+		elif self.indexed_heap:
+			frontier, costs, scale = IndexedHeap(len(self.graph)), self.graph.costs_for(self.cost_model), 1
+		else:
+			frontier, costs, scale = HeapQueue(), self.graph.costs_for(self.cost_model), 1
+		return self._search(frontier, costs, scale, start_id, target_id)
+	
+	def _search(self, frontier, costs, scale, start_id: int, target_id: int) -> Tuple[List[str], Dict]:
+		"""
+		Expand nodes cheapest first from frontier, any queue with push(node,
+		key), pop() -> (key, node) and len(); total_cost is the path cost
+		divided by scale
+		"""
+		offsets, neighbors, costs = self.graph.search_lists(costs)
+		push, pop = frontier.push, frontier.pop
+		
+		push(start_id, 0)
+		# best_costs[node] is the best total_cost found so far and parents[node]
+		# its predecessor on that path, for nodes stamped with this generation
+		arrays = self.search_arrays()
+		generation = arrays.start(start_id)
+		stamps, best_costs, parents = arrays.stamps, arrays.costs, arrays.parents
+		explored = 0
+		peak_frontier = 1
 		
 		while frontier:
-			current_cost, current_word, path = heapq.heappop(frontier)
-			self.stats["nodes_explored"] += 1
+			if len(frontier) > peak_frontier:
+				peak_frontier = len(frontier)
+			current_cost, current = pop()
+			explored += 1
 			
 			# Found target
-			if current_word == target:
-				self.stats["path_length"] = len(path) - 1
-				self.stats["total_cost"] = current_cost
-				return path, self.stats
+			if current == target_id:
+				return self._finish(parents, target_id, explored, current_cost / scale, peak_frontier)
 			
-			# Skip if we've found a better path to current_word
-			if current_word in visited and current_cost > visited[current_word]:
+			# Skip entries left behind when a better path to current was found
+			if current_cost > best_costs[current]:
 				continue
 			
 			# Explore neighbors based on edge costs
-			for next_word, edge_cost in self.graph[current_word].items():
-				new_cost = current_cost + edge_cost
+			for i in range(offsets[current], offsets[current + 1]):
+				next_node = neighbors[i]
+				new_cost = current_cost + costs[i]
 				
 				# Only add to frontier if it's a better path
-				if next_word not in visited or new_cost < visited[next_word]:
-					visited[next_word] = new_cost
-					heapq.heappush(frontier, (new_cost, next_word, path + [next_word]))
+				if stamps[next_node] != generation or new_cost < best_costs[next_node]:
+					stamps[next_node] = generation
+					best_costs[next_node] = new_cost
+					parents[next_node] = current
+					push(next_node, new_cost)
 		
-		return [], self.stats
-	
-	def get_next_step(self, current: str, target: str) -> str:
-		"""Get next word in the path for hint system"""
-		path, _ = self.find_path(current, target)
-		return path[1] if len(path) > 1 else current
\ No newline at end of file
+		return self._finish(None, target_id, explored, peak_frontier=peak_frontier)
@@ -0,0 +1,41 @@
+from collections import deque
+from typing import Tuple
+
+class BucketQueue:
+	"""
+	Monotone priority queue for integer keys (Dial's algorithm).
+	With every edge costing at most max_step, the queued keys always lie
+	within max_step of the last popped one, so max_step + 1 buckets used
+	circularly (key % size) hold them all. Push is O(1) and pop scans
+	forward from the last popped key. Keys pushed must not be lower than
+	the last popped key. Equal keys pop first in, first out, so searches
+	break ties deterministically.
+	"""
+	__slots__ = ('_buckets', '_size', '_current', '_count')
+
+	def __init__(self, max_step: int):
+		self._size = max_step + 1
+		self._buckets = [deque() for _ in range(self._size)]
+		self._current = 0
+		self._count = 0
+
+	def __len__(self) -> int:
+		return self._count
+
+	def push(self, node: int, key: int):
+		# Every queued key maps to its own bucket, so buckets hold bare nodes
+		self._buckets[key % self._size].append(node)
+		self._count += 1
+
+	def pop(self) -> Tuple[int, int]:
+		"""Remove and return (key, node) with the smallest key"""
+		if not self._count:
+			raise IndexError("pop from an empty bucket queue")
+		buckets, size, current = self._buckets, self._size, self._current
+		bucket = buckets[current % size]
+		while not bucket:
+			current += 1
+			bucket = buckets[current % size]
+		self._current = current
+		self._count -= 1
+		return current, bucket.popleft()
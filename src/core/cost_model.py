@@ -0,0 +1,197 @@
+"""
+Edge cost model for word ladders.
+
+Changing the letter at one position costs a position term (changes near
+the start of the word cost more) plus a letter-transition term made of a
+vowel/consonant switch penalty, the QWERTY distance between the two keys
+and a rarity penalty. The letter term depends only on the two letters, so
+a model precomputes it once as a 26x26 table and costs whole batches of
+(position, old letter, new letter) triples with NumPy.
+"""
+import string
+from array import array
+from typing import Callable, Dict, Optional, Union
+import numpy as np
+
+ALPHABET = string.ascii_lowercase
+VOWELS = 'aeiou'
+
+# Edge labels pack (position, old letter, new letter) into one uint16
+LABELS_PER_POSITION = len(ALPHABET) * len(ALPHABET)
+
+# Fixed-point steps per cost unit for integer (quantized) edge costs
+DEFAULT_COST_RESOLUTION = 100
+
+KEYBOARD = {
+	'q': (0,0), 'w': (0,1), 'e': (0,2), 'r': (0,3), 't': (0,4),
+	'y': (0,5), 'u': (0,6), 'i': (0,7), 'o': (0,8), 'p': (0,9),
+	'a': (1,0), 's': (1,1), 'd': (1,2), 'f': (1,3), 'g': (1,4),
+	'h': (1,5), 'j': (1,6), 'k': (1,7), 'l': (1,8),
+	'z': (2,0), 'x': (2,1), 'c': (2,2), 'v': (2,3), 'b': (2,4),
+	'n': (2,5), 'm': (2,6)
+}
+
+LETTER_FREQUENCIES = {
+	'e': 0.1, 'a': 0.09, 'r': 0.08, 'i': 0.07, 'o': 0.07,
+	't': 0.07, 'n': 0.07, 's': 0.06, 'l': 0.05, 'c': 0.04,
+	'u': 0.04, 'd': 0.03, 'p': 0.03, 'm': 0.03, 'h': 0.03,
+	'g': 0.02, 'b': 0.02, 'f': 0.02, 'y': 0.02, 'w': 0.02,
+	'k': 0.01, 'v': 0.01, 'x': 0.01, 'z': 0.01, 'j': 0.01, 'q': 0.01
+}
+
+def is_vowel(c: str) -> bool:
+	"""Check if character is a vowel"""
+	return c.lower() in VOWELS
+
+def keyboard_distance(c1: str, c2: str) -> float:
+	"""Normalized QWERTY keyboard distance"""
+	try:
+		x1, y1 = KEYBOARD[c1.lower()]
+		x2, y2 = KEYBOARD[c2.lower()]
+		return 0.2 * ((abs(x1 - x2) + abs(y1 - y2)) / 10.0)
+	except KeyError:
+		return 0.5
+
+def frequency_cost(c1: str, c2: str) -> float:
+	"""Higher cost for transitioning to/from rare letters"""
+	return 0.3 * (1.0 - (LETTER_FREQUENCIES.get(c1.lower(), 0) + LETTER_FREQUENCIES.get(c2.lower(), 0)) / 2)
+
+def letter_transition_cost(c1: str, c2: str) -> float:
+	"""Cost of replacing letter c1 with c2, wherever it sits in the word"""
+	vowel_cost = 0.5 if is_vowel(c1) != is_vowel(c2) else 0
+	return vowel_cost + keyboard_distance(c1, c2) + frequency_cost(c1, c2)
+
+def challenge_letter_cost(c1: str, c2: str) -> float:
+	"""Harder weighting: vowel/consonant switches and rare letters cost much more"""
+	vowel_cost = 1.5 if is_vowel(c1) != is_vowel(c2) else 0
+	return vowel_cost + keyboard_distance(c1, c2) + 3 * frequency_cost(c1, c2)
+
+def position_cost(word_length: int, position: int) -> float:
+	"""Base cost of changing the letter at position (higher towards the start of the word)"""
+	return 1.0 + (word_length - position) * 0.2
+
+def encode_letters(words) -> np.ndarray:
+	"""(len(words), word_length) array of letter indices 0-25 for lower-case a-z words"""
+	words = list(words)
+	if not words:
+		return np.zeros((0, 0), dtype=np.uint8)
+	raw = np.frombuffer("".join(words).encode('ascii'), dtype=np.uint8)
+	return (raw - ord('a')).reshape(len(words), len(words[0]))
+
+def encode_labels(positions: np.ndarray, from_letters: np.ndarray, to_letters: np.ndarray) -> np.ndarray:
+	"""Pack (position, old letter, new letter) triples into uint16 edge labels"""
+	labels = positions.astype(np.uint16) * LABELS_PER_POSITION
+	labels += from_letters.astype(np.uint16) * len(ALPHABET)
+	labels += to_letters
+	return labels
+
+def label_edges(graph) -> array:
+	"""Edge labels for every CSR entry of graph, recovered from its words"""
+	letters = encode_letters(graph.words)
+	offsets = np.asarray(graph.offsets, dtype=np.int64)
+	heads = np.asarray(graph.neighbors, dtype=np.int64)
+	tails = np.repeat(np.arange(len(graph), dtype=np.int64), np.diff(offsets))
+	positions = (letters[tails] != letters[heads]).argmax(axis=1)
+	labels = encode_labels(positions, letters[tails, positions], letters[heads, positions])
+	return array('H', labels.tobytes())
+
+def quantize_costs(costs, resolution: int = DEFAULT_COST_RESOLUTION) -> array:
+	"""Edge costs rounded to integers in units of 1 / resolution"""
+	if resolution < 1:
+		raise ValueError("cost resolution must be a positive integer")
+	scaled = np.rint(np.asarray(costs, dtype=np.float64) * resolution)
+	return array('I', scaled.astype(np.uint32).tobytes())
+
+class CostModel:
+	"""
+	Precomputed edge costs for one weighting: letters[a, b] is the
+	letter-transition cost from ALPHABET[a] to ALPHABET[b] and position
+	costs are cached per word length.
+	"""
+	def __init__(self, name: str, letter_cost: Callable[[str, str], float] = letter_transition_cost,
+				 position_cost: Callable[[int, int], float] = position_cost):
+		self.name = name
+		self.letter_cost = letter_cost
+		self.position_cost = position_cost
+		self.letters = np.array([[letter_cost(a, b) for b in ALPHABET] for a in ALPHABET])
+		# Plain nested lists are faster than NumPy for one lookup at a time
+		self.letter_rows = self.letters.tolist()
+		self._positions: Dict[int, np.ndarray] = {}
+		self._letter_distances: Dict[int, np.ndarray] = {}
+
+	def positions(self, word_length: int) -> np.ndarray:
+		"""Position cost for every position of a word_length-letter word"""
+		costs = self._positions.get(word_length)
+		if costs is None:
+			costs = np.array([self.position_cost(word_length, i) for i in range(word_length)])
+			self._positions[word_length] = costs
+		return costs
+
+	def edge_cost(self, word1: str, word2: str, diff_pos: Optional[int] = None) -> float:
+		"""Cost of the single-letter change word1 -> word2"""
+		if diff_pos is None:
+			diff_pos = next(i for i, (c1, c2) in enumerate(zip(word1, word2)) if c1 != c2)
+		c1, c2 = word1[diff_pos], word2[diff_pos]
+		if c1 in ALPHABET and c2 in ALPHABET:
+			letter_cost = self.letter_rows[ord(c1) - ord('a')][ord(c2) - ord('a')]
+		else:
+			letter_cost = self.letter_cost(c1, c2)
+		return float(self.positions(len(word1))[diff_pos]) + letter_cost
+
+	def edge_costs(self, word_length: int, positions: np.ndarray, from_letters: np.ndarray,
+				   to_letters: np.ndarray) -> np.ndarray:
+		"""Vectorized edge_cost over (position, old letter, new letter) triples; letters are 0-25"""
+		return self.positions(word_length)[positions] + self.letters[from_letters, to_letters]
+
+	def label_costs(self, word_length: int, labels) -> array:
+		"""Cost of every edge label, as a flat array aligned with labels"""
+		table = (self.positions(word_length)[:, None, None] + self.letters[None, :, :]).ravel()
+		return array('d', table[np.asarray(labels, dtype=np.intp)].tobytes())
+
+	def letter_distances(self, word_length: int) -> np.ndarray:
+		"""
+		(word_length, 26, 26) array: [i, a, b] is the cheapest way to turn
+		letter a into b at position i through any run of changes at that
+		position (Floyd-Warshall over the letter table plus the position
+		cost). Every edge changes one position, so summing these over the
+		positions where two words differ never overestimates a ladder's cost.
+		"""
+		distances = self._letter_distances.get(word_length)
+		if distances is None:
+			distances = self.positions(word_length)[:, None, None] + self.letters[None, :, :]
+			distances[:, np.arange(len(ALPHABET)), np.arange(len(ALPHABET))] = 0.0
+			for via in range(len(ALPHABET)):
+				np.minimum(distances, distances[:, :, via, None] + distances[:, None, via, :], out=distances)
+			self._letter_distances[word_length] = distances
+		return distances
+
+	def min_edge_cost(self, word_length: int) -> float:
+		"""Cheapest possible single-letter change; scales step-counting heuristics"""
+		if word_length < 1:
+			return 0.0
+		changes = self.letters[~np.eye(len(ALPHABET), dtype=bool)]
+		return float(self.positions(word_length).min() + changes.min())
+
+# Name -> cost model, for picking a weighting per query
+COST_MODELS: Dict[str, CostModel] = {}
+
+def register_cost_model(model: CostModel) -> CostModel:
+	COST_MODELS[model.name] = model
+	return model
+
+def get_cost_model(model: Union[str, CostModel]) -> CostModel:
+	"""Look up a registered cost model by name (CostModel instances pass through)"""
+	if isinstance(model, CostModel):
+		return model
+	try:
+		return COST_MODELS[model]
+	except KeyError:
+		raise ValueError(f"Unknown cost model: {model}")
+
+# Bump whenever the default model's costs change so existing graphs count as stale
+COST_MODEL_VERSION = 1
+# The weighting graphs are built with
+DEFAULT_COST_MODEL = register_cost_model(CostModel('standard'))
+# Every change costs 1, so the cheapest ladder is the shortest one
+register_cost_model(CostModel('uniform', letter_cost=lambda c1, c2: 0.0, position_cost=lambda n, i: 1.0))
+register_cost_model(CostModel('challenge', letter_cost=challenge_letter_cost))
@@ -0,0 +1,150 @@
+"""
+Whole-graph statistics computed once at build time.
+
+Eccentricities come from multi-source BFS with bitsets: a batch of up to
+batch_size sources is searched at once, each node holding one bit per
+source, and a level of all those searches is a single vectorized OR over
+the CSR arrays. Batches are independent and fan out over a process pool.
+"""
+from array import array
+from collections import Counter
+from multiprocessing import Pool
+from typing import Dict, Iterator, List, Optional, Tuple
+import numpy as np
+
+# Sources searched together in one bitset BFS
+DEFAULT_BATCH_SIZE = 256
+
+# CSR arrays of the graph being analysed, set per worker by _init_worker
+_worker_offsets = None
+_worker_neighbors = None
+
+def _init_worker(offsets: np.ndarray, neighbors: np.ndarray):
+	global _worker_offsets, _worker_neighbors
+	_worker_offsets = offsets
+	_worker_neighbors = neighbors
+
+def bitset_levels(offsets: np.ndarray, neighbors: np.ndarray, sources: np.ndarray) -> Iterator[np.ndarray]:
+	"""
+	Level-synchronous BFS from every node in sources at once. Yields one
+	(node_count, lanes) uint64 bitset per level from level 1 on, in which
+	bit i of node's row (lane i // 64, bit i % 64) is set when the search
+	from sources[i] first reaches node at that level.
+	"""
+	node_count = len(offsets) - 1
+	lanes = (len(sources) + 63) // 64
+	bits = np.arange(len(sources))
+
+	frontier = np.zeros((node_count, lanes), dtype=np.uint64)
+	frontier[sources, bits // 64] = np.left_shift(np.uint64(1), (bits % 64).astype(np.uint64))
+	seen = frontier.copy()
+
+	# reduceat needs the start of every non-empty neighbor run
+	has_edges = offsets[1:] > offsets[:-1]
+	starts = offsets[:-1][has_edges]
+	while True:
+		reached = np.zeros_like(frontier)
+		if len(starts):
+			reached[has_edges] = np.bitwise_or.reduceat(frontier[neighbors], starts, axis=0)
+		frontier = reached & ~seen
+		if not frontier.any():
+			return
+		seen |= frontier
+		yield frontier
+
+def unpack_sources(bitset: np.ndarray, source_count: int) -> np.ndarray:
+	"""(..., lanes) uint64 bitset -> (..., source_count) bool, one column per source"""
+	flat = np.ascontiguousarray(bitset).astype('<u8').view(np.uint8)
+	return np.unpackbits(flat, axis=-1, bitorder='little')[..., :source_count].astype(bool)
+
+def _batch_eccentricities(sources: np.ndarray) -> np.ndarray:
+	"""Hop eccentricity of every node in sources, by one bitset BFS over the batch"""
+	eccentricities = np.zeros(len(sources), dtype=np.int32)
+	levels = bitset_levels(_worker_offsets, _worker_neighbors, sources)
+	for level, frontier in enumerate(levels, 1):
+		# Every source whose search reached a new node this level
+		grew = np.bitwise_or.reduce(frontier, axis=0)
+		eccentricities[unpack_sources(grew, len(sources))] = level
+	return eccentricities
+
+def induced_subgraph(offsets: np.ndarray, neighbors: np.ndarray, members: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+	"""
+	CSR arrays of the subgraph induced by members (sorted node ids closed
+	under adjacency, e.g. whole components), renumbered 0..len(members)-1
+	"""
+	degrees = offsets[members + 1] - offsets[members]
+	sub_offsets = np.zeros(len(members) + 1, dtype=np.int64)
+	np.cumsum(degrees, out=sub_offsets[1:])
+	entries = np.repeat(offsets[members] - sub_offsets[:-1], degrees) + np.arange(sub_offsets[-1])
+	return sub_offsets, np.searchsorted(members, neighbors[entries])
+
+def eccentricities(graph, processes: Optional[int] = 1, batch_size: int = DEFAULT_BATCH_SIZE,
+				   nodes: Optional[np.ndarray] = None) -> array:
+	"""
+	Hop eccentricity of every node within its component (0 for isolated
+	words). processes=1 runs inline; None uses one worker per CPU. With
+	nodes (sorted ids making up whole components), only those are searched,
+	over their own subgraph, and every other node is left at 0.
+	"""
+	offsets = np.asarray(graph.offsets, dtype=np.int64)
+	neighbors = np.asarray(graph.neighbors, dtype=np.int64)
+	node_count = len(offsets) - 1
+	if nodes is not None:
+		offsets, neighbors = induced_subgraph(offsets, neighbors, np.asarray(nodes, dtype=np.int64))
+	source_count = len(offsets) - 1
+	batches = [
+		np.arange(first, min(first + batch_size, source_count))
+		for first in range(0, source_count, batch_size)
+	]
+
+	if processes == 1:
+		_init_worker(offsets, neighbors)
+		results = [_batch_eccentricities(batch) for batch in batches]
+	else:
+		with Pool(processes, initializer=_init_worker, initargs=(offsets, neighbors)) as pool:
+			results = pool.map(_batch_eccentricities, batches)
+
+	values = np.concatenate(results) if results else np.zeros(0, dtype=np.int32)
+	if nodes is not None:
+		searched, values = values, np.zeros(node_count, dtype=np.int32)
+		values[np.asarray(nodes, dtype=np.int64)] = searched
+	return array('i', values.astype(np.int32).tobytes())
+
+def analyze(graph, processes: Optional[int] = 1, batch_size: int = DEFAULT_BATCH_SIZE,
+			node_eccentricities: Optional[array] = None) -> Tuple[Dict, List[int], List[int], array]:
+	"""
+	Compute the analytics for graph; node_eccentricities, when already
+	known (e.g. carried over by an incremental update), are used as given.
+	Returns (summary for metadata, size of each component, hop diameter of
+	each component, eccentricity of each node).
+	"""
+	components = graph.components
+	component_count = max(components, default=-1) + 1
+	sizes = [0] * component_count
+	for label in components:
+		sizes[label] += 1
+
+	if node_eccentricities is None:
+		node_eccentricities = eccentricities(graph, processes, batch_size)
+	diameters = [0] * component_count
+	for label, eccentricity in zip(components, node_eccentricities):
+		if eccentricity > diameters[label]:
+			diameters[label] = eccentricity
+
+	degrees = Counter(graph.degree(node) for node in range(len(graph)))
+	summary = {
+		"degree_histogram": {str(degree): count for degree, count in sorted(degrees.items())},
+		"max_degree": max(degrees, default=0),
+		"isolated_words": degrees.get(0, 0),
+		"largest_component": max(sizes, default=0),
+		"diameter": max(diameters, default=0)
+	}
+	return summary, sizes, diameters, node_eccentricities
+
+def attach_analytics(graph, processes: Optional[int] = 1, batch_size: int = DEFAULT_BATCH_SIZE,
+					 node_eccentricities: Optional[array] = None) -> Dict:
+	"""Run analyze() and store the results on graph (metadata["analytics"] plus tables)"""
+	summary, sizes, diameters, node_eccentricities = analyze(graph, processes, batch_size, node_eccentricities)
+	graph.metadata["analytics"] = summary
+	graph.set_analytics(node_eccentricities, sizes, diameters)
+	return summary
@@ -0,0 +1,312 @@
+"""
+Versioned binary graph format.
+
+Layout (little-endian):
+
+    header         magic "WLGR", format version, word length, node count,
+                   CSR entry count, section count, CRC32 of everything
+                   after the header
+    section table  section_count x (tag, offset, length)
+    sections       each aligned to 8 bytes:
+                   META  metadata as UTF-8 JSON
+                   WORD  node_count fixed-width ASCII words, sorted
+                   OFFS  (node_count + 1) x uint32 CSR offsets
+                   NBRS  entry_count x uint32 neighbor ids
+                   COST  entry_count x float32 edge costs
+                   COMP  node_count x int32 component labels
+                   ELBL  entry_count x uint16 edge labels (position and
+                         letters changed), for re-costing under other models
+                   QCST  entry_count x uint32 quantized edge costs, in
+                         units of 1 / metadata["cost_resolution"], optional
+                   ECCN  node_count x uint16 hop eccentricities, optional
+                   CSIZ  per-component uint32 sizes, optional
+                   CDIA  per-component uint16 hop diameters, optional
+                   LMRK  landmark node ids (uint32), optional
+                   LDST  landmark distance rows (float32), optional
+
+Loading memory-maps the file and views every section in place, so
+opening a graph costs a header parse and pages are read on demand.
+"""
+import json
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from src.core.word_graph import WordGraph
+
+MAGIC = b"WLGR"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHHIIII")
+SECTION = struct.Struct("<4sQQ")
+ALIGNMENT = 8
+
+GRAPH_DIR = "data/graphs"
+
+class GraphFormatError(ValueError):
+	"""Raised when a binary graph file is truncated, corrupt or of an unknown version"""
+
+def binary_graph_path(word_length: int, directory: str = GRAPH_DIR) -> str:
+	return os.path.join(directory, f"graph_{word_length}.bin")
+
+def json_graph_path(word_length: int, directory: str = GRAPH_DIR) -> str:
+	return os.path.join(directory, f"graph_{word_length}.json")
+
+def find_graph_file(word_length: int, directory: str = GRAPH_DIR, implicit: bool = False) -> Optional[str]:
+	"""
+	Path of the graph for word_length, preferring the binary format; None if
+	neither exists. With implicit, the word list stands in for a graph that
+	was never built (WordGraph.load indexes it as an ImplicitWordGraph).
+	"""
+	paths = [binary_graph_path(word_length, directory), json_graph_path(word_length, directory)]
+	if implicit:
+		from src.scripts.filter_words import dictionary_path
+		paths.append(dictionary_path(word_length))
+	for path in paths:
+		if os.path.exists(path) and os.path.getsize(path) > 0:
+			return path
+	return None
+
+def graph_crc(graph) -> int:
+	"""
+	CRC32 of the graph's words and CSR adjacency. Files derived from a
+	graph (hop table, word and puzzle indexes) store it to tell whether
+	they still match the graph: a rebuild with other words or edges does not.
+	"""
+	words = graph.words
+	crc = zlib.crc32(words._data if isinstance(words, WordTable) else "".join(words).encode('ascii'))
+	for values in (graph.offsets, graph.neighbors):
+		values = np.asarray(values, dtype='<u4')
+		crc = zlib.crc32(values.tobytes(), crc)
+	return crc
+
+def is_binary_graph(path: str) -> bool:
+	with open(path, 'rb') as f:
+		return f.read(len(MAGIC)) == MAGIC
+
+class WordTable:
+	"""
+	Read-only view of the fixed-width WORD section.
+	Words are sorted, so lookups are a binary search over the raw bytes and
+	no per-word Python objects are kept around.
+	"""
+	def __init__(self, data: memoryview, word_length: int, count: int):
+		self._data = data
+		self._word_length = word_length
+		self._count = count
+
+	def __len__(self) -> int:
+		return self._count
+
+	def _raw(self, index: int) -> bytes:
+		start = index * self._word_length
+		return bytes(self._data[start:start + self._word_length])
+
+	def __getitem__(self, index):
+		if isinstance(index, slice):
+			return [self[i] for i in range(*index.indices(self._count))]
+		if index < 0:
+			index += self._count
+		if not 0 <= index < self._count:
+			raise IndexError("word index out of range")
+		return self._raw(index).decode('ascii')
+
+	def __iter__(self):
+		for index in range(self._count):
+			yield self._raw(index).decode('ascii')
+
+	def get(self, word: str, default=None) -> Optional[int]:
+		"""Id of word, or default if absent"""
+		if len(word) != self._word_length:
+			return default
+		try:
+			key = word.encode('ascii')
+		except UnicodeEncodeError:
+			return default
+		index = bisect_left(_RawKeys(self), key)
+		if index < self._count and self._raw(index) == key:
+			return index
+		return default
+
+	def __contains__(self, word: str) -> bool:
+		return self.get(word) is not None
+
+class _RawKeys:
+	"""Sequence adapter so bisect can search a WordTable by raw bytes"""
+	def __init__(self, table: WordTable):
+		self._table = table
+
+	def __len__(self) -> int:
+		return len(self._table)
+
+	def __getitem__(self, index: int) -> bytes:
+		return self._table._raw(index)
+
+def _pad(length: int) -> int:
+	return (-length) % ALIGNMENT
+
+def _as_array(typecode: str, values) -> array:
+	result = values if isinstance(values, array) and values.typecode == typecode else array(typecode, values)
+	if sys.byteorder != 'little':
+		result = array(typecode, result)
+		result.byteswap()
+	return result
+
+def write_binary_graph(graph: WordGraph, path: str):
+	"""Write graph to path in the binary format (atomically, via a temp file)"""
+	word_length = graph.word_length
+	words = list(graph.words)
+	if words != sorted(words):
+		raise ValueError("binary graphs need words in sorted order")
+	if any(len(word) != word_length for word in words):
+		raise ValueError("all words must have the graph's word length")
+
+	sections: List[Tuple[bytes, bytes]] = [
+		(b"META", json.dumps(graph.metadata, sort_keys=True).encode('utf-8')),
+		(b"WORD", "".join(words).encode('ascii')),
+		(b"OFFS", _as_array('I', graph.offsets).tobytes()),
+		(b"NBRS", _as_array('I', graph.neighbors).tobytes()),
+		(b"COST", _as_array('f', graph.costs).tobytes()),
+		(b"COMP", _as_array('i', graph.components).tobytes()),
+		(b"ELBL", _as_array('H', graph.edge_labels).tobytes())
+	]
+	if graph.cost_resolution:
+		sections.append((b"QCST", _as_array('I', graph.quantized_costs()).tobytes()))
+	if graph.eccentricities is not None:
+		sections.append((b"ECCN", _as_array('H', graph.eccentricities).tobytes()))
+		sections.append((b"CSIZ", _as_array('I', graph.component_sizes).tobytes()))
+		sections.append((b"CDIA", _as_array('H', graph.component_diameters).tobytes()))
+	if graph.landmarks:
+		rows = array('f')
+		for distances in graph.landmark_distances:
+			rows.extend(_as_array('f', distances))
+		sections.append((b"LMRK", _as_array('I', graph.landmarks).tobytes()))
+		sections.append((b"LDST", rows.tobytes()))
+
+	table_size = SECTION.size * len(sections)
+	offset = HEADER.size + table_size
+	offset += _pad(offset)
+	table = b""
+	body = b""
+	for tag, payload in sections:
+		table += SECTION.pack(tag, offset, len(payload))
+		body += payload + b"\0" * _pad(len(payload))
+		offset += len(payload) + _pad(len(payload))
+	prefix_pad = b"\0" * _pad(HEADER.size + table_size)
+
+	content = table + prefix_pad + body
+	header = HEADER.pack(
+		MAGIC, FORMAT_VERSION, word_length, len(words), len(graph.neighbors),
+		len(sections), zlib.crc32(content)
+	)
+
+	os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+	temp_path = path + ".tmp"
+	with open(temp_path, 'wb') as f:
+		f.write(header)
+		f.write(content)
+	os.replace(temp_path, path)
+
+def write_json_graph(graph: WordGraph, path: str):
+	"""Export graph in the JSON layout (words, dict-of-dicts adjacency, landmarks)"""
+	os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+	with open(path, 'w', encoding='utf-8') as f:
+		json.dump(graph.to_graph_data(), f, indent=2, ensure_ascii=False)
+
+def _read_header(buffer) -> Tuple[int, int, int, int, int, int]:
+	if len(buffer) < HEADER.size:
+		raise GraphFormatError("file too short for a graph header")
+	magic, version, word_length, node_count, entry_count, section_count, checksum = HEADER.unpack_from(buffer, 0)
+	if magic != MAGIC:
+		raise GraphFormatError("not a binary word graph")
+	if version != FORMAT_VERSION:
+		raise GraphFormatError(f"unsupported graph format version {version}")
+	return version, word_length, node_count, entry_count, section_count, checksum
+
+def verify_binary_graph(path: str) -> bool:
+	"""True if the file's header is valid and its checksum matches"""
+	try:
+		with open(path, 'rb') as f:
+			data = f.read()
+		*_, checksum = _read_header(data)
+	except (OSError, GraphFormatError):
+		return False
+	return zlib.crc32(memoryview(data)[HEADER.size:]) == checksum
+
+def read_binary_graph(path: str, verify: bool = False) -> WordGraph:
+	"""
+	Memory-map a binary graph. Section arrays are zero-copy views into the
+	mapping; pass verify=True to check the CRC (which reads the whole file).
+	"""
+	with open(path, 'rb') as f:
+		if os.fstat(f.fileno()).st_size == 0:
+			raise GraphFormatError("graph file is empty")
+		mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+	view = memoryview(mapping)
+	sections: Dict[bytes, memoryview] = {}
+	try:
+		_, word_length, node_count, entry_count, section_count, checksum = _read_header(view)
+		if verify and zlib.crc32(view[HEADER.size:]) != checksum:
+			raise GraphFormatError("graph checksum mismatch")
+
+		if len(view) < HEADER.size + section_count * SECTION.size:
+			raise GraphFormatError("section table runs past end of file")
+		for i in range(section_count):
+			tag, offset, length = SECTION.unpack_from(view, HEADER.size + i * SECTION.size)
+			if offset + length > len(view):
+				raise GraphFormatError(f"section {tag!r} runs past end of file")
+			sections[tag] = view[offset:offset + length]
+		for tag in (b"META", b"WORD", b"OFFS", b"NBRS", b"COST"):
+			if tag not in sections:
+				raise GraphFormatError(f"missing section {tag!r}")
+		if (len(sections[b"WORD"]) != node_count * word_length
+				or len(sections[b"OFFS"]) != (node_count + 1) * 4
+				or len(sections[b"NBRS"]) != entry_count * 4
+				or len(sections[b"COST"]) != entry_count * 4
+				or (b"ELBL" in sections and len(sections[b"ELBL"]) != entry_count * 2)
+				or (b"QCST" in sections and len(sections[b"QCST"]) != entry_count * 4)
+				or (b"ECCN" in sections and len(sections[b"ECCN"]) != node_count * 2)):
+			raise GraphFormatError("section sizes do not match the header")
+	except Exception:
+		for section in sections.values():
+			section.release()
+		view.release()
+		mapping.close()
+		raise
+
+	def typed(tag: bytes, typecode: str):
+		if sys.byteorder == 'little':
+			return sections[tag].cast(typecode)
+		values = array(typecode, bytes(sections[tag]))
+		values.byteswap()
+		return values
+
+	metadata = json.loads(bytes(sections[b"META"]).decode('utf-8'))
+	words = WordTable(sections[b"WORD"], word_length, node_count)
+	graph = WordGraph(
+		words, typed(b"OFFS", 'I'), typed(b"NBRS", 'I'), typed(b"COST", 'f'),
+		metadata, index=words
+	)
+	if b"COMP" in sections:
+		graph._components = typed(b"COMP", 'i')
+	if b"ELBL" in sections:
+		graph._edge_labels = typed(b"ELBL", 'H')
+	if b"QCST" in sections:
+		graph._quantized_costs[(graph.cost_model, graph.cost_resolution)] = typed(b"QCST", 'I')
+	if b"ECCN" in sections:
+		graph.set_analytics(typed(b"ECCN", 'H'), typed(b"CSIZ", 'I'), typed(b"CDIA", 'H'))
+	if b"LMRK" in sections:
+		landmarks = list(typed(b"LMRK", 'I'))
+		rows = typed(b"LDST", 'f')
+		graph.set_landmarks(
+			landmarks,
+			[rows[i * node_count:(i + 1) * node_count] for i in range(len(landmarks))]
+		)
+	# Keep the mapping alive for as long as the graph's views are
+	graph._mapping = mapping
+	return graph
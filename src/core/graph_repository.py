@@ -0,0 +1,125 @@
+from collections import OrderedDict
+from typing import Callable, List, Optional
+from src.core.word_graph import WordGraph
+from src.core.graph_format import GRAPH_DIR, find_graph_file
+from src.core.word_index import WordIndex, word_index_path
+from src.core.puzzle_index import PuzzleIndex, puzzle_index_path
+
+# Default cap on the estimated size of all loaded graphs
+DEFAULT_MEMORY_BUDGET = 256 * 1024 * 1024
+
+class GraphRepository:
+	"""
+	Process-wide store of loaded graphs keyed by word length.
+	Each graph is loaded once and the same WordGraph is handed to every
+	caller, so switching screens never re-reads a file. Callers must treat
+	the graphs as read-only. When the estimated size of the loaded graphs
+	exceeds memory_budget the least recently used ones are dropped; screens
+	still holding a dropped graph keep working with it. With implicit, a
+	length that has no built graph is served as an ImplicitWordGraph indexed
+	from its word list. Graph files are mapped, not read: their checksum is
+	checked by the build manifest's staleness check (build_manifest.is_stale)
+	before a game starts, and again here only with verify.
+	"""
+	def __init__(self, directory: str = GRAPH_DIR, memory_budget: int = DEFAULT_MEMORY_BUDGET,
+				 implicit: bool = False, verify: bool = False):
+		self.directory = directory
+		self.memory_budget = memory_budget
+		self.implicit = implicit
+		self.verify = verify
+		self._graphs = OrderedDict()
+		self._indexes = {}
+		self._puzzles = {}
+		# Called with each graph the repository drops, so caches keyed by
+		# graph can let go of it
+		self._drop_listeners: List[Callable[[WordGraph], None]] = []
+		self.loads = 0
+
+	def __contains__(self, word_length: int) -> bool:
+		return word_length in self._graphs
+
+	def get(self, word_length: int) -> WordGraph:
+		"""Shared graph for word_length, loading it on first use"""
+		graph = self._graphs.get(word_length)
+		if graph is not None:
+			self._graphs.move_to_end(word_length)
+			return graph
+
+		graph_file = find_graph_file(word_length, self.directory, self.implicit)
+		if graph_file is None:
+			raise FileNotFoundError(f"No graph built for {word_length}-letter words")
+		graph = WordGraph.load(graph_file, verify=self.verify)
+		self.loads += 1
+		self._graphs[word_length] = graph
+		self._evict(keep=word_length)
+		return graph
+
+	def word_index(self, word_length: int) -> WordIndex:
+		"""
+		Shared prefix/wildcard index over the graph's words. Loaded from
+		words_N.idx when it was saved for this graph (same graph CRC),
+		otherwise built from the graph.
+		"""
+		index = self._indexes.get(word_length)
+		if index is not None:
+			return index
+		graph = self.get(word_length)
+		try:
+			index = WordIndex.load(word_index_path(word_length, self.directory), graph)
+		except (OSError, ValueError):
+			index = WordIndex.from_words(graph.words)
+		self._indexes[word_length] = index
+		return index
+
+	def puzzle_index(self, word_length: int) -> PuzzleIndex:
+		"""
+		Shared puzzle pair index for the graph. Loaded from puzzles_N.idx
+		when it was built from this graph (same graph CRC), otherwise
+		sampled from the graph.
+		"""
+		puzzles = self._puzzles.get(word_length)
+		if puzzles is not None:
+			return puzzles
+		graph = self.get(word_length)
+		try:
+			puzzles = PuzzleIndex.load(puzzle_index_path(word_length, self.directory), graph)
+		except (OSError, ValueError):
+			puzzles = PuzzleIndex.build(graph)
+		self._puzzles[word_length] = puzzles
+		return puzzles
+
+	def add_drop_listener(self, listener: Callable[[WordGraph], None]):
+		"""Register listener(graph) to run whenever a graph is invalidated or evicted"""
+		self._drop_listeners.append(listener)
+
+	def _drop(self, word_length: int):
+		graph = self._graphs.pop(word_length, None)
+		self._indexes.pop(word_length, None)
+		self._puzzles.pop(word_length, None)
+		if graph is not None:
+			for listener in self._drop_listeners:
+				listener(graph)
+
+	def invalidate(self, word_length: Optional[int] = None):
+		"""Forget one graph (e.g. after a rebuild) or all of them"""
+		lengths = list(self._graphs) if word_length is None else [word_length]
+		for length in lengths:
+			self._drop(length)
+		if word_length is None:
+			self._indexes.clear()
+			self._puzzles.clear()
+
+	def memory_usage(self) -> int:
+		graphs = sum(graph.nbytes for graph in self._graphs.values())
+		indexes = sum(index.nbytes for index in self._indexes.values())
+		return graphs + indexes + sum(puzzles.nbytes for puzzles in self._puzzles.values())
+
+	def _evict(self, keep: int):
+		while self.memory_usage() > self.memory_budget and len(self._graphs) > 1:
+			oldest = next(iter(self._graphs))
+			if oldest == keep:
+				break
+			self._drop(oldest)
+
+# Shared by every screen in the game's state machine
+graph_repository = GraphRepository()
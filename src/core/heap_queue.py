@@ -0,0 +1,21 @@
+from heapq import heappop, heappush
+from typing import Tuple
+
+class HeapQueue(list):
+	"""
+	Binary min-heap of (key, node) entries on heapq, with the push / pop
+	interface of IndexedHeap and BucketQueue. There is no decrease-key:
+	improving a queued node pushes it again and leaves the old entry in
+	place, so searches skip entries whose key is above the node's best when
+	they pop them. Equal keys pop lowest node id first.
+	The heap is the list itself, so len() and truth tests stay in C on the
+	searches' hot path.
+	"""
+	__slots__ = ()
+
+	def push(self, node: int, key: float):
+		heappush(self, (key, node))
+
+	def pop(self) -> Tuple[float, int]:
+		"""Remove and return (key, node) with the smallest key"""
+		return heappop(self)
@@ -0,0 +1,222 @@
+"""
+All-pairs ladder lengths (hop counts), stored one uint8 per pair.
+
+Words in different components never connect, so the table keeps one
+square block per component instead of a node_count^2 matrix: block c holds
+the hop counts between the members of component c, in id order. A lookup
+is a component check and a single byte read from the memory-mapped file.
+
+Blocks are filled by level-synchronous bitset BFS (graph_analytics) from
+batches of sources on each component's own CSR subgraph; the batches are
+independent and fan out over a process pool.
+
+Layout (little-endian): magic "WLHT", version, node count, component
+count, matrix size and the CRC32 of the graph's words and adjacency; then
+per node its component (int32) and position within it (uint32), per
+component its size (uint32) and block offset (uint64), and the uint8
+blocks starting at the next multiple of 8. The graph CRC ties the table to
+the graph it was built from: a rebuilt graph with other words or edges no
+longer matches it.
+"""
+import mmap
+import os
+import struct
+import sys
+import weakref
+from array import array
+from multiprocessing import Pool
+from typing import Container, Dict, Iterator, Optional, Tuple
+import numpy as np
+from src.core import graph_analytics
+from src.core.graph_analytics import (
+	DEFAULT_BATCH_SIZE, _init_worker, bitset_levels, induced_subgraph, unpack_sources
+)
+from src.core.graph_format import GRAPH_DIR, graph_crc
+
+HOP_MAGIC = b"WLHT"
+HOP_VERSION = 2
+HOP_HEADER = struct.Struct("<4sHIIQI")
+
+# Longest ladder a uint8 entry can hold
+MAX_HOPS = 255
+
+def hop_table_path(word_length: int, directory: str = GRAPH_DIR) -> str:
+	return os.path.join(directory, f"hops_{word_length}.bin")
+
+def _component_rows(task: Tuple[int, np.ndarray, int, int]) -> Tuple[int, int, np.ndarray]:
+	"""Hop counts from members[first:last] to every member, as a uint8 block of rows"""
+	component, members, first, last = task
+	# The graph's CSR arrays, set per worker by graph_analytics._init_worker
+	offsets, neighbors = induced_subgraph(
+		graph_analytics._worker_offsets, graph_analytics._worker_neighbors, members
+	)
+	sources = np.arange(first, last)
+	rows = np.zeros((len(sources), len(members)), dtype=np.uint8)
+	for level, frontier in enumerate(bitset_levels(offsets, neighbors, sources), 1):
+		if level > MAX_HOPS:
+			raise ValueError(f"component {component} has ladders longer than {MAX_HOPS} steps")
+		rows[unpack_sources(frontier, len(sources)).T] = level
+	return component, first, rows
+
+def _tasks(order: np.ndarray, starts: np.ndarray, batch_size: int,
+		   skip: Container[int] = ()) -> Iterator[Tuple[int, np.ndarray, int, int]]:
+	for component in range(len(starts) - 1):
+		members = order[starts[component]:starts[component + 1]]
+		# A lone word's block is the single 0 already in the file
+		if len(members) < 2 or component in skip:
+			continue
+		for first in range(0, len(members), batch_size):
+			yield component, members, first, min(first + batch_size, len(members))
+
+def build_hop_table(graph, path: str, processes: Optional[int] = None,
+					batch_size: int = DEFAULT_BATCH_SIZE,
+					reuse: Optional[Tuple["HopTable", Dict[int, int]]] = None) -> "HopTable":
+	"""
+	Tabulate every pair's ladder length for graph and write it to path
+	(atomically, via a temp file). processes=1 runs inline; None uses one
+	worker per CPU. reuse is (an older table, {component: its component in
+	that table}) for components that are unchanged since, same members and
+	edges: their blocks are copied instead of searched. Returns the table,
+	mapped from the new file.
+	"""
+	node_count = len(graph)
+	components = np.asarray(graph.components, dtype=np.int32)
+	order = np.argsort(components, kind='stable')
+	sizes = np.bincount(components, minlength=max(components, default=-1) + 1).astype(np.uint32)
+	starts = np.zeros(len(sizes) + 1, dtype=np.int64)
+	np.cumsum(sizes, out=starts[1:])
+	local = np.empty(node_count, dtype=np.uint32)
+	local[order] = np.arange(node_count) - starts[components[order]]
+	block_offsets = np.zeros(len(sizes), dtype=np.uint64)
+	block_sizes = sizes.astype(np.uint64) ** 2
+	np.cumsum(block_sizes[:-1], out=block_offsets[1:])
+	matrix_size = int(block_sizes.sum())
+
+	header = HOP_HEADER.pack(HOP_MAGIC, HOP_VERSION, node_count, len(sizes), matrix_size, graph_crc(graph))
+	tables = b"".join(values.astype(values.dtype.newbyteorder('<')).tobytes()
+					  for values in (components, local, sizes, block_offsets))
+	matrix_offset = -(-(len(header) + len(tables)) // 8) * 8
+	temp_path = path + ".tmp"
+	with open(temp_path, 'wb') as f:
+		f.write(header)
+		f.write(tables)
+		f.truncate(matrix_offset + matrix_size)
+
+	offsets = np.asarray(graph.offsets, dtype=np.int64)
+	neighbors = np.asarray(graph.neighbors, dtype=np.int64)
+	old_table, carried = reuse if reuse is not None else (None, {})
+	tasks = _tasks(order, starts, batch_size, carried)
+	if matrix_size:
+		matrix = np.memmap(temp_path, dtype=np.uint8, mode='r+', offset=matrix_offset, shape=(matrix_size,))
+		for component, old_component in carried.items():
+			start = int(block_offsets[component])
+			matrix[start:start + int(block_sizes[component])] = old_table.block(old_component).ravel()
+		if processes == 1:
+			_init_worker(offsets, neighbors)
+			results = map(_component_rows, tasks)
+			_fill(matrix, results, sizes, block_offsets)
+		else:
+			with Pool(processes, initializer=_init_worker, initargs=(offsets, neighbors)) as pool:
+				_fill(matrix, pool.imap_unordered(_component_rows, tasks), sizes, block_offsets)
+		matrix.flush()
+		del matrix
+	os.replace(temp_path, path)
+	return HopTable.load(path, graph)
+
+def _fill(matrix: np.memmap, results, sizes: np.ndarray, block_offsets: np.ndarray):
+	for component, first, rows in results:
+		size = int(sizes[component])
+		start = int(block_offsets[component]) + first * size
+		matrix[start:start + rows.size] = rows.ravel()
+
+class HopTable:
+	"""
+	Memory-mapped all-pairs hop counts. distance() is O(1): it never
+	searches, it reads one byte.
+	"""
+	def __init__(self, components, local, sizes, block_offsets, matrix, mapping=None, graph_crc: int = 0):
+		self.components = components
+		self.local = local
+		self.sizes = sizes
+		self.block_offsets = block_offsets
+		self.matrix = matrix
+		self._mapping = mapping
+		# CRC of the graph the table was built from (see graph_crc)
+		self.graph_crc = graph_crc
+		# Last graph hops() checked against graph_crc
+		self._checked_graph = None
+
+	@classmethod
+	def load(cls, path: str, graph=None) -> "HopTable":
+		"""Map a hop table file; with graph given, fail unless the table was built from it"""
+		with open(path, 'rb') as f:
+			mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+		view = memoryview(mapping)
+		try:
+			if len(view) < HOP_HEADER.size:
+				raise ValueError("file too short for a hop table")
+			magic, version, node_count, component_count, matrix_size, crc = HOP_HEADER.unpack_from(view, 0)
+			if magic != HOP_MAGIC or version != HOP_VERSION:
+				raise ValueError("not a hop table of a supported version")
+			if graph is not None and (node_count != len(graph) or crc != graph_crc(graph)):
+				raise ValueError("hop table was built for a different graph")
+			offset = HOP_HEADER.size
+			tables = []
+			for typecode, count in (('i', node_count), ('I', node_count), ('I', component_count), ('Q', component_count)):
+				size = struct.calcsize(typecode) * count
+				values = array(typecode)
+				values.frombytes(view[offset:offset + size])
+				if len(values) != count:
+					raise ValueError("hop table is truncated")
+				if sys.byteorder != 'little':
+					values.byteswap()
+				tables.append(values)
+				offset += size
+			matrix_offset = -(-offset // 8) * 8
+			if len(view) != matrix_offset + matrix_size:
+				raise ValueError("hop table size does not match its header")
+		except Exception:
+			view.release()
+			mapping.close()
+			raise
+		return cls(*tables, view[matrix_offset:], mapping, crc)
+
+	def close(self):
+		"""Release the file mapping (the table is unusable afterwards)"""
+		if self._mapping is not None:
+			self.matrix.release()
+			self.matrix = None
+			self._mapping = None
+
+	def __len__(self) -> int:
+		return len(self.components)
+
+	def distance(self, source: int, target: int) -> Optional[int]:
+		"""Steps on the shortest ladder between two word ids, or None if unconnected"""
+		component = self.components[source]
+		if component != self.components[target]:
+			return None
+		size = self.sizes[component]
+		return self.matrix[self.block_offsets[component] + self.local[source] * size + self.local[target]]
+
+	def check_graph(self, graph):
+		"""Raise ValueError unless the table was built from graph (checked once per graph)"""
+		if self._checked_graph is not None and self._checked_graph() is graph:
+			return
+		if len(graph) != len(self.components) or graph_crc(graph) != self.graph_crc:
+			raise ValueError("hop table was built for a different graph")
+		self._checked_graph = weakref.ref(graph)
+
+	def hops(self, graph, start: str, end: str) -> Optional[int]:
+		"""distance() between two words of graph, which must be the graph the table was built from"""
+		self.check_graph(graph)
+		source, target = graph.id_of(start), graph.id_of(end)
+		if source is None or target is None:
+			return None
+		return self.distance(source, target)
+
+	def block(self, component: int) -> np.ndarray:
+		"""Hop counts between the members of component (in id order) as a square array"""
+		size = self.sizes[component]
+		return np.frombuffer(self.matrix, dtype=np.uint8, count=size * size,
+							 offset=self.block_offsets[component]).reshape(size, size)
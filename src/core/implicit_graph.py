@@ -0,0 +1,209 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from functools import partial
+from itertools import chain
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from src.core.word_graph import WordGraph
+from src.core.graph_format import WordTable, _RawKeys
+from src.core.cost_model import (
+	DEFAULT_COST_RESOLUTION, LABELS_PER_POSITION, get_cost_model, quantize_costs
+)
+
+# Byte standing in for the changed letter in a pattern key
+WILDCARD = b"\x00"
+
+class _EdgeRuns:
+	"""
+	Read-only sequence over an implicit graph's CSR entries. Entries are
+	never stored: node u's run, entries offsets[u] to offsets[u + 1], is
+	generated by run(u) when first read. The last run is kept, since the
+	finders read a node's entries in order.
+	"""
+	__slots__ = ('_offsets', '_run', '_first', '_last', '_values')
+
+	def __init__(self, offsets: Sequence[int], run: Callable[[int], List]):
+		self._offsets = offsets
+		self._run = run
+		self._first = self._last = 0
+		self._values: List = []
+
+	def __len__(self) -> int:
+		return self._offsets[-1]
+
+	def _load(self, index: int):
+		node = bisect_right(self._offsets, index) - 1
+		self._values = self._run(node)
+		self._first, self._last = self._offsets[node], self._offsets[node + 1]
+
+	def __getitem__(self, index):
+		if isinstance(index, slice):
+			start, stop, step = index.indices(len(self))
+			if step == 1 and start < stop:
+				if not self._first <= start < self._last:
+					self._load(start)
+				if stop <= self._last:
+					return self._values[start - self._first:stop - self._first]
+			return [self[i] for i in range(start, stop, step)]
+		if not self._first <= index < self._last:
+			if index < 0:
+				index += len(self)
+			if not 0 <= index < len(self):
+				raise IndexError("edge index out of range")
+			self._load(index)
+		return self._values[index - self._first]
+
+	def __iter__(self):
+		return chain.from_iterable(map(self._run, range(len(self._offsets) - 1)))
+
+	def __array__(self, dtype=None, copy=None):
+		# NumPy consumers (VectorBFS, analytics, hop tables) get every run
+		# at once rather than one __getitem__ per entry
+		return np.array(list(self), dtype=dtype)
+
+class ImplicitWordGraph(WordGraph):
+	"""
+	Word graph that never materialises its edges.
+	Only a wildcard-pattern bucket index is kept (e.g. "c*t" -> ids of cat,
+	cot, cut), and just for buckets with two or more words, since a word
+	alone in its bucket has no edge there. It is stored compactly: the
+	sorted pattern keys (the word's bytes with the wildcard position
+	zeroed, as a fixed-width table), and the members of every bucket as
+	one CSR array. The words are a fixed-width byte table like a binary graph's
+	WORD section. Neighbors, edge labels and costs are generated from the
+	buckets on demand, so memory grows with the number of words instead of
+	edges.
+	offsets is a real CSR offsets array (4 bytes per word), so the graph
+	exposes the same offsets / neighbors / costs_for / quantized_costs
+	sequences the finders read on a CSR WordGraph; node u's entries list
+	its bucket mates position by position, in id order.
+	"""
+	def __init__(self, words: Sequence[str], cost_model="standard", metadata: Optional[Dict] = None):
+		words = sorted(set(words))
+		length = len(words[0]) if words else 0
+		model = get_cost_model(cost_model)
+		metadata = dict(metadata or {})
+		metadata.setdefault("word_length", length)
+		metadata["node_count"] = len(words)
+		metadata["cost_model"] = model.name
+		table = WordTable(memoryview("".join(words).encode('ascii')), length, len(words))
+		super().__init__(table, None, None, None, metadata, index=table)
+		self.model = model
+		# Cost of every edge label per cost model (and resolution, for
+		# quantized costs), which the cost sequences look entries up in
+		self._cost_tables: Dict[Tuple, array] = {}
+
+		# Pattern key of every (word, position): the word's bytes with that
+		# position zeroed, compared as fixed-width byte strings
+		letters = np.frombuffer(table._data, dtype=np.uint8).reshape(len(words), length)
+		keys = np.repeat(letters[:, None, :], length, axis=1)
+		keys[:, np.arange(length), np.arange(length)] = 0
+		keys = keys.reshape(len(words) * length, length).view(f'S{max(length, 1)}').ravel()
+		nodes = np.repeat(np.arange(len(words), dtype=np.uint32), length)
+		order = np.argsort(keys, kind='stable')
+		patterns, counts = np.unique(keys[order], return_counts=True)
+		shared = counts > 1
+		bucket_offsets = np.zeros(int(shared.sum()) + 1, dtype=np.uint32)
+		np.cumsum(counts[shared], out=bucket_offsets[1:])
+		members = nodes[order][np.repeat(shared, counts)]
+		self._patterns = WordTable(memoryview(patterns[shared].tobytes()), length, int(shared.sum()))
+		self._bucket_offsets = array('I', bucket_offsets.tobytes())
+		self._members = array('I', members.tobytes())
+
+		# A word has one edge per other member of each of its buckets
+		degrees = np.zeros(len(words), dtype=np.int64)
+		np.add.at(degrees, members, np.repeat(counts[shared] - 1, counts[shared]))
+		offsets = np.zeros(len(words) + 1, dtype=np.uint32)
+		np.cumsum(degrees, out=offsets[1:])
+		self.offsets = array('I', offsets.tobytes())
+		self.neighbors = _EdgeRuns(self.offsets, self._neighbor_run)
+		self._edge_labels = _EdgeRuns(self.offsets, self._label_run)
+		self.costs = self.costs_for()
+		self.metadata["edge_count"] = self.edge_count
+
+	@classmethod
+	def from_dictionary(cls, dict_file: str, cost_model="standard") -> "ImplicitWordGraph":
+		"""Index a one-word-per-line dictionary file"""
+		from src.scripts.filter_words import normalize_word
+		with open(dict_file, 'r', encoding='utf-8') as f:
+			words = {normalize_word(line) for line in f}
+		words.discard(None)
+		return cls(words, cost_model)
+
+	@property
+	def nbytes(self) -> int:
+		"""Rough memory footprint: the words, the offsets and the bucket index"""
+		return super().nbytes + sum(
+			len(values) * values.itemsize
+			for values in (self._bucket_offsets, self._members, *self._cost_tables.values())
+		) + len(self._patterns) * self.word_length
+
+	def costs_for(self, cost_model=None) -> Sequence[float]:
+		"""
+		Edge costs aligned with neighbors under cost_model (default the built
+		one), looked up per entry from the model's cost of every edge label
+		"""
+		model = self.model if cost_model is None else get_cost_model(cost_model)
+		costs = self._model_costs.get(model.name)
+		if costs is None:
+			costs = _EdgeRuns(self.offsets, partial(self._cost_run, self._label_costs(model)))
+			self._model_costs[model.name] = costs
+		return costs
+
+	def quantized_costs(self, cost_model=None, resolution: Optional[int] = None) -> Sequence[int]:
+		"""costs_for(cost_model) as integers in units of 1 / resolution, generated per entry"""
+		model = self.model if cost_model is None else get_cost_model(cost_model)
+		resolution = resolution or self.cost_resolution or DEFAULT_COST_RESOLUTION
+		costs = self._quantized_costs.get((model.name, resolution))
+		if costs is None:
+			table = quantize_costs(self._label_costs(model), resolution)
+			self._cost_tables[(model.name, resolution)] = table
+			costs = _EdgeRuns(self.offsets, partial(self._cost_run, table))
+			self._quantized_costs[(model.name, resolution)] = costs
+		return costs
+
+	def _label_costs(self, model) -> array:
+		"""Cost of every edge label under model, cached"""
+		table = self._cost_tables.get((model.name,))
+		if table is None:
+			table = model.label_costs(self.word_length, range(self.word_length * LABELS_PER_POSITION))
+			self._cost_tables[(model.name,)] = table
+		return table
+
+	def search_lists(self, costs: Optional[Sequence] = None) -> Tuple[Sequence[int], Sequence[int], Sequence]:
+		"""The CSR sequences as they are: list copies would materialise every edge"""
+		return self.offsets, self.neighbors, self.costs if costs is None else costs
+
+	def search_words(self) -> Sequence[str]:
+		"""The word table itself, so heuristics do not keep a str per word"""
+		return self.words
+
+	def _buckets_of(self, node: int) -> List[Tuple[int, int, int]]:
+		"""(position, first member, end) of every shared bucket of node, by position"""
+		length = self.word_length
+		raw = bytes(self.words._data[node * length:(node + 1) * length])
+		patterns, bucket_offsets = _RawKeys(self._patterns), self._bucket_offsets
+		buckets = []
+		for i in range(length):
+			key = raw[:i] + WILDCARD + raw[i + 1:]
+			bucket = bisect_left(patterns, key)
+			if bucket < len(patterns) and patterns[bucket] == key:
+				buckets.append((i, bucket_offsets[bucket], bucket_offsets[bucket + 1]))
+		return buckets
+
+	def _neighbor_run(self, node: int) -> List[int]:
+		members = self._members
+		return [other for _, start, end in self._buckets_of(node) for other in members[start:end] if other != node]
+
+	def _label_run(self, node: int) -> List[int]:
+		"""Edge labels of node's entries: position * 676 + old letter * 26 + new letter"""
+		length, raw, members = self.word_length, self.words._data, self._members
+		base = node * length
+		labels = []
+		for i, start, end in self._buckets_of(node):
+			label = i * LABELS_PER_POSITION + (raw[base + i] - ord('a')) * 26 - ord('a')
+			labels.extend(label + raw[other * length + i] for other in members[start:end] if other != node)
+		return labels
+
+	def _cost_run(self, table: array, node: int) -> List:
+		return [table[label] for label in self._label_run(node)]
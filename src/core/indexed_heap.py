@@ -0,0 +1,85 @@
+from array import array
+from typing import Tuple
+
+class IndexedHeap:
+	"""
+	Binary min-heap of integer node ids with a true decrease-key.
+	A position array maps each node to its slot in the heap, so a node is
+	in the heap at most once: improving its key moves the existing entry up
+	instead of pushing a duplicate. Ties pop in no particular order.
+	"""
+	__slots__ = ('_nodes', '_keys', '_positions')
+
+	def __init__(self, capacity: int):
+		self._nodes = []
+		self._keys = []
+		# node -> index in _nodes / _keys, or -1 when not in the heap
+		self._positions = array('i', [-1]) * capacity
+
+	def __len__(self) -> int:
+		return len(self._nodes)
+
+	def __contains__(self, node: int) -> bool:
+		return self._positions[node] >= 0
+
+	def key(self, node: int) -> float:
+		return self._keys[self._positions[node]]
+
+	def push(self, node: int, key: float):
+		"""Insert node, or lower its key if it is already queued with a higher one"""
+		position = self._positions[node]
+		if position < 0:
+			self._nodes.append(node)
+			self._keys.append(key)
+			self._sift_up(len(self._nodes) - 1)
+		elif key < self._keys[position]:
+			self._keys[position] = key
+			self._sift_up(position)
+
+	def decrease_key(self, node: int, key: float):
+		"""Lower the key of a queued node (key must not be higher than the current one)"""
+		position = self._positions[node]
+		self._keys[position] = key
+		self._sift_up(position)
+
+	def pop(self) -> Tuple[float, int]:
+		"""Remove and return (key, node) with the smallest key"""
+		nodes, keys = self._nodes, self._keys
+		node, key = nodes[0], keys[0]
+		self._positions[node] = -1
+		last_node, last_key = nodes.pop(), keys.pop()
+		if nodes:
+			nodes[0], keys[0] = last_node, last_key
+			self._sift_down(0)
+		return key, node
+
+	def _sift_up(self, position: int):
+		nodes, keys, positions = self._nodes, self._keys, self._positions
+		node, key = nodes[position], keys[position]
+		while position > 0:
+			parent = (position - 1) >> 1
+			if keys[parent] <= key:
+				break
+			nodes[position], keys[position] = nodes[parent], keys[parent]
+			positions[nodes[position]] = position
+			position = parent
+		nodes[position], keys[position] = node, key
+		positions[node] = position
+
+	def _sift_down(self, position: int):
+		nodes, keys, positions = self._nodes, self._keys, self._positions
+		node, key = nodes[position], keys[position]
+		size = len(nodes)
+		while True:
+			child = 2 * position + 1
+			if child >= size:
+				break
+			if child + 1 < size and keys[child + 1] < keys[child]:
+				child += 1
+			if key <= keys[child]:
+				break
+			nodes[position], keys[position] = nodes[child], keys[child]
+			positions[nodes[position]] = position
+			position = child
+		nodes[position], keys[position] = node, key
+		positions[node] = position
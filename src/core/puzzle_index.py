@@ -0,0 +1,293 @@
+"""
+Precomputed start/end pairs for generating puzzles by difficulty.
+
+Pairs are gathered at build time component by component, from BFS and
+Dijkstra runs out of source words drawn within each component, so every
+pair is connected (both words share a component) and carries its
+shortest-ladder length and cheapest ladder cost. They are bucketed by
+ladder length and sorted by cost within each bucket, which turns drawing
+a puzzle into two random indexes.
+
+Difficulties are bands of ladder length over the graph's hop diameter
+(from the build-time analytics), so they do not shift with whichever
+lengths the sampling happened to reach.
+
+Serialized layout (little-endian): magic "WLPZ", version, node count,
+bucket count, the graph's diameter and its CRC32 (graph_format.graph_crc),
+a (ladder length, pair count) uint32 table, then for each bucket its start
+ids and end ids (uint32) and costs (float32).
+"""
+import os
+import random
+import struct
+import sys
+from array import array
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
+import numpy as np
+from src.core.graph_format import GRAPH_DIR, graph_crc
+from src.core.shortest_paths import bfs, dijkstra
+
+PUZZLE_MAGIC = b"WLPZ"
+PUZZLE_VERSION = 3
+PUZZLE_HEADER = struct.Struct("<4sHIIII")
+
+# Ladders shorter than this are too easy to be worth offering
+MIN_LADDER_LENGTH = 2
+DEFAULT_SOURCE_COUNT = 256
+DEFAULT_PAIRS_PER_BUCKET = 4096
+
+# Named difficulties split the ladder lengths up to the diameter into equal bands
+DIFFICULTIES = ('easy', 'medium', 'hard')
+# Number of cost bands within one ladder length
+COST_TIERS = 3
+
+def puzzle_index_path(word_length: int, directory: str = GRAPH_DIR) -> str:
+	return os.path.join(directory, f"puzzles_{word_length}.idx")
+
+def _bucket(pairs: np.ndarray, pairs_per_bucket: int, rng) -> Tuple[array, array, array]:
+	"""
+	One stored bucket from a (3, n) array of start ids, end ids and costs:
+	at most pairs_per_bucket of them, drawn at random, sorted by cost
+	"""
+	starts, ends, costs = pairs
+	if len(starts) > pairs_per_bucket:
+		keep = rng.choice(len(starts), pairs_per_bucket, replace=False)
+		starts, ends, costs = starts[keep], ends[keep], costs[keep]
+	order = np.argsort(costs, kind='stable')
+	return (
+		array('I', starts[order].astype(np.uint32).tobytes()),
+		array('I', ends[order].astype(np.uint32).tobytes()),
+		array('f', costs[order].astype(np.float32).tobytes())
+	)
+
+class Puzzle(NamedTuple):
+	start: str
+	end: str
+	length: int
+	cost: float
+
+class PuzzleIndex:
+	"""
+	Connected word pairs bucketed by ladder length (steps), each bucket
+	sorted by ladder cost. Pairs are stored as word ids into words.
+	diameter is the longest ladder in the graph (0 if unknown, in which
+	case the longest indexed one stands in for it).
+	"""
+	def __init__(self, words: Sequence[str], buckets: Dict[int, Tuple[array, array, array]],
+				 diameter: int = 0, graph_crc: int = 0):
+		self.words = words
+		self.buckets = buckets
+		self.diameter = diameter or max(buckets, default=0)
+		# CRC of the graph the pairs were drawn from (see graph_format.graph_crc)
+		self.graph_crc = graph_crc
+
+	@classmethod
+	def build(cls, graph, source_count: int = DEFAULT_SOURCE_COUNT,
+			  pairs_per_bucket: int = DEFAULT_PAIRS_PER_BUCKET, seed: Optional[int] = 0,
+			  components: Optional[Iterable[int]] = None) -> "PuzzleIndex":
+		"""
+		Gather pairs per connected component. Every component with ladders
+		of MIN_LADDER_LENGTH steps or more gets a share of source_count in
+		proportion to its size (at least one source). Its most eccentric
+		word always starts one of the searches, as it ends the component's
+		longest ladders; the other sources are drawn from its members. At
+		most pairs_per_bucket pairs are kept per ladder length. components
+		limits the searches to those component labels; they still get the
+		share they would have in a full build.
+		"""
+		rng = np.random.default_rng(seed)
+		labels = np.asarray(graph.components, dtype=np.int64)
+		if graph.eccentricities is not None:
+			node_eccentricities = np.asarray(graph.eccentricities, dtype=np.int64)
+			diameters = np.asarray(graph.component_diameters, dtype=np.int64)
+		else:
+			from src.core.graph_analytics import analyze
+			_, _, diameters, node_eccentricities = analyze(graph)
+			diameters = np.asarray(diameters, dtype=np.int64)
+			node_eccentricities = np.asarray(node_eccentricities, dtype=np.int64)
+		sizes = np.bincount(labels, minlength=len(diameters))
+		eligible = np.flatnonzero(diameters >= MIN_LADDER_LENGTH)
+		shares = np.minimum(sizes[eligible], np.maximum(
+			1, source_count * sizes[eligible] // max(1, int(sizes[eligible].sum()))
+		))
+		# Keep each source's share of every bucket so no one word dominates
+		per_source = max(1, -(-pairs_per_bucket // max(1, int(shares.sum()))))
+		if components is not None:
+			chosen = np.isin(eligible, np.fromiter(components, dtype=np.int64))
+			eligible, shares = eligible[chosen], shares[chosen]
+
+		order = np.argsort(labels, kind='stable')
+		starts = np.zeros(len(sizes) + 1, dtype=np.int64)
+		np.cumsum(sizes, out=starts[1:])
+		sources = []
+		for component, share in zip(eligible.tolist(), shares.tolist()):
+			members = order[starts[component]:starts[component + 1]]
+			peripheral = members[np.argmax(node_eccentricities[members])]
+			others = members[members != peripheral]
+			if len(others) > share - 1:
+				others = rng.choice(others, share - 1, replace=False)
+			sources.extend([int(peripheral), *others.tolist()])
+		sources.sort()
+
+		gathered: Dict[int, List[np.ndarray]] = {}
+		for source in sources:
+			depths = np.frombuffer(bfs(graph, source)[0], dtype=np.int32)
+			distances = np.frombuffer(dijkstra(graph, source)[0], dtype=np.float64)
+			for length in np.unique(depths[depths >= MIN_LADDER_LENGTH]).tolist():
+				ends = np.flatnonzero(depths == length)
+				if len(ends) > per_source:
+					ends = rng.choice(ends, per_source, replace=False)
+				gathered.setdefault(length, []).append(
+					np.stack([np.full(len(ends), source), ends, distances[ends]])
+				)
+
+		buckets = {
+			length: _bucket(np.concatenate(parts, axis=1), pairs_per_bucket, rng)
+			for length, parts in sorted(gathered.items())
+		}
+		return cls(graph.words, buckets, int(diameters.max(initial=0)), graph_crc(graph))
+
+	def carried_over(self, graph, remap: Sequence[int], unchanged: Iterable[int],
+					 source_count: int = DEFAULT_SOURCE_COUNT,
+					 pairs_per_bucket: int = DEFAULT_PAIRS_PER_BUCKET, seed: Optional[int] = 0) -> "PuzzleIndex":
+		"""
+		This index moved onto graph, an updated version of the graph it was
+		built from; remap[old id] is each word's id in graph (-1 if it was
+		removed). Pairs inside the unchanged components (labels of graph
+		whose members and edges are as before) keep their length and cost,
+		so they are only renumbered. Every other component gets fresh pairs
+		from build() restricted to it.
+		"""
+		remap = np.asarray(remap, dtype=np.int64)
+		labels = np.asarray(graph.components, dtype=np.int64)
+		kept = np.zeros(max(labels, default=-1) + 1, dtype=bool)
+		kept[np.fromiter(unchanged, dtype=np.int64)] = True
+		fresh = type(self).build(graph, source_count, pairs_per_bucket, seed, np.flatnonzero(~kept))
+		rng = np.random.default_rng(seed)
+
+		buckets = {}
+		for length in sorted(set(self.buckets) | set(fresh.buckets)):
+			parts = []
+			for index, ids in ((self, remap), (fresh, None)):
+				if length not in index.buckets:
+					continue
+				starts, ends, costs = (np.asarray(values) for values in index.buckets[length])
+				if ids is not None:
+					starts, ends = ids[starts], ids[ends]
+					keep = starts >= 0
+					keep[keep] = kept[labels[starts[keep]]]
+					starts, ends, costs = starts[keep], ends[keep], costs[keep]
+				parts.append(np.stack([starts, ends, costs.astype(np.float64)]))
+			pairs = np.concatenate(parts, axis=1)
+			if pairs.shape[1]:
+				buckets[length] = _bucket(pairs, pairs_per_bucket, rng)
+		return type(self)(graph.words, buckets, fresh.diameter, fresh.graph_crc)
+
+	def save(self, path: str):
+		"""Write the serialized index (atomically, via a temp file)"""
+		temp_path = path + ".tmp"
+		with open(temp_path, 'wb') as f:
+			f.write(PUZZLE_HEADER.pack(PUZZLE_MAGIC, PUZZLE_VERSION, len(self.words), len(self.buckets),
+									   self.diameter, self.graph_crc))
+			table = array('I')
+			for length, (starts, _, _) in self.buckets.items():
+				table.extend((length, len(starts)))
+			for values in [table] + [values for bucket in self.buckets.values() for values in bucket]:
+				values = array(values.typecode, values)
+				if sys.byteorder != 'little':
+					values.byteswap()
+				f.write(values.tobytes())
+		os.replace(temp_path, path)
+
+	@classmethod
+	def load(cls, path: str, graph) -> "PuzzleIndex":
+		"""Read an index, failing unless it was built from graph"""
+		with open(path, 'rb') as f:
+			data = f.read()
+		if len(data) < PUZZLE_HEADER.size:
+			raise ValueError("file too short for a puzzle index")
+		magic, version, node_count, bucket_count, diameter, crc = PUZZLE_HEADER.unpack_from(data, 0)
+		if magic != PUZZLE_MAGIC or version != PUZZLE_VERSION:
+			raise ValueError("not a puzzle index of a supported version")
+		if node_count != len(graph) or crc != graph_crc(graph):
+			raise ValueError("puzzle index was built for a different graph")
+
+		offset = PUZZLE_HEADER.size
+		def take(typecode: str, count: int) -> array:
+			nonlocal offset
+			values = array(typecode)
+			values.frombytes(data[offset:offset + values.itemsize * count])
+			if len(values) != count:
+				raise ValueError("puzzle index is truncated")
+			if sys.byteorder != 'little':
+				values.byteswap()
+			offset += values.itemsize * count
+			return values
+
+		table = take('I', 2 * bucket_count)
+		buckets = {}
+		for length, count in zip(table[::2], table[1::2]):
+			buckets[length] = (take('I', count), take('I', count), take('f', count))
+		if offset != len(data):
+			raise ValueError("puzzle index size does not match its header")
+		return cls(graph.words, buckets, diameter, crc)
+
+	def __len__(self) -> int:
+		return sum(len(starts) for starts, _, _ in self.buckets.values())
+
+	@property
+	def nbytes(self) -> int:
+		return len(self) * 12
+
+	@property
+	def max_length(self) -> int:
+		return max(self.buckets, default=0)
+
+	def lengths_for(self, difficulty: Union[str, int]) -> List[int]:
+		"""Ladder lengths a difficulty name (or an exact length) covers"""
+		if isinstance(difficulty, int):
+			return [difficulty] if difficulty in self.buckets else []
+		if difficulty not in DIFFICULTIES:
+			raise ValueError(f"Unknown difficulty: {difficulty}")
+		lengths = list(range(MIN_LADDER_LENGTH, self.diameter + 1))
+		if not lengths:
+			return []
+		# Equal bands over the lengths up to the diameter; with fewer lengths
+		# than difficulties, neighbouring difficulties share a length
+		band = DIFFICULTIES.index(difficulty)
+		first = min(band * len(lengths) // len(DIFFICULTIES), len(lengths) - 1)
+		last = max((band + 1) * len(lengths) // len(DIFFICULTIES), first + 1)
+		return [length for length in lengths[first:last] if length in self.buckets]
+
+	def random_puzzle(self, difficulty: Union[str, int] = 'medium', cost_tier: Optional[int] = None,
+					  rng: random.Random = random) -> Optional[Puzzle]:
+		"""
+		Random pair of the given difficulty: a name from DIFFICULTIES or an
+		exact ladder length. cost_tier (0 to COST_TIERS - 1, cheapest first)
+		restricts the pick to one cost band of the chosen length.
+		Returns None when the index has no pair that qualifies.
+		"""
+		lengths = self.lengths_for(difficulty)
+		if not lengths:
+			return None
+		weights = [len(self.buckets[length][0]) for length in lengths]
+		length = rng.choices(lengths, weights)[0] if len(lengths) > 1 else lengths[0]
+		starts, ends, costs = self.buckets[length]
+		first, last = 0, len(starts)
+		if cost_tier is not None:
+			first, last = cost_tier * last // COST_TIERS, (cost_tier + 1) * last // COST_TIERS
+			if first == last:
+				return None
+		pick = rng.randrange(first, last)
+		return Puzzle(self.words[starts[pick]], self.words[ends[pick]], length, costs[pick])
+
+	def sample(self, count: int, difficulty: Union[str, int] = 'medium', cost_tier: Optional[int] = None,
+			   rng: random.Random = random) -> List[Puzzle]:
+		"""count random puzzles (with replacement); empty if none qualify"""
+		puzzles = []
+		for _ in range(count):
+			puzzle = self.random_puzzle(difficulty, cost_tier, rng)
+			if puzzle is None:
+				break
+			puzzles.append(puzzle)
+		return puzzles
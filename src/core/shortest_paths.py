@@ -0,0 +1,132 @@
+import heapq
+from array import array
+from collections import deque
+from typing import List, Optional, Tuple
+from src.core.word_graph import ROOT, UNVISITED, WordGraph
+
+def dijkstra(graph: WordGraph, source: int, order: Optional[array] = None) -> Tuple[array, array]:
+	"""
+	Single-source shortest paths over the weighted graph.
+	Returns (distances, parents); unreachable nodes keep inf / UNVISITED.
+	If order is given, order[node] is set to the rank at which node was settled.
+	"""
+	offsets, neighbors, costs = graph.search_lists()
+
+	distances = graph.new_cost_array()
+	parents = graph.new_parent_array()
+	distances[source] = 0
+	parents[source] = ROOT
+	frontier = [(0, source)]
+	settled = 0
+
+	while frontier:
+		distance, current = heapq.heappop(frontier)
+		if distance > distances[current]:
+			continue
+		if order is not None:
+			order[current] = settled
+		settled += 1
+		for i in range(offsets[current], offsets[current + 1]):
+			next_node = neighbors[i]
+			new_distance = distance + costs[i]
+			if new_distance < distances[next_node]:
+				distances[next_node] = new_distance
+				parents[next_node] = current
+				heapq.heappush(frontier, (new_distance, next_node))
+
+	return distances, parents
+
+def bfs(graph: WordGraph, source: int, order: Optional[array] = None) -> Tuple[array, array]:
+	"""
+	Single-source hop counts over the unweighted graph.
+	Returns (depths, parents); unreachable nodes keep depth -1 / UNVISITED.
+	If order is given, order[node] is set to the rank at which node was dequeued.
+	"""
+	offsets, neighbors, _ = graph.search_lists()
+
+	depths = array('i', [-1]) * len(graph)
+	parents = graph.new_parent_array()
+	depths[source] = 0
+	parents[source] = ROOT
+	queue = deque([source])
+	settled = 0
+
+	while queue:
+		current = queue.popleft()
+		if order is not None:
+			order[current] = settled
+		settled += 1
+		next_depth = depths[current] + 1
+		for next_node in neighbors[offsets[current]:offsets[current + 1]]:
+			if parents[next_node] == UNVISITED:
+				parents[next_node] = current
+				depths[next_node] = next_depth
+				queue.append(next_node)
+
+	return depths, parents
+
+class ShortestPathTree:
+	"""
+	Completed single-source search rooted at source. The graph is undirected,
+	so the parent of a node is also its next step on a shortest path towards
+	the root, and one tree answers every "how far / which way to source"
+	question in constant time.
+	"""
+	def __init__(self, graph: WordGraph, source: int, distances, parents, weighted: bool, order=None):
+		self.graph = graph
+		self.source = source
+		self.distances = distances
+		self.parents = parents
+		self.weighted = weighted
+		# Rank at which each node was settled, i.e. how many nodes a
+		# search from source expands before reaching it (minus one)
+		self.order = order
+
+	@classmethod
+	def build(cls, graph: WordGraph, source: int, weighted: bool = True) -> "ShortestPathTree":
+		"""Run Dijkstra (weighted) or BFS (unweighted) from source"""
+		order = array('i', [-1]) * len(graph)
+		search = dijkstra if weighted else bfs
+		distances, parents = search(graph, source, order)
+		return cls(graph, source, distances, parents, weighted, order)
+
+	def reaches(self, node: int) -> bool:
+		return self.parents[node] != UNVISITED
+
+	def distance(self, node: int) -> float:
+		"""Path cost (weighted) or hop count (unweighted) from node to the root"""
+		if not self.reaches(node):
+			return float('inf')
+		return self.distances[node]
+
+	def next_step(self, node: int):
+		"""Neighbor of node one step closer to the root, or None at the root or if unreachable"""
+		parent = self.parents[node]
+		return parent if parent >= 0 else None
+
+	def path_to_root(self, node: int) -> List[int]:
+		"""Node ids from node to the root, or [] if node is unreachable"""
+		path = self.path_from_root(node)
+		path.reverse()
+		return path
+
+	def path_from_root(self, node: int) -> List[int]:
+		"""Node ids from the root to node, or [] if node is unreachable"""
+		if not self.reaches(node):
+			return []
+		return self.graph.reconstruct_path(self.parents, node)
+
+def next_move(tree: ShortestPathTree, word: str) -> Optional[Tuple[int, str]]:
+	"""
+	(position, letter) of the move from word one step along tree towards
+	its root, or None at the root or for a word that is unknown or cut off
+	"""
+	node = tree.graph.id_of(word)
+	next_node = None if node is None else tree.next_step(node)
+	if next_node is None:
+		return None
+	next_word = tree.graph.words[next_node]
+	for position, (old, new) in enumerate(zip(word, next_word)):
+		if old != new:
+			return position, new
+	return None
@@ -0,0 +1,110 @@
+"""
+Level-synchronous BFS over the CSR arrays with NumPy.
+
+Instead of popping one node at a time, each step expands a whole level:
+the frontier's neighbor runs are gathered into one index array, filtered
+against a boolean visited array, and the survivors become the next
+frontier. When the frontier grows large the step switches direction
+(bottom-up): every unvisited node checks whether any of its neighbors is
+in the frontier, which touches fewer edges once most of the component has
+been reached.
+"""
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+from src.core.word_graph import ROOT, UNVISITED
+
+# Switch to bottom-up once the frontier's edges outnumber the unvisited
+# nodes' edges by this factor
+BOTTOM_UP_FACTOR = 2
+
+class VectorBFS:
+	"""
+	NumPy BFS engine for one CSR WordGraph. Queries return (depths,
+	parents) as int32 arrays using the same conventions as
+	shortest_paths.bfs: depth -1 and UNVISITED for unreached nodes, ROOT
+	as the parent of each source.
+	"""
+	def __init__(self, graph):
+		if graph.offsets is None:
+			raise ValueError("vectorized BFS needs a graph with CSR arrays")
+		self.graph = graph
+		# An ImplicitWordGraph generates its neighbors here once, so the
+		# engine holds the whole adjacency even for a graph that does not
+		self.offsets = np.asarray(graph.offsets, dtype=np.int64)
+		self.neighbors = np.asarray(graph.neighbors, dtype=np.int64)
+		self.degrees = np.diff(self.offsets)
+		# Tail node of every CSR entry, for bottom-up steps
+		self.tails = np.repeat(np.arange(len(graph), dtype=np.int64), self.degrees)
+
+	def _entries(self, nodes: np.ndarray) -> np.ndarray:
+		"""Indices of all CSR entries of nodes, concatenated"""
+		starts = self.offsets[nodes]
+		degrees = self.degrees[nodes]
+		ends = np.cumsum(degrees)
+		return np.repeat(starts - (ends - degrees), degrees) + np.arange(ends[-1] if len(ends) else 0)
+
+	def _step(self, frontier: np.ndarray, visited: np.ndarray, parents: np.ndarray) -> np.ndarray:
+		"""Expand one level; marks and parents the new nodes and returns them (sorted)"""
+		frontier_edges = int(self.degrees[frontier].sum())
+		if frontier_edges > BOTTOM_UP_FACTOR * int(self.degrees[~visited].sum()):
+			in_frontier = np.zeros(len(visited), dtype=bool)
+			in_frontier[frontier] = True
+			entries = self._entries(np.flatnonzero(~visited))
+			entries = entries[in_frontier[self.neighbors[entries]]]
+			nodes, parent_nodes = self.tails[entries], self.neighbors[entries]
+		else:
+			entries = self._entries(frontier)
+			nodes = self.neighbors[entries]
+			keep = ~visited[nodes]
+			nodes, parent_nodes = nodes[keep], self.tails[entries[keep]]
+		# A node reached from several frontier nodes keeps one of them
+		nodes, first = np.unique(nodes, return_index=True)
+		visited[nodes] = True
+		parents[nodes] = parent_nodes[first]
+		return nodes
+
+	def _search(self, sources: Sequence[int], target: Optional[int] = None,
+				max_depth: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+		node_count = len(self.offsets) - 1
+		sources = np.unique(np.asarray(sources, dtype=np.int64))
+		depths = np.full(node_count, -1, dtype=np.int32)
+		parents = np.full(node_count, UNVISITED, dtype=np.int32)
+		visited = np.zeros(node_count, dtype=bool)
+		visited[sources] = True
+		parents[sources] = ROOT
+		depths[sources] = 0
+
+		frontier, depth = sources, 0
+		while len(frontier) and (target is None or not visited[target]):
+			if max_depth is not None and depth >= max_depth:
+				break
+			frontier = self._step(frontier, visited, parents)
+			depth += 1
+			depths[frontier] = depth
+		return depths, parents
+
+	def single_source(self, source: int, max_depth: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+		"""Hop counts and BFS parents from source (optionally only up to max_depth)"""
+		return self._search([source], max_depth=max_depth)
+
+	def multi_source(self, sources: Sequence[int], max_depth: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+		"""
+		Hop counts to the nearest of sources and BFS parents; following
+		parents from any reached node ends at the source that reached it.
+		"""
+		return self._search(sources, max_depth=max_depth)
+
+	def single_pair(self, source: int, target: int) -> Tuple[Optional[List[int]], np.ndarray]:
+		"""
+		Shortest ladder from source to target as node ids (None if there is
+		none), plus the depths array; stops at the level that reaches target,
+		so only the nodes above that level were expanded.
+		"""
+		depths, parents = self._search([source], target=target)
+		if parents[target] == UNVISITED:
+			return None, depths
+		return [int(node) for node in self.graph.reconstruct_path(parents, target)], depths
+
+	def reachable(self, sources: Sequence[int]) -> np.ndarray:
+		"""Boolean mask of the nodes reachable from any of sources"""
+		return self._search(sources)[1] != UNVISITED
@@ -0,0 +1,452 @@
+import json
+import struct
+import sys
+from array import array
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Size of one list slot (an object pointer), for nbytes
+SLOT_BYTES = struct.calcsize('P')
+
+# Markers used in per-search parent arrays
+ROOT = -1
+UNVISITED = -2
+
+class SearchArrays:
+	"""
+	Best-cost and parent lists for searches over one graph, reused from
+	one search to the next. Instead of being refilled, every search starts
+	a new generation: costs[node] and parents[node] only hold for this
+	search while stamps[node] equals it, so starting a search is O(1)
+	rather than O(nodes). Plain lists are used because reading them back
+	needs no boxing.
+	"""
+	__slots__ = ('stamps', 'costs', 'parents', 'generation')
+
+	def __init__(self, size: int):
+		self.stamps = [0] * size
+		self.costs = [0.0] * size
+		self.parents = [UNVISITED] * size
+		self.generation = 0
+
+	def start(self, source: int) -> int:
+		"""Begin a search rooted at source and return its generation"""
+		self.generation += 1
+		self.stamps[source] = self.generation
+		self.costs[source] = 0
+		self.parents[source] = ROOT
+		return self.generation
+
+class WordGraph:
+	"""
+	Word ladder graph with words interned to integer ids.
+	Adjacency is stored in CSR form: the neighbors of node u are
+	neighbors[offsets[u]:offsets[u + 1]] and the matching edge costs
+	sit at the same positions in costs.
+	"""
+	def __init__(self, words: Sequence[str], offsets: Sequence[int], neighbors: Sequence[int],
+				 costs: Sequence[float], metadata: Optional[Dict] = None, index=None):
+		self.words = words
+		self.offsets = offsets
+		self.neighbors = neighbors
+		self.costs = costs
+		self.metadata = dict(metadata or {})
+		# word -> id lookup; anything with get() and __contains__ will do
+		self._index = index if index is not None else {word: i for i, word in enumerate(words)}
+		# Backing mmap when the arrays are views into a binary graph file
+		self._mapping = None
+		# ALT landmark tables: landmark node ids and, per landmark, the
+		# shortest-path cost from it to every node (inf if unreachable)
+		self.landmarks: List[int] = []
+		self.landmark_distances: List[Sequence[float]] = []
+		# Connected-component label per node, filled in lazily if the graph
+		# file did not carry one
+		self._components: Optional[Sequence[int]] = None
+		# Per CSR entry, the letter change the edge makes encoded as
+		# position * 676 + old letter * 26 + new letter (see cost_model)
+		self._edge_labels: Optional[Sequence[int]] = None
+		# Cost arrays materialised for cost models other than the built one
+		self._model_costs: Dict[str, Sequence[float]] = {}
+		# Integer edge costs keyed by (cost model, resolution)
+		self._quantized_costs: Dict[Tuple[str, int], Sequence[int]] = {}
+		# List copies of the CSR arrays for the search loops (see search_lists)
+		self._search_lists: Optional[Tuple[List[int], List[int]]] = None
+		self._search_costs: Dict[int, Tuple[Sequence, List]] = {}
+		self._search_words: Optional[List[str]] = None
+		# Build-time analytics (see graph_analytics): hop eccentricity per
+		# node, and size and hop diameter per component; None if not computed
+		self.eccentricities: Optional[Sequence[int]] = None
+		self.component_sizes: Optional[Sequence[int]] = None
+		self.component_diameters: Optional[Sequence[int]] = None
+
+	@classmethod
+	def from_graph_data(cls, graph_data: Dict) -> "WordGraph":
+		"""Build a WordGraph from the {"words": ..., "graph": {word: {word: cost}}} layout"""
+		words = list(graph_data["words"])
+		adjacency = graph_data["graph"]
+		index = {word: i for i, word in enumerate(words)}
+
+		offsets = array('I', [0])
+		neighbors = array('I')
+		costs = array('d')
+		for word in words:
+			for next_word, edge_cost in adjacency.get(word, {}).items():
+				neighbors.append(index[next_word])
+				costs.append(edge_cost)
+			offsets.append(len(neighbors))
+
+		metadata = dict(graph_data.get("metadata", {}))
+		metadata.setdefault("node_count", len(words))
+		metadata.setdefault("edge_count", len(neighbors) // 2)
+		if words:
+			metadata.setdefault("word_length", len(words[0]))
+		graph = cls(words, offsets, neighbors, costs, metadata)
+		if graph_data.get("components"):
+			graph._components = array('i', graph_data["components"])
+		if graph_data.get("eccentricities"):
+			graph.set_analytics(
+				array('i', graph_data["eccentricities"]),
+				graph_data["component_sizes"],
+				graph_data["component_diameters"]
+			)
+
+		landmarks = graph_data.get("landmarks")
+		if landmarks:
+			graph.set_landmarks(
+				[index[word] for word in landmarks["words"]],
+				[
+					array('d', (float('inf') if d is None else d for d in distances))
+					for distances in landmarks["distances"]
+				]
+			)
+		return graph
+
+	@classmethod
+	def load(cls, graph_file: str, verify: bool = False) -> "WordGraph":
+		"""
+		Load a graph file written by build_graph (binary or JSON export), or
+		index a word list (.txt) as an ImplicitWordGraph; verify checks a
+		binary graph's checksum before using it
+		"""
+		from src.core.graph_format import is_binary_graph, read_binary_graph
+		if graph_file.endswith(".txt"):
+			from src.core.implicit_graph import ImplicitWordGraph
+			return ImplicitWordGraph.from_dictionary(graph_file)
+		if is_binary_graph(graph_file):
+			return read_binary_graph(graph_file, verify)
+		with open(graph_file, 'r', encoding='utf-8') as f:
+			return cls.from_graph_data(json.load(f))
+
+	def close(self):
+		"""Release the file mapping of a binary graph (the graph is unusable afterwards)"""
+		if self._mapping is not None:
+			self.offsets = self.neighbors = self.costs = None
+			self._components = self._edge_labels = None
+			self.eccentricities = self.component_sizes = self.component_diameters = None
+			self._model_costs = {}
+			self._quantized_costs = {}
+			self._search_lists = None
+			self._search_costs = {}
+			self._search_words = None
+			self.landmark_distances = []
+			self._mapping = None
+
+	def to_graph_data(self) -> Dict:
+		"""Export back to the dict-of-dicts layout used by the JSON graph files"""
+		graph_data = {
+			"metadata": dict(self.metadata),
+			"words": list(self.words),
+			"graph": {
+				self.words[u]: {self.words[v]: cost for v, cost in self.edges(u)}
+				for u in range(len(self.words))
+			},
+			"components": list(self.components)
+		}
+		if self.eccentricities is not None:
+			graph_data["eccentricities"] = list(self.eccentricities)
+			graph_data["component_sizes"] = list(self.component_sizes)
+			graph_data["component_diameters"] = list(self.component_diameters)
+		if self.landmarks:
+			graph_data["landmarks"] = self.landmark_data()
+		return graph_data
+
+	def landmark_data(self) -> Dict:
+		"""JSON-friendly landmark tables (unreachable distances become null)"""
+		return {
+			"words": [self.words[node] for node in self.landmarks],
+			"distances": [
+				[None if d == float('inf') else d for d in distances]
+				for distances in self.landmark_distances
+			]
+		}
+
+	@property
+	def components(self) -> Sequence[int]:
+		"""Connected-component label of every node"""
+		if self._components is None:
+			self._components = self.compute_components()
+		return self._components
+
+	def compute_components(self) -> array:
+		"""Label connected components 0..k-1 in order of discovery"""
+		neighbor_ids = self.neighbor_ids
+		labels = array('i', [-1]) * len(self.words)
+		label = 0
+		for root in range(len(self.words)):
+			if labels[root] != -1:
+				continue
+			labels[root] = label
+			stack = [root]
+			while stack:
+				current = stack.pop()
+				for next_node in neighbor_ids(current):
+					if labels[next_node] == -1:
+						labels[next_node] = label
+						stack.append(next_node)
+			label += 1
+		return labels
+
+	def component_of(self, word: str) -> Optional[int]:
+		"""Component label of word, or None if it is not in the graph"""
+		node = self._index.get(word)
+		return None if node is None else self.components[node]
+
+	def is_reachable(self, word1: str, word2: str) -> bool:
+		"""True if a ladder exists between the two words"""
+		component = self.component_of(word1)
+		return component is not None and component == self.component_of(word2)
+
+	@property
+	def cost_model(self) -> str:
+		"""Name of the cost model self.costs (and the landmark tables) were built with"""
+		return self.metadata.get("cost_model", "standard")
+
+	@property
+	def edge_labels(self) -> Sequence[int]:
+		"""Letter-change label of every CSR entry, derived from the words if not stored"""
+		if self._edge_labels is None:
+			from src.core.cost_model import label_edges
+			self._edge_labels = label_edges(self)
+		return self._edge_labels
+
+	def costs_for(self, cost_model=None) -> Sequence[float]:
+		"""
+		Edge costs aligned with neighbors under cost_model (a name or a
+		CostModel; default the built one). Other models are evaluated from the
+		edge labels on first use and cached, so re-weighting needs no rebuild.
+		"""
+		from src.core.cost_model import get_cost_model
+		if cost_model is None:
+			return self.costs
+		model = get_cost_model(cost_model)
+		if model.name == self.cost_model:
+			return self.costs
+		costs = self._model_costs.get(model.name)
+		if costs is None:
+			costs = model.label_costs(self.word_length, self.edge_labels)
+			self._model_costs[model.name] = costs
+		return costs
+
+	@property
+	def cost_resolution(self) -> Optional[int]:
+		"""Fixed-point resolution of the quantized costs stored with the graph, if any"""
+		return self.metadata.get("cost_resolution")
+
+	def quantized_costs(self, cost_model=None, resolution: Optional[int] = None) -> Sequence[int]:
+		"""
+		costs_for(cost_model) as integers in units of 1 / resolution (default
+		the graph's cost_resolution, else DEFAULT_COST_RESOLUTION), for
+		searches over integer costs. Cached per model and resolution.
+		"""
+		from src.core.cost_model import DEFAULT_COST_RESOLUTION, get_cost_model, quantize_costs
+		name = self.cost_model if cost_model is None else get_cost_model(cost_model).name
+		resolution = resolution or self.cost_resolution or DEFAULT_COST_RESOLUTION
+		costs = self._quantized_costs.get((name, resolution))
+		if costs is None:
+			costs = quantize_costs(self.costs_for(name), resolution)
+			self._quantized_costs[(name, resolution)] = costs
+		return costs
+
+	def search_lists(self, costs: Optional[Sequence] = None) -> Tuple[List[int], List[int], List]:
+		"""
+		offsets, neighbors and costs (an array from costs_for or
+		quantized_costs, default self.costs) as plain lists, for the hot
+		search loops: indexing a list returns the stored object, where an
+		array or memoryview boxes a new int or float on every read. Each
+		distinct node id and cost value is one shared object, so a list
+		costs 8 bytes per entry. Built on first use and cached.
+		"""
+		import numpy as np
+		if costs is None:
+			costs = self.costs
+		if self._search_lists is None:
+			node_ids = np.array(list(range(len(self.words))) or [0], dtype=object)
+			self._search_lists = (
+				list(self.offsets),
+				node_ids[np.asarray(self.neighbors, dtype=np.int64)].tolist()
+			)
+		cached = self._search_costs.get(id(costs))
+		if cached is None:
+			values, inverse = np.unique(np.asarray(costs), return_inverse=True)
+			# The array is kept with its list so its id() cannot be reused
+			cached = (costs, np.array(values.tolist() or [0], dtype=object)[inverse].tolist())
+			self._search_costs[id(costs)] = cached
+		return (*self._search_lists, cached[1])
+
+	def search_words(self) -> List[str]:
+		"""words as a plain list, for heuristics that read a node's word on every step (cached)"""
+		if self._search_words is None:
+			self._search_words = self.words if isinstance(self.words, list) else list(self.words)
+		return self._search_words
+
+	def set_analytics(self, eccentricities: Sequence[int], component_sizes: Sequence[int],
+					  component_diameters: Sequence[int]):
+		"""Attach the per-node and per-component tables computed by graph_analytics"""
+		self.eccentricities = eccentricities
+		self.component_sizes = component_sizes
+		self.component_diameters = component_diameters
+
+	def component_size(self, word: str) -> int:
+		"""Number of words reachable from word (itself included); 0 if unknown"""
+		component = self.component_of(word)
+		if component is None:
+			return 0
+		if self.component_sizes is not None:
+			return self.component_sizes[component]
+		return sum(1 for label in self.components if label == component)
+
+	def eccentricity(self, word: str) -> Optional[int]:
+		"""Most steps any shortest ladder from word needs, or None if unknown or not computed"""
+		node = self._index.get(word)
+		if node is None or self.eccentricities is None:
+			return None
+		return self.eccentricities[node]
+
+	def set_landmarks(self, landmarks: List[int], distances: List[Sequence[float]]):
+		"""Attach ALT landmark tables (one distance row per landmark)"""
+		self.landmarks = list(landmarks)
+		self.landmark_distances = list(distances)
+
+	def __len__(self) -> int:
+		return len(self.words)
+
+	def __contains__(self, word: str) -> bool:
+		return word in self._index
+
+	@property
+	def word_length(self) -> int:
+		return self.metadata.get("word_length", len(self.words[0]) if len(self.words) else 0)
+
+	@property
+	def nbytes(self) -> int:
+		"""Rough memory footprint of the graph's tables"""
+		total = 0
+		arrays = [
+			self.offsets, self.neighbors, self.costs, self._components, self._edge_labels,
+			self.eccentricities, self.component_sizes, self.component_diameters,
+			*self.landmark_distances, *self._model_costs.values(), *self._quantized_costs.values()
+		]
+		for values in arrays:
+			if isinstance(values, (array, memoryview)):
+				total += len(values) * values.itemsize
+		word_bytes = sys.getsizeof("a" * self.word_length)
+		if self._search_lists is not None:
+			# List slots plus one int object per node id (costs are shared objects)
+			total += SLOT_BYTES * (len(self.offsets) + len(self.neighbors)) + sys.getsizeof(1 << 20) * len(self.words)
+		total += SLOT_BYTES * len(self._search_costs) * len(self.neighbors)
+		if self._search_words is not None and self._search_words is not self.words:
+			total += len(self.words) * (word_bytes + SLOT_BYTES)
+		if isinstance(self.words, list):
+			# str objects and their list slots, plus the index dict's table
+			total += len(self.words) * (word_bytes + SLOT_BYTES)
+			if isinstance(self._index, dict):
+				total += sys.getsizeof(self._index)
+		else:
+			total += len(self.words) * self.word_length
+		return total
+
+	@property
+	def edge_count(self) -> int:
+		return len(self.neighbors) // 2
+
+	def id_of(self, word: str) -> Optional[int]:
+		"""Integer id of word, or None if it is not in the graph"""
+		return self._index.get(word)
+
+	def word_of(self, node: int) -> str:
+		return self.words[node]
+
+	def degree(self, node: int) -> int:
+		return self.offsets[node + 1] - self.offsets[node]
+
+	def neighbor_ids(self, node: int) -> Sequence[int]:
+		"""Neighbor ids of node as a contiguous slice of the CSR array"""
+		return self.neighbors[self.offsets[node]:self.offsets[node + 1]]
+
+	def edges(self, node: int, costs: Optional[Sequence[float]] = None) -> Iterator[Tuple[int, float]]:
+		"""(neighbor id, edge cost) pairs for node; costs is an array from costs_for (default self.costs)"""
+		start, end = self.offsets[node], self.offsets[node + 1]
+		if costs is None:
+			costs = self.costs
+		return zip(self.neighbors[start:end], costs[start:end])
+
+	def neighbor_words(self, word: str) -> List[str]:
+		"""Words one step away from word (empty if word is unknown)"""
+		node = self._index.get(word)
+		if node is None:
+			return []
+		return [self.words[v] for v in self.neighbor_ids(node)]
+
+	def edge_cost(self, word1: str, word2: str) -> Optional[float]:
+		"""Cost of the edge word1 -> word2, or None if they are not connected"""
+		u = self._index.get(word1)
+		v = self._index.get(word2)
+		if u is None or v is None:
+			return None
+		for next_node, cost in self.edges(u):
+			if next_node == v:
+				return cost
+		return None
+
+	def has_edge(self, word1: str, word2: str) -> bool:
+		return self.edge_cost(word1, word2) is not None
+
+	def path_to_words(self, path: Sequence[int]) -> List[str]:
+		return [self.words[node] for node in path]
+
+	def path_cost(self, path: Sequence[int]) -> float:
+		"""Sum of edge costs along a path of node ids"""
+		total = 0
+		for u, v in zip(path, path[1:]):
+			for next_node, cost in self.edges(u):
+				if next_node == v:
+					total += cost
+					break
+		return total
+
+	def new_parent_array(self) -> array:
+		"""Per-search predecessor array, every node initially UNVISITED"""
+		return array('i', [UNVISITED]) * len(self.words)
+
+	def new_cost_array(self) -> array:
+		"""Per-search best-cost array, every node initially unreached (inf)"""
+		return array('d', [float('inf')]) * len(self.words)
+
+	@staticmethod
+	def reconstruct_path(parents, target: int) -> List[int]:
+		"""
+		Walk predecessor links back from target to the search root.
+		parents maps (or indexes) node -> predecessor, with ROOT at the root.
+		"""
+		path = [target]
+		node = parents[target]
+		while node != ROOT:
+			path.append(node)
+			node = parents[node]
+		path.reverse()
+		return path
+
+def ensure_word_graph(graph_data) -> WordGraph:
+	"""Accept either a WordGraph or the legacy graph dict and return a WordGraph"""
+	if isinstance(graph_data, WordGraph):
+		return graph_data
+	return WordGraph.from_graph_data(graph_data)
@@ -0,0 +1,335 @@
+"""
+Compact word index: a minimal acyclic automaton (DAWG) over a word list.
+
+Shared prefixes and shared suffixes are each stored once, and the
+automaton is flattened into a few flat arrays, so a dictionary costs a
+handful of bytes per word instead of a Python str per entry. Every state
+also records how many words it leads to, which gives a stable word <-> id
+mapping: a word's id is its rank in sorted order, the same id the graph
+files use.
+
+Serialized layout (little-endian): magic "WLIX", version, state count,
+edge count, word count and the CRC32 of the graph the index was built for
+(graph_format.graph_crc, 0 if none), then first-edge offsets (uint32),
+edge targets (uint32), per-state word counts (uint32), edge letters and
+terminal flags (one byte each).
+"""
+import os
+import struct
+import sys
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from src.core.graph_format import GRAPH_DIR, graph_crc
+
+INDEX_MAGIC = b"WLIX"
+INDEX_VERSION = 2
+INDEX_HEADER = struct.Struct("<4sHIIII")
+
+# Pattern wildcards: one letter, and any run of letters (including none)
+ANY_LETTER = '?'
+ANY_LETTERS = '*'
+
+def word_index_path(word_length: int, directory: str = GRAPH_DIR) -> str:
+	return os.path.join(directory, f"words_{word_length}.idx")
+
+class _State:
+	__slots__ = ('edges', 'terminal')
+
+	def __init__(self):
+		self.edges: Dict[str, "_State"] = {}
+		self.terminal = False
+
+	def key(self) -> Tuple:
+		return (self.terminal, tuple((letter, id(child)) for letter, child in self.edges.items()))
+
+class WordIndex:
+	"""
+	Read-only word set with membership, prefix and wildcard queries.
+	Supports the get / __contains__ protocol WordGraph uses for its index.
+	"""
+	def __init__(self, first: array, targets: array, counts: array, labels: bytes, terminal: bytes,
+				 graph_crc: int = 0):
+		self._first = first
+		self._targets = targets
+		self._counts = counts
+		self._labels = labels
+		self._terminal = terminal
+		# CRC of the graph the index was saved for (see graph_format.graph_crc)
+		self.graph_crc = graph_crc
+
+	@classmethod
+	def from_words(cls, words: Iterable[str]) -> "WordIndex":
+		"""Build the minimal automaton from any iterable of words (duplicates are fine)"""
+		root = _State()
+		register: Dict[Tuple, _State] = {}
+		# Path of the previous word whose states are not yet minimized
+		unchecked: List[Tuple[_State, str, _State]] = []
+
+		def minimize(down_to: int):
+			while len(unchecked) > down_to:
+				parent, letter, child = unchecked.pop()
+				key = child.key()
+				existing = register.get(key)
+				if existing is None:
+					register[key] = child
+				else:
+					parent.edges[letter] = existing
+
+		previous = ""
+		for word in sorted(set(words)):
+			common = 0
+			while common < min(len(word), len(previous)) and word[common] == previous[common]:
+				common += 1
+			minimize(common)
+			state = unchecked[-1][2] if unchecked else root
+			for letter in word[common:]:
+				child = _State()
+				state.edges[letter] = child
+				unchecked.append((state, letter, child))
+				state = child
+			state.terminal = True
+			previous = word
+		minimize(0)
+		return cls._flatten(root)
+
+	@classmethod
+	def _flatten(cls, root: _State) -> "WordIndex":
+		# Number states depth-first from the root
+		numbers: Dict[int, int] = {id(root): 0}
+		order = [root]
+		stack = [root]
+		while stack:
+			state = stack.pop()
+			for child in reversed(list(state.edges.values())):
+				if id(child) not in numbers:
+					numbers[id(child)] = len(order)
+					order.append(child)
+					stack.append(child)
+
+		first = array('I', [0])
+		targets = array('I')
+		labels = bytearray()
+		terminal = bytearray()
+		for state in order:
+			for letter, child in state.edges.items():
+				labels.append(ord(letter))
+				targets.append(numbers[id(child)])
+			first.append(len(targets))
+			terminal.append(1 if state.terminal else 0)
+
+		# Words reachable from each state, filled in children-first (a
+		# shared state can be numbered before some of its parents)
+		counts = array('I', [0]) * len(order)
+		done = bytearray(len(order))
+		stack = [0]
+		while stack:
+			number = stack[-1]
+			pending = [
+				targets[edge] for edge in range(first[number], first[number + 1])
+				if not done[targets[edge]]
+			]
+			if pending:
+				stack.extend(pending)
+				continue
+			stack.pop()
+			if done[number]:
+				continue
+			total = terminal[number]
+			for edge in range(first[number], first[number + 1]):
+				total += counts[targets[edge]]
+			counts[number] = total
+			done[number] = 1
+		return cls(first, targets, counts, bytes(labels), bytes(terminal))
+
+	def save(self, path: str, graph=None):
+		"""Write the serialized index (atomically, via a temp file), tied to graph if given"""
+		if graph is not None:
+			self.graph_crc = graph_crc(graph)
+		header = INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, len(self._counts), len(self._targets), len(self),
+								   self.graph_crc)
+		temp_path = path + ".tmp"
+		with open(temp_path, 'wb') as f:
+			f.write(header)
+			for values in (self._first, self._targets, self._counts):
+				values = array('I', values)
+				if sys.byteorder != 'little':
+					values.byteswap()
+				f.write(values.tobytes())
+			f.write(self._labels)
+			f.write(self._terminal)
+		os.replace(temp_path, path)
+
+	@classmethod
+	def load(cls, path: str, graph=None) -> "WordIndex":
+		"""Read a serialized index; with graph given, fail unless it was saved for that graph"""
+		with open(path, 'rb') as f:
+			data = f.read()
+		if len(data) < INDEX_HEADER.size:
+			raise ValueError("file too short for a word index")
+		magic, version, state_count, edge_count, word_count, crc = INDEX_HEADER.unpack_from(data, 0)
+		if magic != INDEX_MAGIC or version != INDEX_VERSION:
+			raise ValueError("not a word index of a supported version")
+		if graph is not None and (word_count != len(graph) or crc != graph_crc(graph)):
+			raise ValueError("word index was built for a different graph")
+		expected = INDEX_HEADER.size + 4 * (state_count + 1 + edge_count + state_count) + edge_count + state_count
+		if len(data) != expected:
+			raise ValueError("word index size does not match its header")
+
+		offset = INDEX_HEADER.size
+		arrays = []
+		for length in (state_count + 1, edge_count, state_count):
+			values = array('I')
+			values.frombytes(data[offset:offset + 4 * length])
+			if sys.byteorder != 'little':
+				values.byteswap()
+			arrays.append(values)
+			offset += 4 * length
+		labels = data[offset:offset + edge_count]
+		terminal = data[offset + edge_count:]
+		return cls(*arrays, labels, terminal, crc)
+
+	def __len__(self) -> int:
+		return self._counts[0] if len(self._counts) else 0
+
+	@property
+	def nbytes(self) -> int:
+		return (len(self._first) + len(self._targets) + len(self._counts)) * 4 + len(self._labels) + len(self._terminal)
+
+	def _child(self, state: int, letter: int) -> Optional[int]:
+		for edge in range(self._first[state], self._first[state + 1]):
+			if self._labels[edge] == letter:
+				return self._targets[edge]
+		return None
+
+	def _walk(self, text: str) -> Optional[int]:
+		"""State reached by reading text from the root, or None"""
+		state = 0 if len(self._counts) else None
+		for letter in text:
+			if state is None:
+				return None
+			state = self._child(state, ord(letter))
+		return state
+
+	def get(self, word: str, default=None) -> Optional[int]:
+		"""Id (sorted rank) of word, or default if absent"""
+		if not len(self._counts):
+			return default
+		state, rank = 0, 0
+		for letter in word:
+			code = ord(letter)
+			if self._terminal[state]:
+				rank += 1
+			for edge in range(self._first[state], self._first[state + 1]):
+				label = self._labels[edge]
+				if label == code:
+					state = self._targets[edge]
+					break
+				if label > code:
+					return default
+				rank += self._counts[self._targets[edge]]
+			else:
+				return default
+		return rank if self._terminal[state] else default
+
+	def __contains__(self, word: str) -> bool:
+		return self.get(word) is not None
+
+	def __getitem__(self, rank: int) -> str:
+		"""Word with the given id"""
+		if rank < 0:
+			rank += len(self)
+		if not 0 <= rank < len(self):
+			raise IndexError("word id out of range")
+		state, letters = 0, []
+		while True:
+			if self._terminal[state]:
+				if rank == 0:
+					return "".join(letters)
+				rank -= 1
+			for edge in range(self._first[state], self._first[state + 1]):
+				target = self._targets[edge]
+				if rank < self._counts[target]:
+					letters.append(chr(self._labels[edge]))
+					state = target
+					break
+				rank -= self._counts[target]
+
+	def _words_from(self, state: int, prefix: str) -> Iterator[str]:
+		"""Every word below state, in sorted order"""
+		stack = [(state, prefix)]
+		while stack:
+			state, text = stack.pop()
+			if self._terminal[state]:
+				yield text
+			for edge in range(self._first[state + 1] - 1, self._first[state] - 1, -1):
+				stack.append((self._targets[edge], text + chr(self._labels[edge])))
+
+	def __iter__(self) -> Iterator[str]:
+		if len(self._counts):
+			yield from self._words_from(0, "")
+
+	def with_prefix(self, prefix: str, limit: Optional[int] = None) -> List[str]:
+		"""Words starting with prefix, in sorted order (at most limit of them)"""
+		state = self._walk(prefix)
+		if state is None:
+			return []
+		return _take(self._words_from(state, prefix), limit)
+
+	def count_prefix(self, prefix: str) -> int:
+		state = self._walk(prefix)
+		return 0 if state is None else self._counts[state]
+
+	def match(self, pattern: str, limit: Optional[int] = None) -> List[str]:
+		"""
+		Words matching pattern, in sorted order. '?' stands for one letter
+		and '*' for any run of letters, e.g. "c?t" or "st*".
+		"""
+		if not len(self._counts):
+			return []
+		return _take(self._match(pattern), limit)
+
+	def _match(self, pattern: str) -> Iterator[str]:
+		# Walk the automaton once while tracking every pattern position the
+		# text read so far can stand at, so each word is produced only once
+		def closure(positions: Set[int]) -> frozenset:
+			result = set()
+			for position in positions:
+				while position < len(pattern) and pattern[position] == ANY_LETTERS:
+					result.add(position)
+					position += 1
+				result.add(position)
+			return frozenset(result)
+
+		def advance(positions: frozenset, letter: str) -> frozenset:
+			moved = set()
+			for position in positions:
+				if position == len(pattern):
+					continue
+				token = pattern[position]
+				if token == ANY_LETTERS:
+					moved.add(position)
+				elif token == ANY_LETTER or token == letter:
+					moved.add(position + 1)
+			return closure(moved)
+
+		end = len(pattern)
+		stack = [(0, "", closure({0}))]
+		while stack:
+			state, text, positions = stack.pop()
+			if self._terminal[state] and end in positions:
+				yield text
+			for edge in range(self._first[state + 1] - 1, self._first[state] - 1, -1):
+				letter = chr(self._labels[edge])
+				moved = advance(positions, letter)
+				if moved:
+					stack.append((self._targets[edge], text + letter, moved))
+
+def _take(words: Iterator[str], limit: Optional[int]) -> List[str]:
+	if limit is None:
+		return list(words)
+	result = []
+	for word in words:
+		if len(result) >= limit:
+			break
+		result.append(word)
+	return result
@@ -0,0 +1,150 @@
+"""
+Benchmark the path finders on the longest ladders of a graph.
+
+Each finder is compared against the old search style that pushed
+`path + [next_word]` onto the frontier, reporting wall time and the
+peak memory allocated during the queries (via tracemalloc). UCS and the
+A* heuristics are also compared on nodes explored next to wall time.
+
+    python -m src.scripts.benchmark_search 5 --pairs 20
+"""
+import argparse
+import heapq
+import time
+import tracemalloc
+from collections import deque
+
+from src.algorithms.astar import AStarPathFinder
+from src.algorithms.bfs import BFSPathFinder
+from src.algorithms.ucs import UCSPathFinder
+from src.algorithms.bidirectional import (
+    BidirectionalAStarPathFinder,
+    BidirectionalBFSPathFinder,
+    BidirectionalUCSPathFinder
+)
+from src.core.word_graph import WordGraph
+from src.core.graph_format import find_graph_file
+
+def path_copy_bfs(graph, start, target):
+    """Reference BFS that copies the path prefix on every push"""
+    queue = deque([(start, [start])])
+    visited = {start}
+    while queue:
+        current, path = queue.popleft()
+        if current == target:
+            return path
+        for next_word in graph[current]:
+            if next_word not in visited:
+                visited.add(next_word)
+                queue.append((next_word, path + [next_word]))
+    return []
+
+def path_copy_ucs(graph, start, target):
+    """Reference UCS that copies the path prefix on every push"""
+    frontier = [(0, start, [start])]
+    visited = {start: 0}
+    while frontier:
+        cost, current, path = heapq.heappop(frontier)
+        if current == target:
+            return path
+        if cost > visited[current]:
+            continue
+        for next_word, edge_cost in graph[current].items():
+            new_cost = cost + edge_cost
+            if next_word not in visited or new_cost < visited[next_word]:
+                visited[next_word] = new_cost
+                heapq.heappush(frontier, (new_cost, next_word, path + [next_word]))
+    return []
+
+def longest_ladders(graph, count):
+    """Pick the `count` (start, end) pairs with the longest BFS ladders"""
+    best = {}
+    for source in range(len(graph)):
+        # The farthest node from source ends the longest ladder starting there
+        depth = {source: 0}
+        queue = deque([source])
+        last = source
+        while queue:
+            last = queue.popleft()
+            for next_node in graph.neighbor_ids(last):
+                if next_node not in depth:
+                    depth[next_node] = depth[last] + 1
+                    queue.append(next_node)
+        key = tuple(sorted((source, last)))
+        best[key] = depth[last]
+    ranked = sorted(best.items(), key=lambda item: -item[1])[:count]
+    return [(graph.words[a], graph.words[b]) for (a, b), _ in ranked if a != b]
+
+def measure(label, query, pairs):
+    """Run query over pairs, returning (seconds, peak bytes)"""
+    # Time and memory are measured in separate runs since tracemalloc
+    # slows down every allocation it records
+    start_time = time.perf_counter()
+    for start, end in pairs:
+        query(start, end)
+    elapsed = time.perf_counter() - start_time
+
+    tracemalloc.start()
+    for start, end in pairs:
+        query(start, end)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<22} {elapsed * 1000:>10.1f} ms {peak / 1024:>10.1f} KiB peak")
+    return elapsed, peak
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark word ladder path finders")
+    parser.add_argument("word_length", type=int, nargs="?", default=5)
+    parser.add_argument("--pairs", type=int, default=20, help="number of long ladders to query")
+    args = parser.parse_args()
+
+    graph_file = find_graph_file(args.word_length)
+    if graph_file is None:
+        print(f"No graph built for {args.word_length}-letter words")
+        return
+    graph = WordGraph.load(graph_file)
+    legacy = graph.to_graph_data()["graph"]
+    pairs = longest_ladders(graph, args.pairs)
+    if not pairs:
+        print("Graph has no ladders to benchmark")
+        return
+    lengths = [len(BFSPathFinder(graph).find_path(a, b)[0]) - 1 for a, b in pairs]
+    print(f"{len(pairs)} ladders, {min(lengths)}-{max(lengths)} steps\n")
+
+    measure("BFS (path copies)", lambda a, b: path_copy_bfs(legacy, a, b), pairs)
+    measure("BFS (parents)", BFSPathFinder(graph).find_path, pairs)
+    measure("UCS (path copies)", lambda a, b: path_copy_ucs(legacy, a, b), pairs)
+    measure("UCS (parents)", UCSPathFinder(graph).find_path, pairs)
+    measure("UCS (indexed heap)", UCSPathFinder(graph, indexed_heap=True).find_path, pairs)
+    measure("UCS (bucket queue)", UCSPathFinder(graph, bucket_queue=True).find_path, pairs)
+    measure("A* (parents)", AStarPathFinder(graph).find_path, pairs)
+    measure("A* (indexed heap)", AStarPathFinder(graph, indexed_heap=True).find_path, pairs)
+    measure("Bi-BFS", BidirectionalBFSPathFinder(graph).find_path, pairs)
+    measure("Bi-UCS", BidirectionalUCSPathFinder(graph).find_path, pairs)
+    measure("Bi-A*", BidirectionalAStarPathFinder(graph).find_path, pairs)
+
+    print()
+    for label, finder_class in (("UCS", UCSPathFinder), ("A*", AStarPathFinder)):
+        for indexed_heap in (False, True):
+            finder = finder_class(graph, indexed_heap=indexed_heap)
+            peak = max(finder.find_path(a, b)[1]["peak_frontier"] for a, b in pairs)
+            heap = "indexed heap" if indexed_heap else "heapq"
+            print(f"{label + ' (' + heap + ')':<22} {peak:>10} peak frontier entries")
+
+    print()
+    # Fewer nodes explored only pays off if each one stays cheap, so the
+    # heuristics are compared on wall time as well
+    ucs = UCSPathFinder(graph)
+    astar = AStarPathFinder(graph)
+    searches = {"UCS": ucs.find_path}
+    heuristics = [h for h in AStarPathFinder.HEURISTICS if h != 'alt' or graph.landmarks]
+    for heuristic in heuristics:
+        searches[f"A* ({heuristic})"] = lambda a, b, heuristic=heuristic: astar.find_path(a, b, heuristic)
+    for label, query in searches.items():
+        start_time = time.perf_counter()
+        explored = sum(query(a, b)[1]["nodes_explored"] for a, b in pairs)
+        elapsed = time.perf_counter() - start_time
+        print(f"{label:<22} {explored:>10} nodes explored {elapsed * 1000:>10.1f} ms")
+
+if __name__ == "__main__":
+    main()
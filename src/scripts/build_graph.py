@@ -1,13 +1,45 @@
-import json
+import argparse
+from array import array
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from itertools import combinations
 import os
+import time
+import numpy as np
+from src.core.word_graph import WordGraph
+from src.core.cost_model import DEFAULT_COST_MODEL, encode_letters
+from src.core.graph_analytics import attach_analytics
+from src.core.shortest_paths import dijkstra
+from src.core.word_index import WordIndex, word_index_path
+from src.core.puzzle_index import PuzzleIndex, puzzle_index_path
+from src.core.hop_table import build_hop_table, hop_table_path
+from src.core.graph_format import binary_graph_path, json_graph_path, write_binary_graph, write_json_graph
+from src.scripts.build_manifest import record_builds, rebuild_stale
+from src.scripts.filter_words import normalize_word
 
-def build_graph(word_length):
-    """Build a word ladder graph for specified word length"""
+# Number of ALT landmarks precomputed for A*
+DEFAULT_LANDMARK_COUNT = 8
+# Components smaller than this get no landmark of their own; searches in
+# them are short anyway and would use up landmarks the big ones need
+MIN_LANDMARK_COMPONENT = 32
+
+# Word lengths covered by sowpods.txt that make playable ladders
+ALL_WORD_LENGTHS = range(2, 16)
+
+def build_graph(word_length, landmark_count=DEFAULT_LANDMARK_COUNT, export_json=False, verbose=True,
+                processes=1, cost_resolution=None):
+    """
+    Build a word ladder graph for specified word length.
+    Writes the binary graph_N.bin, plus the JSON layout as graph_N.json
+    when export_json is set; an existing hops_N.bin is rebuilt to match.
+    processes sets the worker count of the analytics stage (None for one
+    per CPU). With cost_resolution set, the graph also stores integer edge
+    costs in units of 1 / cost_resolution.
+    Returns the graph's metadata, or None if the build failed.
+    """
     # File paths
     dict_file = f"data/dictionaries/{word_length}_letter.txt"
-    graph_file = f"data/graphs/graph_{word_length}.json"
+    graph_file = binary_graph_path(word_length)
     
     # Ensure directories exist
     os.makedirs("data/graphs", exist_ok=True)
@@ -17,118 +49,231 @@ def build_graph(word_length):
         # Load words
         if not os.path.exists(dict_file):
             print(f"Dictionary file not found: {dict_file}")
-            return False
+            return None
             
         with open(dict_file, 'r', encoding='utf-8') as f:
-            words = [word.strip().lower() for word in f.readlines() if word.strip()]
+            words = [normalize_word(line) for line in f]
+        
+        # The binary format keeps words sorted so lookups can binary search
+        words = sorted({word for word in words if word and len(word) == word_length})
         
         if not words:
             print(f"No words found in {dict_file}")
-            return False
+            return None
         
-        # Create adjacency list with costs
-        graph = defaultdict(dict)
+        # Collect every edge as (word id, word id, position of the change)
+        sources, targets, positions = array('I'), array('I'), array('B')
         
-        # Build graph using pattern matching for efficiency
-        pattern_buckets = defaultdict(list)
-        for word in words:
-            # Create patterns for each possible single letter change
-            for i in range(len(word)):
-                pattern = word[:i] + "*" + word[i+1:]
-                pattern_buckets[pattern].append(word)
+        # Build graph using pattern matching for efficiency, one letter
+        # position at a time so only that position's buckets are in memory
+        for i in range(word_length):
+            pattern_buckets = defaultdict(list)
+            for node, word in enumerate(words):
+                pattern_buckets[word[:i] + word[i+1:]].append(node)
+            
+            # Connect words that differ by one letter at position i
+            for bucket in pattern_buckets.values():
+                for node1, node2 in combinations(bucket, 2):
+                    sources.append(node1)
+                    targets.append(node2)
+                    positions.append(i)
         
-        # Connect words that differ by one letter
-        for pattern, word_list in pattern_buckets.items():
-            for word1, word2 in combinations(word_list, 2):
-                # Calculate edge cost based on multiple factors
-                cost = calculate_edge_cost(word1, word2)
-                graph[word1][word2] = cost
-                graph[word2][word1] = cost
+        # Cost every edge at once from its (position, old letter, new letter)
+        sources = np.frombuffer(sources, dtype=np.uint32)
+        targets = np.frombuffer(targets, dtype=np.uint32)
+        positions = np.frombuffer(positions, dtype=np.uint8)
+        letters = encode_letters(words)
+        edge_costs = DEFAULT_COST_MODEL.edge_costs(
+            word_length, positions, letters[sources, positions], letters[targets, positions]
+        )
         
-        # Convert defaultdict to regular dict for JSON serialization
-        graph_dict = {k: dict(v) for k, v in graph.items()}
+        # Both directions of every edge, grouped by source into CSR arrays
+        tails = np.concatenate([sources, targets])
+        heads = np.concatenate([targets, sources])
+        order = np.argsort(tails, kind='stable')
+        offsets = np.zeros(len(words) + 1, dtype=np.uint32)
+        np.cumsum(np.bincount(tails, minlength=len(words)), out=offsets[1:])
         
-        # Save graph with metadata
-        graph_data = {
-            "metadata": {
-                "word_length": word_length,
-                "node_count": len(words),
-                "edge_count": sum(len(edges) for edges in graph.values()) // 2
-            },
-            "words": words,
-            "graph": graph_dict
+        metadata = {
+            "word_length": word_length,
+            "node_count": len(words),
+            "edge_count": len(sources),
+            "cost_model": DEFAULT_COST_MODEL.name
         }
+        if cost_resolution:
+            metadata["cost_resolution"] = cost_resolution
+        word_graph = WordGraph(
+            words,
+            array('I', offsets.tobytes()),
+            array('I', heads[order].tobytes()),
+            array('d', np.concatenate([edge_costs, edge_costs])[order].tobytes()),
+            metadata
+        )
+        
+        # Label connected components so reachability is a pair of lookups
+        components = word_graph.components
+        word_graph.metadata["component_count"] = max(components, default=-1) + 1
         
-        # Save graph
-        with open(graph_file, 'w', encoding='utf-8') as f:
-            json.dump(graph_data, f, indent=2, ensure_ascii=False)
+        # Precompute landmark distance tables for the ALT heuristic
+        if landmark_count > 0:
+            landmarks, distances = build_landmarks(word_graph, landmark_count)
+            if landmarks:
+                word_graph.set_landmarks(landmarks, distances)
         
-        print(f"Successfully built graph for {word_length}-letter words")
-        print(f"Total words: {len(words)}")
-        print(f"Total edges: {graph_data['metadata']['edge_count']}")
-        return True
+        # Component sizes, degree distribution, eccentricities and diameters
+        attach_analytics(word_graph, processes)
+        
+        # Save graph, plus the word index used for prefix and wildcard lookups
+        # and the pair index random puzzles are drawn from
+        write_binary_graph(word_graph, graph_file)
+        WordIndex.from_words(words).save(word_index_path(word_length), word_graph)
+        PuzzleIndex.build(word_graph).save(puzzle_index_path(word_length))
+        # The hop table is optional, but one left in place must match the graph
+        if os.path.exists(hop_table_path(word_length)):
+            build_hop_table(word_graph, hop_table_path(word_length), processes).close()
+        if export_json:
+            write_json_graph(word_graph, json_graph_path(word_length))
+        
+        if verbose:
+            print(f"Successfully built graph for {word_length}-letter words")
+            print(f"Total words: {len(words)}")
+            print(f"Total edges: {word_graph.metadata['edge_count']}")
+            print(f"Components: {word_graph.metadata['component_count']}")
+            if word_graph.landmarks:
+                print(f"Landmarks: {len(word_graph.landmarks)}")
+            analytics = word_graph.metadata["analytics"]
+            print(f"Largest component: {analytics['largest_component']}, diameter: {analytics['diameter']}")
+        return word_graph.metadata
         
     except Exception as e:
         print(f"Error building graph: {str(e)}")
-        return False
+        return None
 
-def calculate_edge_cost(word1, word2):
-    """Calculate weighted cost between words based on multiple factors"""
-    # Find position where words differ
-    diff_pos = next(i for i, (c1, c2) in enumerate(zip(word1, word2)) if c1 != c2)
-    
-    # Base cost (higher for changes at the start of the word)
-    position_cost = 1.0 + (len(word1) - diff_pos) * 0.2
-    
-    # Vowel transition cost
-    c1, c2 = word1[diff_pos], word2[diff_pos]
-    vowel_cost = 0.5 if is_vowel(c1) != is_vowel(c2) else 0
-    
-    # Keyboard distance cost
-    keyboard_cost = calculate_keyboard_distance(c1, c2)
+def _build_length(word_length, landmark_count, export_json, cost_resolution):
+    """Process pool task: build one length quietly and time it"""
+    started = time.perf_counter()
+    metadata = build_graph(word_length, landmark_count, export_json, verbose=False,
+                           cost_resolution=cost_resolution)
+    return word_length, metadata, time.perf_counter() - started
+
+def build_all_graphs(lengths=ALL_WORD_LENGTHS, landmark_count=DEFAULT_LANDMARK_COUNT,
+                     export_json=False, processes=None, cost_resolution=None):
+    """
+    Build the graphs for every word length in lengths across a process pool.
+    Each length is an independent job, and a progress line is printed as
+    each one finishes, and the manifest is updated with the results.
+    Returns {word_length: metadata or None}.
+    """
+    lengths = list(lengths)
+    if len(lengths) == 1:
+        # Nothing to spread across lengths; give the pool to the analytics stage
+        metadata = build_graph(lengths[0], landmark_count, export_json, processes=processes,
+                               cost_resolution=cost_resolution)
+        results = {lengths[0]: metadata}
+        record_builds(results)
+        return results
+    results = {}
+    started = time.perf_counter()
+    print(f"Building {len(lengths)} graphs...")
     
-    # Frequency cost (common letters have lower cost)
-    freq_cost = calculate_frequency_cost(c1, c2)
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        # Longer words have fewer neighbours; submit the big short-word
+        # graphs first so they are not left running alone at the end
+        jobs = [
+            pool.submit(_build_length, length, landmark_count, export_json, cost_resolution)
+            for length in sorted(lengths, key=_dictionary_size, reverse=True)
+        ]
+        for done, job in enumerate(as_completed(jobs), 1):
+            word_length, metadata, seconds = job.result()
+            results[word_length] = metadata
+            if metadata is None:
+                status = "failed"
+            else:
+                status = (f"{metadata['node_count']} words, {metadata['edge_count']} edges, "
+                          f"{metadata['component_count']} components")
+            print(f"[{done}/{len(jobs)}] {word_length:>2}-letter graph: {status} ({seconds:.1f}s)")
     
-    return position_cost + vowel_cost + keyboard_cost + freq_cost
+    record_builds(results)
+    built = sum(1 for metadata in results.values() if metadata is not None)
+    print(f"Built {built}/{len(lengths)} graphs in {time.perf_counter() - started:.1f}s")
+    return results
 
-def is_vowel(c):
-    """Check if character is a vowel"""
-    return c.lower() in 'aeiou'
+def _dictionary_size(word_length):
+    dict_file = f"data/dictionaries/{word_length}_letter.txt"
+    return os.path.getsize(dict_file) if os.path.exists(dict_file) else 0
 
-def calculate_keyboard_distance(c1, c2):
-    """Calculate normalized QWERTY keyboard distance"""
-    keyboard = {
-        'q': (0,0), 'w': (0,1), 'e': (0,2), 'r': (0,3), 't': (0,4),
-        'y': (0,5), 'u': (0,6), 'i': (0,7), 'o': (0,8), 'p': (0,9),
-        'a': (1,0), 's': (1,1), 'd': (1,2), 'f': (1,3), 'g': (1,4),
-        'h': (1,5), 'j': (1,6), 'k': (1,7), 'l': (1,8),
-        'z': (2,0), 'x': (2,1), 'c': (2,2), 'v': (2,3), 'b': (2,4),
-        'n': (2,5), 'm': (2,6)
-    }
-    
-    try:
-        x1, y1 = keyboard[c1.lower()]
-        x2, y2 = keyboard[c2.lower()]
-        return 0.2 * ((abs(x1 - x2) + abs(y1 - y2)) / 10.0)
-    except KeyError:
-        return 0.5
+def _landmark_shares(sizes, count):
+    """
+    {component: landmark count} splitting count across the components of
+    at least MIN_LANDMARK_COMPONENT words (else just the largest one) by
+    size: one each, largest first, then highest words-per-landmark next
+    """
+    eligible = [component for component, size in enumerate(sizes) if size >= MIN_LANDMARK_COMPONENT]
+    if not eligible and len(sizes) and max(sizes) > 1:
+        eligible = [max(range(len(sizes)), key=lambda component: sizes[component])]
+    eligible = sorted(eligible, key=lambda component: -sizes[component])[:count]
+    shares = {component: 1 for component in eligible}
+    for _ in range(count - len(eligible)):
+        open_components = [component for component in eligible if shares[component] < sizes[component]]
+        if not open_components:
+            break
+        component = max(open_components, key=lambda c: sizes[c] / shares[c])
+        shares[component] += 1
+    return shares
 
-def calculate_frequency_cost(c1, c2):
-    """Calculate cost based on letter frequencies"""
-    frequencies = {
-        'e': 0.1, 'a': 0.09, 'r': 0.08, 'i': 0.07, 'o': 0.07,
-        't': 0.07, 'n': 0.07, 's': 0.06, 'l': 0.05, 'c': 0.04,
-        'u': 0.04, 'd': 0.03, 'p': 0.03, 'm': 0.03, 'h': 0.03,
-        'g': 0.02, 'b': 0.02, 'f': 0.02, 'y': 0.02, 'w': 0.02,
-        'k': 0.01, 'v': 0.01, 'x': 0.01, 'z': 0.01, 'j': 0.01, 'q': 0.01
-    }
+def build_landmarks(word_graph, count=DEFAULT_LANDMARK_COUNT):
+    """
+    Choose ALT landmarks and run Dijkstra from each.
+    The landmarks are split across the larger components by size (see
+    _landmark_shares). Within a component the first one is a peripheral
+    word, the one farthest from its best connected word, and the rest
+    follow by farthest-point selection inside the component.
+    Returns (landmark node ids, one distance array per landmark).
+    """
+    components = np.asarray(word_graph.components, dtype=np.int64)
+    sizes = np.bincount(components, minlength=max(components, default=-1) + 1).tolist()
     
-    # Higher cost for transitioning to/from rare letters
-    return 0.3 * (1.0 - (frequencies.get(c1.lower(), 0) + frequencies.get(c2.lower(), 0)) / 2)
+    landmarks, tables = [], []
+    for component, share in _landmark_shares(sizes, count).items():
+        members = np.flatnonzero(components == component)
+        center = max(members.tolist(), key=word_graph.degree)
+        distances = np.frombuffer(dijkstra(word_graph, center)[0], dtype=np.float64)
+        next_landmark = int(members[np.argmax(distances[members])])
+        nearest = np.full(len(members), np.inf)
+        
+        for _ in range(share):
+            distances, _ = dijkstra(word_graph, next_landmark)
+            landmarks.append(next_landmark)
+            tables.append(distances)
+            np.minimum(nearest, np.frombuffer(distances, dtype=np.float64)[members], out=nearest)
+            # Next landmark is the member farthest from this component's landmarks so far
+            farthest = int(np.argmax(nearest))
+            if nearest[farthest] == 0:
+                break
+            next_landmark = int(members[farthest])
+    
+    return landmarks, tables
+
+def calculate_edge_cost(word1, word2, diff_pos=None):
+    """Calculate weighted cost between words based on multiple factors"""
+    return DEFAULT_COST_MODEL.edge_cost(word1, word2, diff_pos)
 
 if __name__ == "__main__":
-    # Build both graphs
-    build_graph(3)
-    build_graph(5)
-    print("Graphs built successfully!")
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Build word ladder graphs")
+    parser.add_argument("lengths", type=int, nargs="*", default=[3, 5])
+    parser.add_argument("--all", action="store_true", help="build every length from 2 to 15")
+    parser.add_argument("--json", action="store_true", help="also export graph_N.json")
+    parser.add_argument("--processes", type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument("--stale", action="store_true", help="only rebuild graphs the manifest marks as stale")
+    parser.add_argument("--cost-resolution", type=int, default=None,
+                        help="also store integer edge costs in units of 1/N (e.g. 100)")
+    args = parser.parse_args()
+    
+    lengths = ALL_WORD_LENGTHS if args.all else args.lengths
+    if args.stale:
+        rebuilt = rebuild_stale(lengths, processes=args.processes, cost_resolution=args.cost_resolution)
+        if not rebuilt:
+            print("All graphs are up to date")
+    else:
+        build_all_graphs(lengths, export_json=args.json, processes=args.processes,
+                         cost_resolution=args.cost_resolution)
\ No newline at end of file
@@ -0,0 +1,35 @@
+"""
+Tabulate the ladder length between every pair of words of a graph.
+
+Writes data/graphs/hops_N.bin next to the graph; afterwards
+HopTable.load(hop_table_path(N)).distance(a, b) answers without searching.
+
+    python -m src.scripts.build_hop_table 3 5 --processes 4
+"""
+import argparse
+import sys
+import time
+
+from src.core.graph_repository import graph_repository
+from src.core.hop_table import build_hop_table, hop_table_path
+
+def main():
+    parser = argparse.ArgumentParser(description="Build all-pairs hop tables")
+    parser.add_argument("lengths", type=int, nargs="+", help="word lengths to tabulate")
+    parser.add_argument("--processes", type=int, default=None, help="worker processes (default: one per CPU)")
+    args = parser.parse_args()
+
+    for word_length in args.lengths:
+        try:
+            graph = graph_repository.get(word_length)
+        except FileNotFoundError as e:
+            sys.exit(str(e))
+        started = time.perf_counter()
+        table = build_hop_table(graph, hop_table_path(word_length), args.processes)
+        largest = max(table.sizes, default=0)
+        print(f"{word_length}-letter hop table: {len(table.matrix)} bytes, "
+              f"largest block {largest}x{largest} ({time.perf_counter() - started:.1f}s)")
+        table.close()
+
+if __name__ == "__main__":
+    main()
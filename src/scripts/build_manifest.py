@@ -0,0 +1,120 @@
+"""
+Build manifest for the graphs in data/graphs.
+
+manifest.json records, per word length, what each graph was built from:
+the SHA-256 of its dictionary, the edge cost model version and the binary
+format version, plus the size of the file written and the build options
+(cost_resolution) a rebuild has to repeat. A graph is stale when any of
+the inputs no longer match, so only those lengths are rebuilt.
+"""
+import hashlib
+import json
+import os
+from src.core.cost_model import COST_MODEL_VERSION
+from src.core.graph_format import FORMAT_VERSION, GRAPH_DIR, HEADER, binary_graph_path, verify_binary_graph
+from src.scripts.filter_words import dictionary_path
+
+MANIFEST_PATH = os.path.join(GRAPH_DIR, "manifest.json")
+
+# Fields that must match for a graph to be reused
+BUILD_INPUTS = ("dictionary_sha256", "cost_model_version", "format_version")
+
+def file_sha256(path, block_size=1 << 16):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def build_inputs(word_length):
+    """What a graph of word_length would be built from now, or None without a dictionary"""
+    dict_file = dictionary_path(word_length)
+    if not os.path.exists(dict_file):
+        return None
+    return {
+        "dictionary_sha256": file_sha256(dict_file),
+        "cost_model_version": COST_MODEL_VERSION,
+        "format_version": FORMAT_VERSION
+    }
+
+def load_manifest(path=MANIFEST_PATH):
+    """{word_length: entry}; empty if the manifest is missing or unreadable"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return {int(length): entry for length, entry in json.load(f).get("graphs", {}).items()}
+    except (OSError, ValueError, AttributeError):
+        return {}
+
+def save_manifest(manifest, path=MANIFEST_PATH):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    temp_path = path + ".tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump({"graphs": {str(length): manifest[length] for length in sorted(manifest)}}, f, indent=2)
+    os.replace(temp_path, path)
+
+def is_stale(word_length, manifest=None):
+    """True if graph_N.bin is missing, damaged or built from different inputs"""
+    manifest = load_manifest() if manifest is None else manifest
+    entry = manifest.get(word_length)
+    graph_file = binary_graph_path(word_length)
+    if entry is None or not os.path.exists(graph_file):
+        return True
+    size = os.path.getsize(graph_file)
+    if size <= HEADER.size or size != entry.get("graph_bytes"):
+        return True
+    # A same-size file can still be damaged; the checksum covers every byte
+    if not verify_binary_graph(graph_file):
+        return True
+    inputs = build_inputs(word_length)
+    return inputs is None or any(entry.get(key) != inputs[key] for key in BUILD_INPUTS)
+
+def stale_lengths(lengths):
+    manifest = load_manifest()
+    return [length for length in lengths if is_stale(length, manifest)]
+
+def record_builds(results):
+    """Add manifest entries for {word_length: metadata} build results; failed builds are dropped"""
+    manifest = load_manifest()
+    for word_length, metadata in results.items():
+        inputs = build_inputs(word_length)
+        if metadata is None or inputs is None:
+            manifest.pop(word_length, None)
+            continue
+        manifest[word_length] = dict(
+            inputs,
+            graph_bytes=os.path.getsize(binary_graph_path(word_length)),
+            node_count=metadata["node_count"],
+            edge_count=metadata["edge_count"],
+            cost_resolution=metadata.get("cost_resolution")
+        )
+    save_manifest(manifest)
+
+def rebuild_stale(lengths, processes=None, cost_resolution=None):
+    """
+    Rebuild only the stale graphs among lengths and record them. Each
+    graph keeps the cost_resolution its manifest entry recorded unless
+    cost_resolution overrides it.
+    Returns {word_length: metadata or None} for the lengths rebuilt.
+    """
+    from src.scripts.build_graph import build_all_graphs, build_graph
+    manifest = load_manifest()
+    stale = [length for length in lengths if is_stale(length, manifest)]
+    if not stale:
+        return {}
+    resolutions = {
+        length: cost_resolution or manifest.get(length, {}).get("cost_resolution")
+        for length in stale
+    }
+    if len(stale) == 1 or processes == 1:
+        results = {
+            length: build_graph(length, processes=processes, cost_resolution=resolutions[length])
+            for length in stale
+        }
+        record_builds(results)
+        return results
+    # build_all_graphs takes one resolution per call and records its own results
+    results = {}
+    for resolution in set(resolutions.values()):
+        group = [length for length in stale if resolutions[length] == resolution]
+        results.update(build_all_graphs(group, processes=processes, cost_resolution=resolution))
+    return results
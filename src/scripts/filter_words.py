@@ -0,0 +1,85 @@
+"""
+Split a master word list into per-length dictionaries.
+
+The word list is streamed once, and every word goes to the buffered writer
+for its length, so the whole list is never held in memory. Each length's
+file is then sorted and de-duplicated by itself. Peak memory is bounded by
+the largest single length rather than by the size of the word list.
+
+    python -m src.scripts.filter_words data/dictionaries/sowpods.txt --lengths 3 5
+"""
+import argparse
+import os
+
+DICTIONARY_DIR = "data/dictionaries"
+
+def dictionary_path(word_length, directory=DICTIONARY_DIR):
+    return os.path.join(directory, f"{word_length}_letter.txt")
+
+def normalize_word(line):
+    """Lower-cased word from a line of the word list, or None if it is not a plain a-z word"""
+    word = line.strip().lower()
+    if word.isascii() and word.isalpha():
+        return word
+    return None
+
+def partition_words(input_file, lengths=None, output_dir=DICTIONARY_DIR, buffer_size=1 << 16):
+    """
+    Write {output_dir}/N_letter.txt for every length N in lengths (all
+    lengths found if None) in a single pass over input_file.
+    Returns {word_length: number of distinct words written}.
+    """
+    wanted = set(lengths) if lengths is not None else None
+    os.makedirs(output_dir, exist_ok=True)
+    writers = {}
+
+    try:
+        with open(input_file, 'r', encoding='utf-8') as infile:
+            for line in infile:
+                word = normalize_word(line)
+                if word is None:
+                    continue
+                length = len(word)
+                if wanted is not None and length not in wanted:
+                    continue
+                writer = writers.get(length)
+                if writer is None:
+                    temp_path = dictionary_path(length, output_dir) + ".tmp"
+                    writer = open(temp_path, 'w', encoding='utf-8', buffering=buffer_size)
+                    writers[length] = writer
+                writer.write(word + "\n")
+    except BaseException:
+        for writer in writers.values():
+            writer.close()
+            os.remove(writer.name)
+        raise
+
+    counts = {}
+    for length, writer in sorted(writers.items()):
+        writer.close()
+        counts[length] = _finish_dictionary(writer.name, dictionary_path(length, output_dir))
+    return counts
+
+def _finish_dictionary(temp_path, path):
+    """Sort and de-duplicate one length's words, then move the file into place"""
+    with open(temp_path, 'r', encoding='utf-8') as f:
+        words = sorted(set(f.read().split()))
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        f.write("\n".join(words))
+        f.write("\n")
+    os.replace(temp_path, path)
+    return len(words)
+
+def main():
+    parser = argparse.ArgumentParser(description="Split a word list into per-length dictionaries")
+    parser.add_argument("input_file")
+    parser.add_argument("--lengths", type=int, nargs="*", default=None, help="word lengths to write (default: all)")
+    parser.add_argument("--output-dir", default=DICTIONARY_DIR)
+    args = parser.parse_args()
+
+    counts = partition_words(args.input_file, args.lengths, args.output_dir)
+    for length, count in counts.items():
+        print(f"Created {length}-letter dictionary with {count} words")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""
+Draw random puzzles of a given difficulty from the precomputed pair index.
+
+Prints one tab-separated start, end, ladder length and cost per line.
+
+    python -m src.scripts.generate_puzzles 5 --count 1000 --difficulty hard --seed 7
+"""
+import argparse
+import random
+import sys
+
+from src.core.graph_repository import graph_repository
+from src.core.puzzle_index import COST_TIERS, DIFFICULTIES
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate random word ladder puzzles")
+    parser.add_argument("word_length", type=int)
+    parser.add_argument("--count", type=int, default=10)
+    parser.add_argument("--difficulty", default="medium",
+                        help=f"one of {', '.join(DIFFICULTIES)}, or an exact ladder length")
+    parser.add_argument("--cost-tier", type=int, choices=range(COST_TIERS), default=None,
+                        help="cost band within the ladder length, cheapest first")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    difficulty = int(args.difficulty) if args.difficulty.isdigit() else args.difficulty
+    try:
+        puzzles = graph_repository.puzzle_index(args.word_length)
+        drawn = puzzles.sample(args.count, difficulty, args.cost_tier, random.Random(args.seed))
+    except (FileNotFoundError, ValueError) as e:
+        sys.exit(str(e))
+    if not drawn:
+        sys.exit(f"No {args.word_length}-letter puzzles of difficulty {args.difficulty}")
+    for puzzle in drawn:
+        print(f"{puzzle.start}\t{puzzle.end}\t{puzzle.length}\t{puzzle.cost:.4f}")
+
+if __name__ == "__main__":
+    main()
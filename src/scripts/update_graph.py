@@ -0,0 +1,234 @@
+"""
+Apply a word delta to an existing graph without rebuilding it.
+
+Only the added words' neighbourhoods are looked up (the 25 one-letter
+variants per position, i.e. exactly the wildcard buckets they fall into)
+and only their edges are costed; every other edge is carried over from
+the old graph. A component holding no added word and no neighbour of a
+removed one is an old component with the same edges, so its eccentricities,
+landmark rows, hop table block and puzzle pairs are carried over as well;
+only the touched components are searched again. The graph, word and
+puzzle indexes, hop table, dictionary and manifest are written back in
+place.
+
+    python -m src.scripts.update_graph 5 --add yeets --remove magic
+"""
+import argparse
+import os
+import string
+import time
+from array import array
+from heapq import merge
+
+import numpy as np
+
+from src.core.word_graph import WordGraph
+from src.core.shortest_paths import dijkstra
+from src.core.graph_analytics import attach_analytics, eccentricities
+from src.core.graph_format import binary_graph_path, write_binary_graph
+from src.core.hop_table import HopTable, build_hop_table, hop_table_path
+from src.core.word_index import WordIndex, word_index_path
+from src.core.puzzle_index import PuzzleIndex, puzzle_index_path
+from src.scripts.build_graph import DEFAULT_LANDMARK_COUNT, build_landmarks, calculate_edge_cost
+from src.scripts.build_manifest import record_builds
+from src.scripts.filter_words import dictionary_path, normalize_word
+
+def apply_word_delta(graph, added=(), removed=(), edge_cost=calculate_edge_cost):
+    """
+    Return a new WordGraph with added words inserted and removed words (and
+    their edges) dropped. Words of the wrong length, words already present
+    and unknown removals are ignored.
+    """
+    return _apply_delta(graph, added, removed, edge_cost)[0]
+
+def _apply_delta(graph, added, removed, edge_cost):
+    """
+    apply_word_delta, also returning remap (old id -> new id, -1 for a
+    removed word) and {new component: old component} for every component
+    the delta left alone
+    """
+    word_length = graph.word_length
+    removed = {word for word in map(normalize_word, removed) if word and word in graph}
+    added = sorted({
+        word for word in map(normalize_word, added)
+        if word and len(word) == word_length and word not in graph
+    } - removed)
+
+    old_words = graph.words
+    kept = [word for word in old_words if word not in removed]
+    words = list(merge(kept, added))
+    index = {word: i for i, word in enumerate(words)}
+
+    # Carry over the edges between surviving words, renumbered
+    remap = np.array([index.get(word, -1) for word in old_words], dtype=np.int64)
+    old_offsets = np.asarray(graph.offsets, dtype=np.int64)
+    old_heads = np.asarray(graph.neighbors, dtype=np.int64)
+    tails = remap[np.repeat(np.arange(len(old_words)), np.diff(old_offsets))]
+    heads = remap[old_heads]
+    carried = (tails >= 0) & (heads >= 0)
+    tails, heads = tails[carried], heads[carried]
+    costs = np.asarray(graph.costs, dtype=np.float64)[carried]
+
+    # Connect each added word to every word one letter away
+    new_words = set(added)
+    new_edges = []
+    for word in added:
+        node = index[word]
+        for i in range(word_length):
+            prefix, suffix = word[:i], word[i + 1:]
+            for letter in string.ascii_lowercase:
+                if letter == word[i]:
+                    continue
+                next_node = index.get(prefix + letter + suffix)
+                if next_node is None:
+                    continue
+                cost = edge_cost(word, words[next_node], i)
+                new_edges.append((node, next_node, cost))
+                # Edges between two added words are recorded from both ends
+                if words[next_node] not in new_words:
+                    new_edges.append((next_node, node, cost))
+    if new_edges:
+        new_tails, new_heads, new_costs = np.array(new_edges, dtype=np.float64).T
+        tails = np.concatenate([tails, new_tails.astype(np.int64)])
+        heads = np.concatenate([heads, new_heads.astype(np.int64)])
+        costs = np.concatenate([costs, new_costs])
+
+    # Each node's carried edges stay first, in their old order
+    order = np.argsort(tails, kind='stable')
+    offsets = np.zeros(len(words) + 1, dtype=np.uint32)
+    np.cumsum(np.bincount(tails, minlength=len(words)), out=offsets[1:])
+    updated = WordGraph(
+        words,
+        array('I', offsets.tobytes()),
+        array('I', heads[order].astype(np.uint32).tobytes()),
+        array('d', costs[order].tobytes()),
+        graph.metadata,
+        index
+    )
+    updated.metadata["node_count"] = len(words)
+    updated.metadata["edge_count"] = len(heads) // 2
+    updated.metadata["component_count"] = max(updated.components, default=-1) + 1
+
+    # Only components holding an added word or a removed word's neighbour
+    # can differ; every other one is an old component, renumbered, with the
+    # same edges, so its distances and analytics carry over
+    components = np.asarray(updated.components, dtype=np.int64)
+    old_ids = np.full(len(words), -1, dtype=np.int64)
+    old_ids[remap[remap >= 0]] = np.flatnonzero(remap >= 0)
+    changed = [index[word] for word in added]
+    for old_id in (graph.id_of(word) for word in removed):
+        changed.extend(node for node in remap[np.asarray(graph.neighbor_ids(old_id), dtype=np.int64)].tolist() if node >= 0)
+    touched = np.zeros(updated.metadata["component_count"], dtype=bool)
+    touched[components[changed]] = True
+    labels, first = np.unique(components, return_index=True)
+    old_components = np.asarray(graph.components, dtype=np.int64)
+    unchanged = {
+        int(label): int(old_components[old_ids[node]])
+        for label, node in zip(labels.tolist(), first.tolist()) if not touched[label]
+    }
+
+    _refresh_landmarks(graph, updated, remap, old_ids, unchanged)
+    if graph.eccentricities is not None:
+        node_eccentricities = np.asarray(
+            eccentricities(updated, nodes=np.flatnonzero(touched[components])), dtype=np.int32
+        )
+        carried_nodes = np.flatnonzero(~touched[components])
+        node_eccentricities[carried_nodes] = np.asarray(graph.eccentricities)[old_ids[carried_nodes]]
+        attach_analytics(updated, node_eccentricities=array('i', node_eccentricities.tobytes()))
+    return updated, remap, unchanged
+
+def _refresh_landmarks(graph, updated, remap, old_ids, unchanged):
+    """
+    Landmark rows for updated. A landmark in an unchanged component keeps
+    its row, renumbered; one in a changed component is searched again. A
+    removed landmark is dropped (ALT stays admissible with fewer) until the
+    next full build; only if none survives are landmarks chosen afresh.
+    """
+    if not graph.landmarks:
+        return
+    components = updated.components
+    landmarks, rows = [], []
+    for old_node, row in zip(graph.landmarks, graph.landmark_distances):
+        node = int(remap[old_node])
+        if node < 0:
+            continue
+        if components[node] in unchanged:
+            # Words outside the landmark's component, new ones included, stay unreachable
+            distances = np.asarray(row, dtype=np.float64)[old_ids]
+            distances[old_ids < 0] = np.inf
+            rows.append(array('d', distances.tobytes()))
+        else:
+            rows.append(dijkstra(updated, node)[0])
+        landmarks.append(node)
+    if landmarks:
+        updated.set_landmarks(landmarks, rows)
+    else:
+        updated.set_landmarks(*build_landmarks(updated, max(len(graph.landmarks), DEFAULT_LANDMARK_COUNT)))
+
+def update_graph(word_length, added=(), removed=(), processes=1):
+    """
+    Patch graph_N.bin and N_letter.txt in place with a word delta.
+    The puzzle index and hop table are carried over for the components the
+    delta left alone and rebuilt only for the others. processes is passed
+    to the hop table build (1 runs inline, which suits small deltas).
+    Returns the updated graph's metadata.
+    """
+    graph_file = binary_graph_path(word_length)
+    graph = WordGraph.load(graph_file)
+    puzzles = _load_or_none(lambda: PuzzleIndex.load(puzzle_index_path(word_length), graph))
+    hops_file = hop_table_path(word_length)
+    hops = _load_or_none(lambda: HopTable.load(hops_file, graph)) if os.path.exists(hops_file) else None
+    updated, remap, unchanged = _apply_delta(graph, added, removed, calculate_edge_cost)
+    # The old graph maps the file about to be replaced
+    graph.close()
+
+    write_binary_graph(updated, graph_file)
+    WordIndex.from_words(updated.words).save(word_index_path(word_length), updated)
+    if puzzles is not None:
+        puzzles = puzzles.carried_over(updated, remap, unchanged)
+    else:
+        puzzles = PuzzleIndex.build(updated)
+    puzzles.save(puzzle_index_path(word_length))
+    # A hop table is optional, but one left in place must match the graph
+    if os.path.exists(hops_file):
+        reuse = (hops, unchanged) if hops is not None else None
+        build_hop_table(updated, hops_file, processes, reuse=reuse).close()
+    if hops is not None:
+        hops.close()
+    with open(dictionary_path(word_length), 'w', encoding='utf-8') as f:
+        f.write("\n".join(updated.words))
+        f.write("\n")
+    record_builds({word_length: updated.metadata})
+    return updated.metadata
+
+def _load_or_none(load):
+    """load(), or None if the file is missing, damaged or built for another graph"""
+    try:
+        return load()
+    except (OSError, ValueError):
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description="Add or remove words from a built graph")
+    parser.add_argument("word_length", type=int)
+    parser.add_argument("--add", nargs="*", default=[], help="words to add")
+    parser.add_argument("--remove", nargs="*", default=[], help="words to remove")
+    parser.add_argument("--add-file", help="file of words to add, one per line")
+    parser.add_argument("--remove-file", help="file of words to remove, one per line")
+    args = parser.parse_args()
+
+    added, removed = list(args.add), list(args.remove)
+    for path, words in ((args.add_file, added), (args.remove_file, removed)):
+        if path:
+            with open(path, 'r', encoding='utf-8') as f:
+                words.extend(f)
+
+    started = time.perf_counter()
+    metadata = update_graph(args.word_length, added, removed)
+    print(f"Updated {args.word_length}-letter graph in {(time.perf_counter() - started) * 1000:.1f} ms")
+    print(f"Total words: {metadata['node_count']}")
+    print(f"Total edges: {metadata['edge_count']}")
+    print(f"Components: {metadata['component_count']}")
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,10 @@
 import pygame
-import json
 from ..render import draw_button, create_gradient_surface
 from src.utils.config import load_config
+from src.core.graph_repository import graph_repository
+from src.algorithms import PATH_FINDERS
+from src.algorithms.search_cache import search_tree_cache
+from src.core.shortest_paths import next_move
 
 class GameScreen:
 	def __init__(self, screen, start_word, end_word, mode):
@@ -39,55 +42,45 @@ class GameScreen:
 		self.hint_position = None
 		self.hint_letter = None
 		self.hint_algo_buttons = {}
-		self.hint_algorithms = ['A*', 'UCS', 'BFS']
+		self.hint_algorithms = list(PATH_FINDERS)
 		self.last_hint_algo = None
 		
 		# Colors for algorithms
 		self.algo_colors = {
 			'A*': (255, 100, 100),    # Red
 			'UCS': (100, 255, 100),   # Green
-			'BFS': (100, 100, 255)    # Blue
+			'BFS': (100, 100, 255),   # Blue
+			'Bi-A*': (255, 180, 100),  # Orange
+			'Bi-UCS': (180, 255, 180), # Pale green
+			'Bi-BFS': (180, 100, 255)  # Purple
 		}
 		
 		# Verify path exists
 		if not self.verify_path():
 			raise ValueError("No valid path exists between words")
+		
+		# Shortest-path trees rooted at the target: one search per game, after
+		# which every hint and the steps-to-go counter are table lookups
+		end_id = self.graph.id_of(self.end_word)
+		self.distance_fields = {
+			False: search_tree_cache.tree(self.graph, 'BFS', end_id),
+			True: search_tree_cache.tree(self.graph, 'UCS', end_id)
+		}
 	
 	def load_graph(self, word_length):
 		"""Load word ladder graph"""
-		graph_file = f"data/graphs/graph_{word_length}.json"
 		try:
-			with open(graph_file) as f:
-				graph_data = json.load(f)
-				self.graph = graph_data["graph"]
-				self.valid_words = set(graph_data["words"])
-				print(f"Loaded graph with {len(self.valid_words)} words")
-				print(f"Graph connections for {self.start_word}: {self.graph.get(self.start_word, {})}")
+			self.graph = graph_repository.get(word_length)
+			self.valid_words = self.graph
+			print(f"Loaded graph with {len(self.graph)} words")
+			print(f"Graph connections for {self.start_word}: {self.graph.neighbor_words(self.start_word)}")
 		except Exception as e:
 			print(f"Error loading graph: {e}")
 			raise
 	
 	def verify_path(self):
 		"""Verify that a path exists between start and end words"""
-		if self.start_word not in self.valid_words or self.end_word not in self.valid_words:
-			return False
-			
-		# Simple BFS to verify path exists
-		visited = {self.start_word}
-		queue = [(self.start_word, [self.start_word])]
-		
-		while queue:
-			current, path = queue.pop(0)
-			if current == self.end_word:
-				print(f"Found path: {path}")  # Debug print
-				return True
-				
-			for next_word in self.graph.get(current, {}):
-				if next_word not in visited:
-					visited.add(next_word)
-					queue.append((next_word, path + [next_word]))
-		
-		return False
+		return self.graph.is_reachable(self.start_word, self.end_word)
 	
 	def draw(self):
 		# Create background
@@ -190,6 +183,13 @@ class GameScreen:
 		moves_text = f"Moves: {len(self.moves)}"
 		moves = self.word_font.render(moves_text, True, (200, 200, 200))
 		self.screen.blit(moves, (50, 150))
+		
+		# Live distance to the target from the precomputed distance field
+		steps = self.steps_to_go()
+		if steps:
+			steps_text = f"{steps} step{'s' if steps != 1 else ''} to go"
+			remaining = self.word_font.render(steps_text, True, (200, 200, 200))
+			self.screen.blit(remaining, (self.config['screen']['width'] - 250, 150))
 	
 	def _draw_controls(self):
 		"""Draw all control buttons"""
@@ -222,7 +222,7 @@ class GameScreen:
 		panel_width = 140
 		panel_height = len(self.hint_algorithms) * 40 + 20
 		panel_x = self.config['screen']['width'] - 150
-		panel_y = self.config['screen']['height'] - 200  # Position above the hint button
+		panel_y = self.config['screen']['height'] - 80 - panel_height  # Position above the hint button
 		
 		# Draw panel background
 		panel_rect = pygame.Rect(panel_x, panel_y, panel_width, panel_height)
@@ -258,10 +258,23 @@ class GameScreen:
 			if hasattr(self, 'last_hint_algo') and self.last_hint_algo == algo:
 				pygame.draw.rect(self.screen, (255, 255, 255), button_rect, 2)
 	
+	def steps_to_go(self):
+		"""Fewest moves from the current word to the target, or None if it is cut off"""
+		field = self.distance_fields[False]
+		node = self.graph.id_of(self.current_word)
+		return field.distances[node] if field.reaches(node) else None
+	
+	def get_hint(self, algo):
+		"""Return (position, letter) for the next move on algo's kind of shortest path"""
+		finder_class = PATH_FINDERS.get(algo)
+		if finder_class is None:
+			return None
+		return next_move(self.distance_fields[finder_class.weighted], self.current_word)
+	
 	def _try_word_change(self, new_word):
 		"""Check if the new word is a valid move"""
 		# Check if word exists and is connected in graph
-		if new_word in self.valid_words and new_word in self.graph.get(self.current_word, {}):
+		if new_word in self.valid_words and self.graph.has_edge(self.current_word, new_word):
 			self.current_word = new_word
 			self.moves.append(new_word)
 			
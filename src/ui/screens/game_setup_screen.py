@@ -1,13 +1,21 @@
 import os
-import json
 import pygame
 from pygame.locals import *
 import math
 import random
+import threading
 import time
 from ..render import draw_button, draw_input_box, create_gradient_surface
 from src.utils.config import load_config
-from src.scripts.build_graph import build_graph
+from src.scripts.build_manifest import is_stale, rebuild_stale
+from src.core.graph_repository import graph_repository
+
+# Puzzle difficulty the "Random Puzzle" button draws for each game mode
+PUZZLE_DIFFICULTIES = {
+    'easy': 'easy',
+    'advanced': 'medium',
+    'challenge': 'hard'
+}
 
 class GameSetupScreen:
     def __init__(self, screen, selected_mode):
@@ -20,7 +28,11 @@ class GameSetupScreen:
         self.is_loading = True
         self.loading_start_time = pygame.time.get_ticks()
         self.loading_message = "Loading word database..."
-        self.word_graphs = {"words": set(), "graph": {}}
+        self.word_graph = None
+        self.word_index = None
+        self.puzzle_index = None
+        self.build_thread = None
+        self.build_result = None
         self._load_word_graphs()
         
         # Initialize UI elements
@@ -59,6 +71,10 @@ class GameSetupScreen:
             self.config['fonts']['text'],
             input_size
         )
+        self.suggestion_font = pygame.font.SysFont(
+            self.config['fonts']['text'],
+            int(input_size * 0.7)
+        )
         
         # Input boxes for start and end words
         self.start_word = ""
@@ -91,9 +107,11 @@ class GameSetupScreen:
         # Buttons
         self.start_button = None
         self.back_button = None
+        self.random_button = None
 
     def draw(self):
         if self.is_loading:
+            self._check_build()
             self._draw_loading_screen()
             return
             
@@ -303,6 +321,14 @@ class GameSetupScreen:
         self.screen.blit(text_surface, text_rect)
         self.back_button = back_rect
 
+        # Random Puzzle button, styled like Back
+        random_rect = pygame.Rect(self.config['screen']['width'] - 220, 20, 200, 40)
+        random_color = (100, 100, 100) if random_rect.collidepoint(mouse_pos) else (80, 80, 80)
+        pygame.draw.rect(self.screen, random_color, random_rect, border_radius=5)
+        text_surface = self.input_font.render("Random Puzzle", True, (255, 255, 255))
+        self.screen.blit(text_surface, text_surface.get_rect(center=random_rect.center))
+        self.random_button = random_rect
+
 
     def _draw_title(self):
         title = "Word Ladder Setup"
@@ -347,9 +373,27 @@ class GameSetupScreen:
             self.input_font,
             self.current_color if self.active_input == 'end' else (100, 100, 100)
         )
+        
+        # Autocomplete suggestions under the box being typed in
+        suggestions = self._suggestions()
+        if suggestions:
+            box = self.start_box if self.active_input == 'start' else self.end_box
+            text = "   ".join(suggestions) + "   (Tab)"
+            suggestion_surface = self.suggestion_font.render(text, True, (200, 200, 200))
+            self.screen.blit(suggestion_surface, (box.x + 10, box.bottom + 5))
+
+    def _suggestions(self, limit=5):
+        """Dictionary words completing the active input, in sorted order"""
+        if self.word_index is None or not self.active_input:
+            return []
+        text = self.start_word if self.active_input == 'start' else self.end_word
+        max_length = 3 if self.selected_mode == 'easy' else 5
+        if not text or len(text) >= max_length:
+            return []
+        return self.word_index.with_prefix(text, limit)
 
     def _draw_instructions(self):
-        instructions = "Enter start and end words to begin"
+        instructions = "Enter start and end words, or pick a random puzzle"
         # Enable antialiasing for instructions
         inst_surface = self.input_font.render(instructions, True, (200, 200, 200))
         shadow_surface = self.input_font.render(instructions, True, (0, 0, 0))
@@ -411,11 +455,20 @@ class GameSetupScreen:
                 return self._validate_and_start_game()
             elif self.back_button and self.back_button.collidepoint(event.pos):
                 return {'action': 'back_to_welcome'}
+            elif self.random_button and self.random_button.collidepoint(event.pos):
+                self._random_puzzle()
         
         elif event.type == pygame.KEYDOWN:
             if self.active_input:
                 if event.key == pygame.K_RETURN:
                     self.active_input = None
+                elif event.key == pygame.K_TAB:
+                    # Accept the first autocomplete suggestion
+                    suggestions = self._suggestions(limit=1)
+                    if suggestions and self.active_input == 'start':
+                        self.start_word = suggestions[0]
+                    elif suggestions:
+                        self.end_word = suggestions[0]
                 elif event.key == pygame.K_BACKSPACE:
                     if self.active_input == 'start':
                         self.start_word = self.start_word[:-1]
@@ -433,47 +486,66 @@ class GameSetupScreen:
         return None
 
     def _load_word_graphs(self):
-        """Load or build word graphs based on mode"""
+        """Load the mode's word graph, rebuilding it in the background if it is stale"""
         word_length = 3 if self.selected_mode == 'easy' else 5
-        graph_file = f"data/graphs/graph_{word_length}.json"
+        if word_length in graph_repository:
+            # Already loaded by an earlier screen
+            self.word_graph = graph_repository.get(word_length)
+            self.word_index = graph_repository.word_index(word_length)
+            self.puzzle_index = graph_repository.puzzle_index(word_length)
+            self.is_loading = False
+            return True
         
+        # Ensure directories exist
+        os.makedirs("data/graphs", exist_ok=True)
+        os.makedirs("data/dictionaries", exist_ok=True)
+        
+        # Check if dictionary file exists
+        dict_file = f"data/dictionaries/{word_length}_letter.txt"
+        if not os.path.exists(dict_file):
+            self.loading_message = f"Error: Missing dictionary file {dict_file}"
+            self.error_message = "Missing required dictionary files"
+            self.error_timer = pygame.time.get_ticks()
+            self.is_loading = False
+            return False
+        
+        # Rebuild only when the manifest says the graph is missing or out of
+        # date; the loading screen keeps animating while the thread runs
+        if is_stale(word_length):
+            self.loading_message = f"Building {word_length}-letter word graph..."
+            self.build_thread = threading.Thread(
+                target=self._rebuild_graph, args=(word_length,), daemon=True
+            )
+            self.build_thread.start()
+            return True
+        
+        return self._finish_loading(word_length)
+
+    def _rebuild_graph(self, word_length):
+        """Runs on the build thread"""
+        self.build_result = rebuild_stale([word_length], processes=1).get(word_length)
+
+    def _check_build(self):
+        """Called every frame while loading; picks up a finished background build"""
+        if self.build_thread is None or self.build_thread.is_alive():
+            return
+        self.build_thread = None
+        word_length = 3 if self.selected_mode == 'easy' else 5
+        if self.build_result is None:
+            self.loading_message = "Failed to build word graph"
+            self.error_message = "Failed to build word database"
+            self.error_timer = pygame.time.get_ticks()
+            self.is_loading = False
+            return
+        graph_repository.invalidate(word_length)
+        self._finish_loading(word_length)
+
+    def _finish_loading(self, word_length):
         try:
-            # Ensure directories exist
-            os.makedirs("data/graphs", exist_ok=True)
-            os.makedirs("data/dictionaries", exist_ok=True)
-            
-            # Check if dictionary file exists
-            dict_file = f"data/dictionaries/{word_length}_letter.txt"
-            if not os.path.exists(dict_file):
-                self.loading_message = f"Error: Missing dictionary file {dict_file}"
-                self.error_message = "Missing required dictionary files"
-                self.error_timer = pygame.time.get_ticks()
-                self.is_loading = False
-                return False
-            
-            # Build graph if it doesn't exist
-            if not os.path.exists(graph_file):
-                self.loading_message = f"Building {word_length}-letter word graph..."
-                pygame.display.flip()
-                
-                # Import and run build_graph
-                from src.scripts.build_graph import build_graph
-                success = build_graph(word_length)
-                
-                if not success:
-                    self.loading_message = "Failed to build word graph"
-                    self.error_message = "Failed to build word database"
-                    self.error_timer = pygame.time.get_ticks()
-                    self.is_loading = False
-                    return False
-            
             # Load the graph
-            with open(graph_file, 'r', encoding='utf-8') as f:
-                graph_data = json.load(f)
-                self.word_graphs = {
-                    "words": set(graph_data["words"]),
-                    "graph": graph_data["graph"]
-                }
+            self.word_graph = graph_repository.get(word_length)
+            self.word_index = graph_repository.word_index(word_length)
+            self.puzzle_index = graph_repository.puzzle_index(word_length)
             
             # Ensure minimum loading time for better UX
             elapsed_time = pygame.time.get_ticks() - self.loading_start_time
@@ -483,12 +555,6 @@ class GameSetupScreen:
             self.is_loading = False
             return True
             
-        except json.JSONDecodeError as e:
-            print(f"Error decoding JSON: {str(e)}")
-            self.error_message = "Error loading word database"
-            self.error_timer = pygame.time.get_ticks()
-            self.is_loading = False
-            return False
         except Exception as e:
             print(f"Error loading graph: {str(e)}")
             self.error_message = "Error loading word database"
@@ -503,7 +569,7 @@ class GameSetupScreen:
         print(f"Start word: {self.start_word}")
         print(f"End word: {self.end_word}")
         print(f"Mode: {self.selected_mode}")
-        print(f"Word set size: {len(self.word_graphs['words'])}")
+        print(f"Word set size: {len(self.word_graph) if self.word_graph else 0}")
         
         # Check word lengths
         required_length = 3 if self.selected_mode == 'easy' else 5
@@ -519,13 +585,13 @@ class GameSetupScreen:
             return None
 
         # Check if words exist in dictionary
-        if self.start_word not in self.word_graphs["words"]:
+        if self.word_graph is None or self.start_word not in self.word_graph:
             print(f"Start word '{self.start_word}' not in word set")
             self.error_message = f"'{self.start_word}' is not a valid word"
             self.error_timer = pygame.time.get_ticks()
             return None
         
-        if self.end_word not in self.word_graphs["words"]:
+        if self.end_word not in self.word_graph:
             print(f"End word '{self.end_word}' not in word set")
             self.error_message = f"'{self.end_word}' is not a valid word"
             self.error_timer = pygame.time.get_ticks()
@@ -548,24 +614,19 @@ class GameSetupScreen:
             'mode': self.selected_mode
         }
 
+    def _random_puzzle(self):
+        """Fill both inputs with a random connected pair of the mode's difficulty"""
+        difficulty = PUZZLE_DIFFICULTIES.get(self.selected_mode, 'medium')
+        puzzle = self.puzzle_index.random_puzzle(difficulty) if self.puzzle_index else None
+        if puzzle is None:
+            self.error_message = "No puzzles available for this mode"
+            self.error_timer = pygame.time.get_ticks()
+            return
+        self.start_word = puzzle.start
+        self.end_word = puzzle.end
+        self.active_input = None
+
     def _check_path_exists(self):
         """Check if a path exists between start and end words"""
-        # Simple BFS to check path existence
-        visited = {self.start_word}
-        queue = [self.start_word]
-        
-        while queue:
-            current = queue.pop(0)
-            if current == self.end_word:
-                return True
-            
-            # Generate all possible one-letter changes
-            for i in range(len(current)):
-                for c in 'abcdefghijklmnopqrstuvwxyz':
-                    next_word = current[:i] + c + current[i+1:]
-                    if (next_word in self.word_graphs["words"] and 
-                        next_word not in visited):
-                        visited.add(next_word)
-                        queue.append(next_word)
-        
-        return False
+        # Both words must share a connected component
+        return self.word_graph.is_reachable(self.start_word, self.end_word)
@@ -1,11 +1,11 @@
 import pygame
-import json
 import math
-from typing import Dict, List, Set, Tuple
+from typing import Dict
 from ..render import draw_button, create_gradient_surface
 from src.utils.config import load_config
-from src.algorithms.astar import AStarPathFinder
-from src.algorithms.ucs import UCSPathFinder
+from src.algorithms import PATH_FINDERS
+from src.algorithms.search_cache import search_tree_cache
+from src.core.graph_repository import graph_repository
 
 class MapScreen:
     def __init__(self, screen, start_word: str, end_word: str, current_word: str, mode: str):
@@ -30,9 +30,12 @@ class MapScreen:
         )
         
         # Algorithm selection
-        self.algorithms = ['A*', 'UCS', 'BFS']
+        self.algorithms = list(PATH_FINDERS)
         self.selected_algo = 'A*'
-        self.path_info = self.calculate_path(self.selected_algo)
+        # Every algorithm's result is computed (or fetched from the shared
+        # search cache) once here; drawing and button clicks only read it
+        self.path_results = {algo: self.calculate_path(algo) for algo in self.algorithms}
+        self.path_info = self.path_results[self.selected_algo]
         
         # Colors
         self.colors = {
@@ -53,61 +56,20 @@ class MapScreen:
         self.algo_colors = {
             'A*': (255, 100, 100),    # Red
             'UCS': (100, 255, 100),   # Green
-            'BFS': (100, 100, 255)    # Blue
+            'BFS': (100, 100, 255),   # Blue
+            'Bi-A*': (255, 180, 100),  # Orange
+            'Bi-UCS': (180, 255, 180), # Pale green
+            'Bi-BFS': (180, 100, 255)  # Purple
         }
     
     def load_graph(self, word_length: int):
         """Load word ladder graph"""
-        with open(f"data/graphs/graph_{word_length}.json") as f:
-            data = json.load(f)
-            self.graph = data["graph"]
-            self.words = set(data["words"])
+        self.graph = graph_repository.get(word_length)
+        self.words = self.graph.words
     
     def calculate_path(self, algorithm: str) -> Dict:
         """Calculate path and stats using selected algorithm"""
-        pathfinder = None
-        
-        if algorithm == 'A*':
-            pathfinder = AStarPathFinder({"graph": self.graph, "words": self.words})
-        elif algorithm == 'UCS':
-            pathfinder = UCSPathFinder({"graph": self.graph, "words": self.words})
-        elif algorithm == 'BFS':
-            # Implement BFS pathfinder
-            class BFSPathFinder:
-                def __init__(self, graph_data):
-                    self.graph = graph_data["graph"]
-                    self.words = graph_data["words"]
-                
-                def find_path(self, start: str, end: str) -> Tuple[List[str], Dict]:
-                    visited = {start}
-                    queue = [(start, [start], 0)]
-                    nodes_explored = 0
-                    
-                    while queue:
-                        current, path, cost = queue.pop(0)
-                        nodes_explored += 1
-                        
-                        if current == end:
-                            return path, {
-                                "nodes_explored": nodes_explored,
-                                "path_length": len(path) - 1,
-                                "total_cost": cost
-                            }
-                        
-                        for next_word, edge_cost in self.graph[current].items():
-                            if next_word not in visited:
-                                visited.add(next_word)
-                                queue.append((next_word, path + [next_word], cost + edge_cost))
-                    
-                    return [], {
-                        "nodes_explored": nodes_explored,
-                        "path_length": 0,
-                        "total_cost": 0
-                    }
-            
-            pathfinder = BFSPathFinder({"graph": self.graph, "words": self.words})
-        
-        if pathfinder is None:
+        if algorithm not in PATH_FINDERS:
             return {
                 'path': [],
                 'stats': {
@@ -117,7 +79,9 @@ class MapScreen:
                 }
             }
         
-        path, stats = pathfinder.find_path(self.start_word, self.end_word)
+        path, stats = search_tree_cache.find_path(
+            self.graph, algorithm, self.start_word, self.end_word
+        )
         return {
             'path': path,
             'stats': stats,
@@ -158,7 +122,7 @@ class MapScreen:
     
     def draw_algo_buttons(self):
         button_width = 100
-        spacing = 20
+        spacing = 15
         total_width = len(self.algorithms) * button_width + (len(self.algorithms) - 1) * spacing
         start_x = (self.config['screen']['width'] - total_width) // 2
         
@@ -255,17 +219,14 @@ class MapScreen:
             node_positions[word] = (int(x), int(y))
         
         # Draw edges first (behind nodes)
-        for word in self.graph:
-            for neighbor in self.graph[word]:
+        for u, word in enumerate(nodes):
+            for v in self.graph.neighbor_ids(u):
                 start_pos = node_positions[word]
-                end_pos = node_positions[neighbor]
+                end_pos = node_positions[nodes[v]]
                 pygame.draw.line(self.screen, (50, 50, 50), start_pos, end_pos, 1)
         
-        # Calculate paths for all algorithms
-        paths = {}
-        for algo in self.algorithms:
-            path_info = self.calculate_path(algo)
-            paths[algo] = path_info['path']
+        # Paths for all algorithms were calculated when the map opened
+        paths = {algo: info['path'] for algo, info in self.path_results.items()}
         
         # Draw highlighted paths for each algorithm
         for algo, path in paths.items():
@@ -320,7 +281,7 @@ class MapScreen:
             for algo, button in self.algo_buttons.items():
                 if button.collidepoint(mouse_pos):
                     self.selected_algo = algo
-                    self.path_info = self.calculate_path(algo)
+                    self.path_info = self.path_results[algo]
                     return None
             
             # Check back button
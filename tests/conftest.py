@@ -0,0 +1,69 @@
+import heapq
+import random
+import pytest
+from src.core.word_graph import WordGraph
+from src.core.graph_analytics import attach_analytics
+from src.scripts.build_graph import build_landmarks, calculate_edge_cost
+
+def ladder_graph(words, landmark_count=4):
+	"""In-memory WordGraph over words, built like build_graph (sorted words, landmarks, analytics)"""
+	words = sorted(set(words))
+	adjacency = {word: {} for word in words}
+	for word in words:
+		for i in range(len(word)):
+			for letter in "abcdefghijklmnopqrstuvwxyz":
+				other = word[:i] + letter + word[i + 1:]
+				if other != word and other in adjacency:
+					adjacency[word][other] = calculate_edge_cost(word, other, i)
+	graph = WordGraph.from_graph_data({"words": words, "graph": adjacency, "metadata": {"cost_model": "standard"}})
+	graph.metadata["component_count"] = max(graph.components, default=-1) + 1
+	if landmark_count:
+		graph.set_landmarks(*build_landmarks(graph, landmark_count))
+	attach_analytics(graph)
+	return graph
+
+def truncations(size):
+	"""Cut points spread over a file of size bytes: inside the header, tables and payload"""
+	return sorted({0, 1, 3, 7, 15, 31, size // 4, size // 2, size - 8, size - 1} - {size})
+
+def plain_dijkstra(graph, source):
+	"""Reference distances from source: a textbook heap Dijkstra over graph.edges()"""
+	distances = {source: 0.0}
+	heap = [(0.0, source)]
+	while heap:
+		distance, node = heapq.heappop(heap)
+		if distance > distances[node]:
+			continue
+		for next_node, cost in graph.edges(node):
+			if distance + cost < distances.get(next_node, float('inf')):
+				distances[next_node] = distance + cost
+				heapq.heappush(heap, (distance + cost, next_node))
+	return distances
+
+def assert_ladder(graph, path, start, end):
+	"""path runs from start to end, one letter at a time along graph edges"""
+	assert path[0] == start and path[-1] == end
+	for word, next_word in zip(path, path[1:]):
+		assert graph.has_edge(word, next_word)
+
+@pytest.fixture(scope="session")
+def words():
+	# 3-letter words over a small alphabet, so most of them connect, plus a
+	# lone word and a two-word component the searches must not cross into
+	rng = random.Random(7)
+	alphabet = "abcdefg"
+	pool = [a + b + c for a in alphabet for b in alphabet for c in alphabet]
+	return sorted(rng.sample(pool, 120) + ["xyz", "qqq", "qqr"])
+
+@pytest.fixture(scope="session")
+def graph(words):
+	return ladder_graph(words)
+
+@pytest.fixture(scope="session")
+def pairs(graph):
+	"""Word pairs to search, connected or not, drawn reproducibly"""
+	rng = random.Random(11)
+	nodes = range(len(graph))
+	return [(graph.words[rng.choice(nodes)], graph.words[rng.choice(nodes)]) for _ in range(150)] + [
+		("xyz", graph.words[0]), ("qqq", "qqr"), ("qqq", "qqq")
+	]
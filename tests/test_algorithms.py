@@ -0,0 +1,318 @@
+import random
+import pytest
+from src.algorithms import (
+	AStarPathFinder, BFSPathFinder, BidirectionalAStarPathFinder, BidirectionalBFSPathFinder,
+	BidirectionalUCSPathFinder, PATH_FINDERS, UCSPathFinder, create_path_finder
+)
+from src.algorithms.base import hamming_distance
+from src.algorithms.batch import BatchPathQuery
+from src.algorithms.search_cache import SearchTreeCache
+from src.core.bucket_queue import BucketQueue
+from src.core.graph_format import write_binary_graph
+from src.core.heap_queue import HeapQueue
+from src.core.indexed_heap import IndexedHeap
+from src.core.shortest_paths import bfs
+from src.core.word_graph import ROOT, WordGraph
+from src.scripts.build_graph import MIN_LANDMARK_COMPONENT
+from tests.conftest import assert_ladder, ladder_graph, plain_dijkstra
+
+WEIGHTED_FINDERS = [
+	lambda graph: UCSPathFinder(graph),
+	lambda graph: UCSPathFinder(graph, indexed_heap=True),
+	lambda graph: UCSPathFinder(graph, bucket_queue=True),
+	lambda graph: UCSPathFinder(graph, bucket_queue=True, cost_resolution=10),
+	lambda graph: AStarPathFinder(graph, heuristic='hamming'),
+	lambda graph: AStarPathFinder(graph, heuristic='position'),
+	lambda graph: AStarPathFinder(graph, heuristic='alt'),
+	lambda graph: AStarPathFinder(graph, indexed_heap=True),
+	lambda graph: BidirectionalUCSPathFinder(graph),
+	lambda graph: BidirectionalAStarPathFinder(graph)
+]
+UNWEIGHTED_FINDERS = [
+	lambda graph: BFSPathFinder(graph),
+	lambda graph: BFSPathFinder(graph, vectorized=True),
+	lambda graph: BidirectionalBFSPathFinder(graph)
+]
+
+@pytest.mark.parametrize("make_finder", WEIGHTED_FINDERS)
+def test_weighted_finders_match_dijkstra(graph, pairs, make_finder):
+	finder = make_finder(graph)
+	distances = {}
+	for start, end in pairs:
+		source = graph.id_of(start)
+		if source not in distances:
+			distances[source] = plain_dijkstra(graph, source)
+		expected = distances[source].get(graph.id_of(end))
+		path, stats = finder.find_path(start, end)
+		if expected is None:
+			assert path == []
+			continue
+		assert_ladder(graph, path, start, end)
+		if getattr(finder, 'bucket_queue', False):
+			# Cheapest under costs rounded to 1 / cost_resolution: each step can be off by half a unit
+			tolerance = stats["path_length"] / finder.cost_resolution
+			assert stats["total_cost"] == pytest.approx(expected, abs=tolerance)
+			assert graph.path_cost([graph.id_of(word) for word in path]) == pytest.approx(
+				stats["total_cost"], abs=tolerance)
+			continue
+		assert stats["total_cost"] == pytest.approx(expected)
+		assert graph.path_cost([graph.id_of(word) for word in path]) == pytest.approx(expected)
+
+@pytest.mark.parametrize("make_finder", UNWEIGHTED_FINDERS)
+def test_unweighted_finders_match_bfs(graph, pairs, make_finder):
+	finder = make_finder(graph)
+	for start, end in pairs:
+		depth = bfs(graph, graph.id_of(start))[0][graph.id_of(end)]
+		path, stats = finder.find_path(start, end)
+		if depth < 0:
+			assert path == []
+			continue
+		assert_ladder(graph, path, start, end)
+		assert len(path) - 1 == stats["path_length"] == depth
+
+@pytest.mark.parametrize("make_finder", WEIGHTED_FINDERS + UNWEIGHTED_FINDERS)
+def test_unknown_words_have_no_path(graph, make_finder):
+	finder = make_finder(graph)
+	assert finder.find_path("zzz", graph.words[0])[0] == []
+	assert finder.find_path(graph.words[0], "zzz")[0] == []
+
+def test_cost_models_match_dijkstra(graph, pairs):
+	for cost_model in ('uniform', 'challenge'):
+		reference = WordGraph(graph.words, graph.offsets, graph.neighbors, graph.costs_for(cost_model),
+							  dict(graph.metadata))
+		finders = [UCSPathFinder(graph, cost_model=cost_model), AStarPathFinder(graph, cost_model=cost_model),
+				   BidirectionalAStarPathFinder(graph, cost_model=cost_model)]
+		for start, end in pairs[:40]:
+			expected = plain_dijkstra(reference, reference.id_of(start)).get(reference.id_of(end))
+			for finder in finders:
+				path, stats = finder.find_path(start, end)
+				assert (path == []) == (expected is None)
+				if path:
+					assert stats["total_cost"] == pytest.approx(expected)
+	# Re-weighted costs are materialised once per model, and the graph's own cost model needs none
+	assert graph.costs_for('challenge') is graph.costs_for('challenge')
+	assert graph.costs_for('standard') is graph.costs
+	with pytest.raises(ValueError):
+		UCSPathFinder(graph, cost_model='unknown')
+
+def test_unknown_algorithm_is_rejected(graph):
+	with pytest.raises(ValueError):
+		create_path_finder('Dijkstra', graph)
+
+@pytest.mark.parametrize("make_frontier", [HeapQueue, lambda: IndexedHeap(64), lambda: BucketQueue(9)])
+def test_frontiers_pop_smallest_key_first(make_frontier):
+	# Keys within one maximum step of each other, as a bucket queue requires
+	rng = random.Random(5)
+	entries = {node: rng.randrange(10) for node in rng.sample(range(64), 40)}
+	frontier = make_frontier()
+	for node, key in entries.items():
+		frontier.push(node, key)
+	assert len(frontier) == len(entries)
+	popped = [frontier.pop() for _ in range(len(entries))]
+	assert [key for key, _ in popped] == sorted(entries.values())
+	assert {node: key for key, node in popped} == entries
+	assert not frontier
+
+def test_finders_report_one_set_of_stats(graph, pairs):
+	start, end = pairs[0]
+	for finder_class in PATH_FINDERS.values():
+		finder = finder_class(graph)
+		stats = finder.find_path(start, end)[1]
+		assert stats.keys() == finder_class.empty_stats().keys()
+		assert ("peak_frontier" in stats) == finder_class.reports_frontier
+
+def test_paths_are_rebuilt_from_parent_pointers(graph):
+	source = 0
+	depths, parents = bfs(graph, source)
+	for target in range(len(graph)):
+		if depths[target] < 0:
+			continue
+		path = graph.reconstruct_path(parents, target)
+		assert path[0] == source and path[-1] == target
+		assert len(path) - 1 == depths[target]
+		for node, next_node in zip(path, path[1:]):
+			assert next_node in graph.neighbor_ids(node)
+	# A dict of parents works as well as an array
+	assert graph.reconstruct_path({5: ROOT, 7: 5, 9: 7}, 9) == [5, 7, 9]
+
+def test_search_arrays_are_reused_cleanly(graph, pairs):
+	# Reused search arrays must not leak state from an earlier search
+	finder = UCSPathFinder(graph)
+	start, end = next((start, end) for start, end in pairs if start != end and graph.is_reachable(start, end))
+	first = finder.find_path(start, end)[0]
+	finder.find_path("xyz", graph.words[0])
+	assert finder.find_path(start, end)[0] == first
+
+def test_landmark_rows_are_dijkstra_distances(graph):
+	assert graph.landmarks
+	# Distinct landmarks, none wasted on components too small to need one
+	assert len(set(graph.landmarks)) == len(graph.landmarks)
+	for landmark in graph.landmarks:
+		assert graph.component_size(graph.word_of(landmark)) >= MIN_LANDMARK_COMPONENT
+	for landmark, row in zip(graph.landmarks, graph.landmark_distances):
+		distances = plain_dijkstra(graph, landmark)
+		for node in range(len(graph)):
+			assert row[node] == pytest.approx(distances.get(node, float('inf')))
+
+@pytest.mark.parametrize("heuristic", AStarPathFinder.HEURISTICS)
+def test_heuristics_are_admissible(graph, pairs, heuristic):
+	finder = AStarPathFinder(graph, heuristic=heuristic)
+	for start, end in pairs[:40]:
+		target = graph.id_of(end)
+		estimate = finder.heuristic_for(target)
+		distances = plain_dijkstra(graph, target)
+		for node in range(len(graph)):
+			assert estimate(node) <= distances.get(node, float('inf')) + 1e-9
+
+@pytest.mark.parametrize("cost_model", ['uniform', 'challenge'])
+def test_position_heuristic_is_admissible_under_other_cost_models(graph, pairs, cost_model):
+	reference = WordGraph(graph.words, graph.offsets, graph.neighbors, graph.costs_for(cost_model),
+						  dict(graph.metadata))
+	finder = AStarPathFinder(graph, heuristic='position', cost_model=cost_model)
+	for start, end in pairs[:20]:
+		estimate = finder.heuristic_for(graph.id_of(end))
+		distances = plain_dijkstra(reference, reference.id_of(end))
+		for node in range(len(graph)):
+			assert estimate(node) <= distances.get(node, float('inf')) + 1e-9
+
+def test_default_heuristic_uses_landmarks_that_hold(graph, words):
+	assert AStarPathFinder(graph).heuristic == 'alt'
+	# Landmark distances are for the graph's own costs
+	assert AStarPathFinder(graph, cost_model='challenge').heuristic == 'position'
+	assert AStarPathFinder(ladder_graph(words, landmark_count=0)).heuristic == 'position'
+	assert AStarPathFinder(graph, heuristic='hamming').heuristic == 'hamming'
+
+def test_alt_needs_landmarks_for_the_searched_costs(graph, words):
+	with pytest.raises(ValueError):
+		AStarPathFinder(ladder_graph(words, landmark_count=0), heuristic='alt')
+	with pytest.raises(ValueError):
+		AStarPathFinder(graph, heuristic='alt', cost_model='challenge')
+	with pytest.raises(ValueError):
+		AStarPathFinder(graph, heuristic='manhattan')
+
+def test_hamming_distance():
+	assert hamming_distance("cold", "cord") == 1
+	assert hamming_distance("cold", "warm") == 4
+	assert hamming_distance("cold", "cold") == 0
+
+# Bidirectional stopping rules
+
+def trap_graph():
+	"""
+	aaa -> daa -> ddd costs 1 + 100 and meets first; aaa -> baa -> bda ->
+	bdd -> ddd costs 4 x 5 = 20. A weighted search stopping at the first
+	meeting returns the dear ladder, one stopping on the frontier minima
+	the cheap one.
+	"""
+	edges = {("aaa", "daa"): 1, ("daa", "ddd"): 100, ("aaa", "baa"): 5,
+			 ("baa", "bda"): 5, ("bda", "bdd"): 5, ("bdd", "ddd"): 5}
+	graph = {}
+	for (word1, word2), cost in edges.items():
+		graph.setdefault(word1, {})[word2] = cost
+		graph.setdefault(word2, {})[word1] = cost
+	return WordGraph.from_graph_data({"words": sorted(graph), "graph": graph})
+
+@pytest.mark.parametrize("finder_class", [BidirectionalUCSPathFinder, BidirectionalAStarPathFinder])
+def test_bidirectional_search_does_not_stop_at_first_meeting(finder_class):
+	graph = trap_graph()
+	path, stats = finder_class(graph).find_path("aaa", "ddd")
+	assert path == ["aaa", "baa", "bda", "bdd", "ddd"]
+	assert stats["total_cost"] == 20
+	path, stats = finder_class(graph).find_path("ddd", "aaa")
+	assert stats["total_cost"] == 20
+
+def six_cycle():
+	"""Six words in a ring of unit-cost edges: two equally short ladders between opposite words"""
+	graph = {
+		"aaa": {"aab": 1, "baa": 1}, "aab": {"aaa": 1, "abb": 1}, "abb": {"aab": 1, "bbb": 1},
+		"baa": {"aaa": 1, "bba": 1}, "bba": {"baa": 1, "bbb": 1}, "bbb": {"abb": 1, "bba": 1}
+	}
+	return WordGraph.from_graph_data({"words": sorted(graph), "graph": graph})
+
+def test_bidirectional_bfs_meets_at_shortest_length():
+	# Pairs meet in the middle of an edge or at a node
+	graph = six_cycle()
+	finder = BidirectionalBFSPathFinder(graph)
+	for start in graph.words:
+		for end in graph.words:
+			path, stats = finder.find_path(start, end)
+			expected = bfs(graph, graph.id_of(start))[0][graph.id_of(end)]
+			assert len(path) - 1 == stats["path_length"] == expected
+			assert_ladder(graph, path, start, end)
+
+@pytest.mark.parametrize("finder_class", [
+	BidirectionalBFSPathFinder, BidirectionalUCSPathFinder, BidirectionalAStarPathFinder
+])
+def test_bidirectional_stops_on_exhausted_side(graph, finder_class):
+	finder = finder_class(graph)
+	assert finder.find_path("qqq", "qqq")[0] == ["qqq"]
+	assert finder.find_path("qqq", "qqr")[0] == ["qqq", "qqr"]
+	# The lone word's side runs dry straight away
+	path, stats = finder.find_path("xyz", graph.words[0])
+	assert path == []
+	assert stats["nodes_explored"] <= 2
+
+# Search tree cache
+
+@pytest.mark.parametrize("algorithm", ['BFS', 'UCS', 'A*', 'Bi-UCS'])
+def test_search_tree_cache_matches_finders(graph, pairs, algorithm):
+	cache = SearchTreeCache()
+	finder = create_path_finder(algorithm, graph)
+	for start, end in pairs[:20] * 2:
+		cached, cached_stats = cache.find_path(graph, algorithm, start, end)
+		path, stats = finder.find_path(start, end)
+		assert len(cached) == len(path)
+		if path:
+			assert cached_stats["total_cost"] == pytest.approx(stats["total_cost"])
+	assert cache.hits >= 20
+	assert cache.find_path(graph, algorithm, "zzz", graph.words[0])[0] == []
+
+def test_search_tree_cache_is_bounded(graph, pairs):
+	cache = SearchTreeCache(max_entries=3, max_results=5)
+	for start, end in pairs[:20]:
+		cache.find_path(graph, 'UCS', start, end)
+		cache.find_path(graph, 'A*', start, end)
+	assert len(cache._entries) <= 3 and len(cache._results) <= 5
+	# One finder per graph and algorithm, however many searches it ran
+	assert list(cache._finders) == [(graph, 'A*')]
+	cache.discard(graph)
+	assert len(cache) == 0 and not cache._finders
+
+# Batch queries
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_batch_query_keeps_input_order_and_totals(graph, pairs, tmp_path, processes):
+	path = str(tmp_path / "graph.bin")
+	write_binary_graph(graph, path)
+	query = BatchPathQuery(path, 'UCS', processes, chunk_size=7)
+	results = list(query.run(pairs))
+	assert [(start, end) for start, end, _, _ in results] == pairs
+	# Workers search the graph as loaded from the file
+	finder = UCSPathFinder(WordGraph.load(path))
+	for start, end, batch_path, stats in results:
+		assert batch_path == finder.find_path(start, end)[0]
+	solved = [stats for _, _, batch_path, stats in results if batch_path]
+	summary = query.summary
+	assert summary["queries"] == len(pairs)
+	assert summary["paths_found"] == len(solved)
+	assert summary["total_path_length"] == sum(stats["path_length"] for stats in solved)
+	assert summary["nodes_explored"] == sum(stats["nodes_explored"] for _, _, _, stats in results)
+	assert summary["execution_time"] == pytest.approx(sum(stats["execution_time"] for _, _, _, stats in results))
+	assert 0 < summary["wall_time"]
+	# A rerun starts the totals afresh
+	list(query.run(pairs[:3]))
+	assert query.summary["queries"] == 3
+
+# Bucket queue ties
+
+def test_bucket_queue_breaks_ties_first_in_first_out(graph, pairs):
+	# aab is queued before baa, so its ladder reaches bbb first and keeps it
+	finder = UCSPathFinder(six_cycle(), bucket_queue=True)
+	for _ in range(3):
+		assert finder.find_path("aaa", "bbb")[0] == ["aaa", "aab", "abb", "bbb"]
+		assert finder.find_path("bbb", "aaa")[0] == ["bbb", "abb", "aab", "aaa"]
+	# The same ladders every time, whatever ran before and on whichever finder
+	first = UCSPathFinder(graph, bucket_queue=True)
+	paths = [first.find_path(start, end)[0] for start, end in pairs]
+	second = UCSPathFinder(graph, bucket_queue=True)
+	assert [second.find_path(start, end)[0] for start, end in reversed(pairs)] == paths[::-1]
@@ -0,0 +1,158 @@
+import random
+import numpy as np
+import pytest
+from src.algorithms import create_path_finder
+from src.core.graph_format import binary_graph_path, write_binary_graph
+from src.core.graph_repository import GraphRepository
+from src.core.puzzle_index import DIFFICULTIES, MIN_LADDER_LENGTH, PuzzleIndex, puzzle_index_path
+from src.core.shortest_paths import ShortestPathTree, bfs, next_move
+from tests.conftest import ladder_graph, plain_dijkstra, truncations
+
+@pytest.fixture(scope="module")
+def puzzles(graph):
+	return PuzzleIndex.build(graph, source_count=16, pairs_per_bucket=64)
+
+# Puzzle index (WLPZ)
+
+def test_puzzle_pairs_are_connected_at_their_length(graph, puzzles):
+	assert len(puzzles)
+	for length, (starts, ends, costs) in puzzles.buckets.items():
+		assert length >= MIN_LADDER_LENGTH
+		assert len(starts) <= 64
+		assert list(costs) == sorted(costs)
+		for start, end, cost in zip(starts, ends, costs):
+			assert bfs(graph, start)[0][end] == length
+			assert cost == pytest.approx(plain_dijkstra(graph, start)[end], rel=1e-6)
+
+def test_puzzle_index_round_trip(graph, puzzles, tmp_path):
+	path = str(tmp_path / "puzzles.idx")
+	puzzles.save(path)
+	loaded = PuzzleIndex.load(path, graph)
+	assert loaded.diameter == puzzles.diameter == max(graph.component_diameters)
+	assert loaded.buckets.keys() == puzzles.buckets.keys()
+	for length, bucket in puzzles.buckets.items():
+		for values, expected in zip(loaded.buckets[length], bucket):
+			assert list(values) == list(expected)
+
+def test_puzzle_index_rejects_other_graphs(graph, words, puzzles, tmp_path):
+	path = str(tmp_path / "puzzles.idx")
+	puzzles.save(path)
+	for other in (words[1:], words[:-1] + ["qqs"]):
+		with pytest.raises(ValueError):
+			PuzzleIndex.load(path, ladder_graph(other, landmark_count=0))
+	# The repository samples afresh rather than load pairs drawn from another graph
+	write_binary_graph(graph, binary_graph_path(3, str(tmp_path)))
+	PuzzleIndex.build(ladder_graph(words[:-1] + ["qqs"])).save(puzzle_index_path(3, str(tmp_path)))
+	fresh = GraphRepository(str(tmp_path)).puzzle_index(3)
+	assert fresh.graph_crc == puzzles.graph_crc
+
+@pytest.mark.parametrize("keep", range(10))
+def test_truncated_puzzle_index_is_rejected(graph, puzzles, tmp_path, keep):
+	path = str(tmp_path / "puzzles.idx")
+	puzzles.save(path)
+	with open(path, 'rb') as f:
+		data = f.read()
+	with open(path, 'wb') as f:
+		f.write(data[:truncations(len(data))[keep]])
+	with pytest.raises(ValueError):
+		PuzzleIndex.load(path, graph)
+
+def test_every_laddered_component_gets_puzzles(graph, puzzles):
+	components = graph.components
+	covered = {components[start] for starts, _, _ in puzzles.buckets.values() for start in starts}
+	expected = {
+		component for component, diameter in enumerate(graph.component_diameters)
+		if diameter >= MIN_LADDER_LENGTH
+	}
+	assert covered == expected
+
+def test_difficulty_bands_split_lengths_up_to_the_diameter(puzzles):
+	bands = [puzzles.lengths_for(difficulty) for difficulty in DIFFICULTIES]
+	lengths = [length for band in bands for length in band]
+	# Bands run in order and together cover every indexed length
+	assert lengths == sorted(lengths)
+	assert set(lengths) == set(puzzles.buckets)
+	assert max(bands[-1]) == puzzles.max_length
+	assert puzzles.lengths_for(MIN_LADDER_LENGTH) == [MIN_LADDER_LENGTH]
+	assert puzzles.lengths_for(999) == []
+	with pytest.raises(ValueError):
+		puzzles.lengths_for('impossible')
+
+def test_random_puzzles_respect_difficulty_and_cost_tier(graph, puzzles):
+	rng = random.Random(3)
+	for difficulty in DIFFICULTIES:
+		lengths = puzzles.lengths_for(difficulty)
+		for puzzle in puzzles.sample(20, difficulty, rng=rng):
+			assert puzzle.length in lengths
+			assert bfs(graph, graph.id_of(puzzle.start))[0][graph.id_of(puzzle.end)] == puzzle.length
+	# Cost tiers split a bucket's cost-sorted pairs into thirds
+	costs = np.asarray(puzzles.buckets[MIN_LADDER_LENGTH][2])
+	cheap = puzzles.sample(50, MIN_LADDER_LENGTH, cost_tier=0, rng=rng)
+	dear = puzzles.sample(50, MIN_LADDER_LENGTH, cost_tier=2, rng=rng)
+	assert max(puzzle.cost for puzzle in cheap) <= costs[len(costs) // 3 - 1]
+	assert min(puzzle.cost for puzzle in dear) >= costs[2 * len(costs) // 3]
+
+def test_patched_puzzles_keep_unchanged_components(graph, puzzles):
+	# Carrying every component over keeps every pair, renumbered
+	identity = np.arange(len(graph))
+	carried = puzzles.carried_over(graph, identity, range(graph.metadata["component_count"]),
+								   source_count=16, pairs_per_bucket=64)
+	assert len(carried) == len(puzzles)
+	assert {
+		(length, start, end) for length, (starts, ends, _) in carried.buckets.items() for start, end in zip(starts, ends)
+	} == {
+		(length, start, end) for length, (starts, ends, _) in puzzles.buckets.items() for start, end in zip(starts, ends)
+	}
+
+# Hints and steps to go
+
+@pytest.fixture(scope="module")
+def target(graph):
+	return graph.words[len(graph) // 2]
+
+def test_tree_distances_match_bfs_and_dijkstra(graph, target):
+	root = graph.id_of(target)
+	hops = ShortestPathTree.build(graph, root, weighted=False)
+	costs = ShortestPathTree.build(graph, root, weighted=True)
+	depths = bfs(graph, root)[0]
+	distances = plain_dijkstra(graph, root)
+	for node in range(len(graph)):
+		assert hops.reaches(node) == (depths[node] >= 0) == costs.reaches(node)
+		if depths[node] >= 0:
+			assert hops.distances[node] == hops.distance(node) == depths[node]
+			assert costs.distance(node) == pytest.approx(distances[node])
+		else:
+			assert hops.distance(node) == costs.distance(node) == float('inf')
+
+@pytest.mark.parametrize("weighted", [False, True])
+def test_hints_walk_the_tree_to_its_root(graph, target, weighted):
+	tree = ShortestPathTree.build(graph, graph.id_of(target), weighted=weighted)
+	for node in range(len(graph)):
+		if not tree.reaches(node):
+			assert next_move(tree, graph.words[node]) is None
+			continue
+		word, steps, cost = graph.words[node], 0, 0.0
+		while word != target:
+			position, letter = next_move(tree, word)
+			next_word = word[:position] + letter + word[position + 1:]
+			cost += graph.edge_cost(word, next_word)
+			word, steps = next_word, steps + 1
+		if weighted:
+			assert cost == pytest.approx(tree.distance(node))
+		else:
+			assert steps == tree.distance(node)
+	assert next_move(tree, target) is None
+	assert next_move(tree, "zzz") is None
+
+@pytest.mark.parametrize("algorithm", ['A*', 'UCS', 'BFS', 'Bi-BFS'])
+def test_hints_follow_a_shortest_ladder(graph, puzzles, algorithm):
+	finder = create_path_finder(algorithm, graph)
+	for puzzle in puzzles.sample(15, 'hard', rng=random.Random(5)):
+		word, steps = puzzle.start, 0
+		while word != puzzle.end:
+			next_word = finder.get_next_step(word, puzzle.end)
+			assert graph.has_edge(word, next_word)
+			word, steps = next_word, steps + 1
+		if not finder.weighted:
+			assert steps == puzzle.length
+	assert finder.get_next_step("xyz", graph.words[0]) == "xyz"
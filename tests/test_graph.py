@@ -0,0 +1,489 @@
+import os
+from fnmatch import fnmatchcase
+import numpy as np
+import pytest
+from src.core.cost_model import ALPHABET, COST_MODELS, encode_letters, letter_transition_cost, position_cost
+from src.core.graph_format import GraphFormatError, binary_graph_path, read_binary_graph, write_binary_graph
+from src.core.graph_repository import GraphRepository
+from src.core.hop_table import HopTable, build_hop_table
+from src.core.puzzle_index import PuzzleIndex
+from src.core.implicit_graph import ImplicitWordGraph
+from src.core.shortest_paths import bfs
+from src.core.vector_bfs import VectorBFS
+from src.core.word_graph import UNVISITED, WordGraph
+from src.core.word_index import WordIndex, word_index_path
+from src.scripts import build_manifest, filter_words
+from src.scripts.build_manifest import is_stale, load_manifest, rebuild_stale, record_builds, save_manifest
+from src.scripts.filter_words import dictionary_path, partition_words
+from src.scripts.update_graph import _apply_delta
+from src.scripts.build_graph import calculate_edge_cost
+from tests.conftest import ladder_graph, plain_dijkstra, truncations
+
+def flip_last_byte(path):
+	with open(path, 'r+b') as f:
+		f.seek(-1, 2)
+		last = f.read(1)
+		f.seek(-1, 2)
+		f.write(bytes([last[0] ^ 0xFF]))
+
+# CSR word graph
+
+def test_csr_graph_matches_its_adjacency(graph):
+	graph_data = graph.to_graph_data()
+	for word, edges in graph_data["graph"].items():
+		node = graph.id_of(word)
+		assert graph.word_of(node) == word
+		assert graph.neighbor_words(word) == list(edges)
+		assert graph.degree(node) == len(edges)
+		for other, cost in edges.items():
+			# Every edge is stored from both ends at the same cost
+			assert graph.edge_cost(other, word) == pytest.approx(cost)
+	assert graph.edge_count == sum(map(len, graph_data["graph"].values())) // 2
+	assert graph.id_of("zzz") is None and "zzz" not in graph
+
+def test_search_lists_copy_the_csr_arrays(words):
+	graph = ladder_graph(words, landmark_count=0)
+	before = graph.nbytes
+	offsets, neighbors, costs = graph.search_lists()
+	assert (offsets, neighbors, costs) == (list(graph.offsets), list(graph.neighbors), list(graph.costs))
+	# Cached, and counted in the footprint
+	assert graph.search_lists()[1] is neighbors
+	assert graph.nbytes > before
+
+def test_components_agree_with_reachability(graph):
+	components = graph.components
+	for source in (0, graph.id_of("qqq"), graph.id_of("xyz")):
+		depths = bfs(graph, source)[0]
+		for node in range(len(graph)):
+			assert (components[node] == components[source]) == (depths[node] >= 0)
+	assert graph.is_reachable("qqq", "qqr")
+	assert not graph.is_reachable("qqq", "xyz")
+	assert not graph.is_reachable("qqq", "zzz")
+	assert graph.metadata["component_count"] == max(components) + 1
+
+# Binary graph (WLGR)
+
+def test_binary_graph_round_trip(graph, tmp_path):
+	path = str(tmp_path / "graph.bin")
+	write_binary_graph(graph, path)
+	loaded = read_binary_graph(path, verify=True)
+	assert list(loaded.words) == list(graph.words)
+	assert list(loaded.offsets) == list(graph.offsets)
+	assert list(loaded.neighbors) == list(graph.neighbors)
+	assert np.allclose(loaded.costs, graph.costs)
+	assert list(loaded.components) == list(graph.components)
+	assert list(loaded.edge_labels) == list(graph.edge_labels)
+	assert list(loaded.eccentricities) == list(graph.eccentricities)
+	assert list(loaded.component_diameters) == list(graph.component_diameters)
+	assert loaded.landmarks == graph.landmarks
+	for row, expected in zip(loaded.landmark_distances, graph.landmark_distances):
+		assert np.allclose(row, expected)
+	assert loaded.metadata == graph.metadata
+	assert loaded.id_of("xyz") == graph.id_of("xyz")
+	assert loaded.id_of("zzz") is None
+	loaded.close()
+
+@pytest.mark.parametrize("keep", range(10))
+def test_truncated_binary_graph_is_rejected(graph, tmp_path, keep):
+	path = str(tmp_path / "graph.bin")
+	write_binary_graph(graph, path)
+	with open(path, 'rb') as f:
+		data = f.read()
+	with open(path, 'wb') as f:
+		f.write(data[:truncations(len(data))[keep]])
+	with pytest.raises(GraphFormatError):
+		read_binary_graph(path)
+
+def test_corrupt_binary_graph_fails_verification(graph, tmp_path):
+	path = str(tmp_path / "graph.bin")
+	write_binary_graph(graph, path)
+	flip_last_byte(path)
+	with pytest.raises(GraphFormatError):
+		read_binary_graph(path, verify=True)
+
+def test_repository_verifies_only_on_request(graph, tmp_path):
+	path = binary_graph_path(3, str(tmp_path))
+	write_binary_graph(graph, path)
+	flip_last_byte(path)
+	# A plain get() maps the file without reading it all
+	assert list(GraphRepository(str(tmp_path)).get(3).words) == list(graph.words)
+	with pytest.raises(GraphFormatError):
+		GraphRepository(str(tmp_path), verify=True).get(3)
+
+def test_repository_evicts_least_recently_used_graphs(graph, tmp_path):
+	four_letters = ladder_graph(["cold", "cord", "card", "ward", "warm", "worm"], landmark_count=0)
+	for word_length, built in ((3, graph), (4, four_letters)):
+		write_binary_graph(built, binary_graph_path(word_length, str(tmp_path)))
+	sizes = GraphRepository(str(tmp_path))
+	sizes = {word_length: sizes.get(word_length).nbytes for word_length in (3, 4)}
+	# Room for either graph, not both
+	repository = GraphRepository(str(tmp_path), memory_budget=max(sizes.values()) + 1)
+	dropped = []
+	repository.add_drop_listener(dropped.append)
+	three = repository.get(3)
+	assert repository.get(3) is three and repository.loads == 1
+	four = repository.get(4)
+	assert 3 not in repository and 4 in repository
+	assert dropped == [three]
+	assert repository.memory_usage() <= repository.memory_budget
+	# Reloaded on the next request; the graph just used is never the one dropped
+	assert repository.get(3) is not three and repository.loads == 3
+	assert dropped == [three, four]
+	repository.invalidate()
+	assert 3 not in repository and len(dropped) == 3
+	with pytest.raises(FileNotFoundError):
+		repository.get(5)
+
+# Word index (WLIX)
+
+@pytest.fixture(scope="module")
+def index_words(words):
+	# Mixed lengths, so '*' has runs of different lengths to match
+	return sorted(set(words) | {"a", "ab", "abc", "abcd", "abcde", "bead", "faced", "cafe"})
+
+def test_word_index_round_trip(index_words, tmp_path):
+	path = str(tmp_path / "words.idx")
+	WordIndex.from_words(index_words + index_words[:5]).save(path)
+	index = WordIndex.load(path)
+	assert len(index) == len(index_words)
+	assert list(index) == index_words
+	for rank, word in enumerate(index_words):
+		assert index.get(word) == rank
+		assert word in index
+	assert index.get("zzzz") is None
+
+def test_word_index_is_tied_to_its_graph(graph, words, tmp_path):
+	path = str(tmp_path / "words.idx")
+	WordIndex.from_words(graph.words).save(path, graph)
+	assert list(WordIndex.load(path, graph)) == list(graph.words)
+	# As many words, but other ones: the graph CRC no longer matches
+	with pytest.raises(ValueError):
+		WordIndex.load(path, ladder_graph(words[:-1] + ["qqs"], landmark_count=0))
+	with pytest.raises(ValueError):
+		WordIndex.load(path, ladder_graph(words[1:], landmark_count=0))
+	# The repository rebuilds an index saved for another graph
+	write_binary_graph(graph, binary_graph_path(3, str(tmp_path)))
+	WordIndex.from_words(words[1:]).save(word_index_path(3, str(tmp_path)), ladder_graph(words[1:], landmark_count=0))
+	assert list(GraphRepository(str(tmp_path)).word_index(3)) == list(graph.words)
+
+@pytest.mark.parametrize("keep", range(10))
+def test_truncated_word_index_is_rejected(index_words, tmp_path, keep):
+	path = str(tmp_path / "words.idx")
+	WordIndex.from_words(index_words).save(path)
+	with open(path, 'rb') as f:
+		data = f.read()
+	with open(path, 'wb') as f:
+		f.write(data[:truncations(len(data))[keep]])
+	with pytest.raises(ValueError):
+		WordIndex.load(path)
+
+@pytest.mark.parametrize("prefix", ["", "a", "ab", "abc", "abcde", "abcdef", "fa", "q", "z"])
+def test_with_prefix_matches_startswith(index_words, prefix):
+	index = WordIndex.from_words(index_words)
+	expected = [word for word in index_words if word.startswith(prefix)]
+	assert index.with_prefix(prefix) == expected
+	assert index.count_prefix(prefix) == len(expected)
+	assert index.with_prefix(prefix, limit=2) == expected[:2]
+
+@pytest.mark.parametrize("pattern", [
+	"*", "?", "???", "a*", "*a", "a?c", "?b?", "*c*", "a*e", "**d", "*?*?", "abc", "ab*cd*", "q??", "?????", "z*", ""
+])
+def test_match_agrees_with_fnmatch(index_words, pattern):
+	index = WordIndex.from_words(index_words)
+	assert index.match(pattern) == [word for word in index_words if fnmatchcase(word, pattern)]
+
+# Hop table (WLHT)
+
+def bfs_depths(graph, source):
+	return np.frombuffer(bfs(graph, source)[0], dtype=np.int32)
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_hop_table_matches_bfs(graph, tmp_path, processes):
+	table = build_hop_table(graph, str(tmp_path / "hops.bin"), processes=processes, batch_size=16)
+	for source in range(len(graph)):
+		depths = bfs_depths(graph, source)
+		for target in range(len(graph)):
+			expected = None if depths[target] < 0 else int(depths[target])
+			assert table.distance(source, target) == expected
+	assert table.hops(graph, "qqq", "qqr") == 1
+	assert table.hops(graph, "qqq", "xyz") is None
+	table.close()
+
+def test_hop_table_round_trip(graph, tmp_path):
+	path = str(tmp_path / "hops.bin")
+	built = build_hop_table(graph, path, processes=1)
+	loaded = HopTable.load(path, graph)
+	assert loaded.graph_crc == built.graph_crc
+	assert bytes(loaded.matrix) == bytes(built.matrix)
+	assert list(loaded.components) == list(graph.components)
+	built.close()
+	loaded.close()
+
+def test_hop_table_rejects_another_graph(graph, words, tmp_path):
+	path = str(tmp_path / "hops.bin")
+	build_hop_table(graph, path, processes=1).close()
+	# Same word count, one edge fewer
+	other = ladder_graph([word for word in words if word != "qqr"] + ["qzz"], landmark_count=0)
+	with pytest.raises(ValueError):
+		HopTable.load(path, other)
+	table = HopTable.load(path)
+	with pytest.raises(ValueError):
+		table.hops(other, "qqq", "qzz")
+	table.close()
+
+@pytest.mark.parametrize("keep", range(10))
+def test_truncated_hop_table_is_rejected(graph, tmp_path, keep):
+	path = str(tmp_path / "hops.bin")
+	build_hop_table(graph, path, processes=1).close()
+	with open(path, 'rb') as f:
+		data = f.read()
+	with open(path, 'wb') as f:
+		f.write(data[:truncations(len(data))[keep]])
+	with pytest.raises(ValueError):
+		HopTable.load(path, graph)
+
+# Word lists
+
+def test_partition_words_normalizes_and_deduplicates(tmp_path):
+	source = tmp_path / "words.txt"
+	source.write_text("Cold\nwarm\n  cold \nca-t\ncord\nnaïve\n\nOX\nword\nx1y\n", encoding='utf-8')
+	counts = partition_words(str(source), output_dir=str(tmp_path))
+	assert counts == {2: 1, 4: 4}
+	assert open(dictionary_path(4, str(tmp_path))).read() == "cold\ncord\nwarm\nword\n"
+	assert open(dictionary_path(2, str(tmp_path))).read() == "ox\n"
+	# Only the lengths asked for
+	assert partition_words(str(source), [2, 7], str(tmp_path / "two")) == {2: 1}
+	assert sorted(p.name for p in (tmp_path / "two").iterdir()) == ["2_letter.txt"]
+
+def test_partition_words_cleans_up_when_interrupted(tmp_path, monkeypatch):
+	source = tmp_path / "words.txt"
+	source.write_text("cold\nox\nwarm\nboom\nword\n", encoding='utf-8')
+	normalize_word = filter_words.normalize_word
+	def failing(line):
+		if line.strip() == "boom":
+			raise KeyboardInterrupt
+		return normalize_word(line)
+	monkeypatch.setattr(filter_words, "normalize_word", failing)
+	with pytest.raises(KeyboardInterrupt):
+		partition_words(str(source), output_dir=str(tmp_path / "out"))
+	# Neither partial dictionaries nor temporary files are left behind
+	assert list((tmp_path / "out").iterdir()) == []
+
+# Build manifest
+
+@pytest.fixture
+def built(words, tmp_path, monkeypatch):
+	"""A 3-letter graph built and recorded in a scratch data/ tree; yields its graph file"""
+	monkeypatch.chdir(tmp_path)
+	os.makedirs(os.path.dirname(dictionary_path(3)))
+	with open(dictionary_path(3), 'w', encoding='utf-8') as f:
+		f.write("\n".join(words) + "\n")
+	assert rebuild_stale([3], processes=1, cost_resolution=100)[3]["cost_resolution"] == 100
+	assert not is_stale(3)
+	return binary_graph_path(3)
+
+def test_manifest_flags_damaged_graphs(built):
+	with open(built, 'rb') as f:
+		data = f.read()
+	for damaged in (b"", data[:-1], data[:-1] + bytes([data[-1] ^ 0xFF])):
+		with open(built, 'wb') as f:
+			f.write(damaged)
+		assert is_stale(3)
+	os.remove(built)
+	assert is_stale(3)
+
+def test_manifest_flags_changed_inputs(built, monkeypatch):
+	manifest = load_manifest()
+	manifest[3]["graph_bytes"] += 1
+	save_manifest(manifest)
+	assert is_stale(3)
+	manifest[3]["graph_bytes"] -= 1
+	save_manifest(manifest)
+	assert not is_stale(3)
+	with monkeypatch.context() as patch:
+		patch.setattr(build_manifest, "COST_MODEL_VERSION", build_manifest.COST_MODEL_VERSION + 1)
+		assert is_stale(3)
+	assert not is_stale(3)
+	with open(dictionary_path(3), 'a', encoding='utf-8') as f:
+		f.write("abc\n")
+	assert is_stale(3)
+	# Lengths never built, or recorded as failed, are stale too
+	assert is_stale(4)
+	record_builds({3: None})
+	assert is_stale(3) and 3 not in load_manifest()
+
+def test_stale_rebuild_keeps_cost_resolution(built):
+	assert rebuild_stale([3], processes=1) == {}
+	with open(dictionary_path(3), 'a', encoding='utf-8') as f:
+		f.write("abc\n")
+	metadata = rebuild_stale([3], processes=1)[3]
+	assert metadata["cost_resolution"] == 100
+	assert load_manifest()[3]["cost_resolution"] == 100
+	assert not is_stale(3)
+	# An explicit resolution overrides the recorded one
+	with open(dictionary_path(3), 'a', encoding='utf-8') as f:
+		f.write("abd\n")
+	assert rebuild_stale([3], processes=1, cost_resolution=10)[3]["cost_resolution"] == 10
+	assert load_manifest()[3]["cost_resolution"] == 10
+
+# Incremental updates
+
+def deltas(graph):
+	"""
+	(name, added, removed) word deltas: a word added, a landmark removed,
+	and two words added that bridge the largest component to the two-word one
+	"""
+	word = graph.words[0]
+	absent = next(other for other in (a + b + c for a in "abcdefg" for b in "abcdefg" for c in "abcdefg")
+				  if other not in graph)
+	return [
+		("add", [absent], []),
+		("remove", [], [graph.word_of(graph.landmarks[0])]),
+		("merge", ["q" + word[1:], "qq" + word[2]], [])
+	]
+
+@pytest.mark.parametrize("delta", range(3))
+def test_word_delta_matches_a_full_rebuild(graph, tmp_path, delta):
+	_, added, removed = deltas(graph)[delta]
+	updated, remap, unchanged = _apply_delta(graph, added, removed, calculate_edge_cost)
+	rebuilt = ladder_graph(sorted(set(graph.words) - set(removed) | set(added)))
+	assert list(updated.words) == list(rebuilt.words)
+	assert updated.metadata["edge_count"] == rebuilt.edge_count
+	for word in rebuilt.words:
+		edges = {other: updated.edge_cost(word, other) for other in updated.neighbor_words(word)}
+		assert edges == pytest.approx({other: rebuilt.edge_cost(word, other) for other in rebuilt.neighbor_words(word)})
+	assert list(updated.components) == list(rebuilt.components)
+	assert updated.metadata["component_count"] == rebuilt.metadata["component_count"]
+	assert list(updated.eccentricities) == list(rebuilt.eccentricities)
+	assert list(updated.component_diameters) == list(rebuilt.component_diameters)
+	if delta != 1:
+		# Only the component the words joined is searched again
+		assert len(unchanged) == rebuilt.metadata["component_count"] - 1
+	if delta == 2:
+		assert rebuilt.metadata["component_count"] == graph.metadata["component_count"] - 1
+	# Carried over or searched again, every landmark row is exact
+	assert updated.landmarks
+	for landmark, row in zip(updated.landmarks, updated.landmark_distances):
+		distances = plain_dijkstra(rebuilt, landmark)
+		for node in range(len(rebuilt)):
+			assert row[node] == pytest.approx(distances.get(node, float('inf')))
+
+	old_hops = build_hop_table(graph, str(tmp_path / "old.bin"), 1)
+	hops = build_hop_table(updated, str(tmp_path / "new.bin"), 1, reuse=(old_hops, unchanged))
+	for source in range(0, len(rebuilt), 7):
+		depths = bfs(rebuilt, source)[0]
+		for target in range(len(rebuilt)):
+			assert hops.distance(source, target) == (depths[target] if depths[target] >= 0 else None)
+	hops.close()
+	old_hops.close()
+
+	puzzles = PuzzleIndex.build(graph).carried_over(updated, remap, unchanged)
+	assert puzzles.diameter == max(rebuilt.component_diameters)
+	covered, searches = set(), {}
+	for length, (starts, ends, costs) in puzzles.buckets.items():
+		for start, end, cost in zip(starts, ends, costs):
+			if start not in searches:
+				searches[start] = bfs(rebuilt, start)[0], plain_dijkstra(rebuilt, start)
+			depths, distances = searches[start]
+			assert depths[end] == length
+			assert cost == pytest.approx(distances[end], rel=1e-6)
+			covered.add(rebuilt.components[start])
+	assert covered == {component for component, diameter in enumerate(rebuilt.component_diameters) if diameter >= 2}
+
+# Edge costs
+
+@pytest.mark.parametrize("name", sorted(COST_MODELS))
+def test_vectorized_edge_costs_match_edge_cost(name):
+	model = COST_MODELS[name]
+	word_length = 5
+	positions, from_letters, to_letters = (values.ravel() for values in np.meshgrid(
+		np.arange(word_length), np.arange(len(ALPHABET)), np.arange(len(ALPHABET)), indexing='ij'))
+	costs = model.edge_costs(word_length, positions, from_letters, to_letters)
+	for position, old, new, cost in zip(positions, from_letters, to_letters, costs):
+		if old == new:
+			continue
+		word1 = "a" * position + ALPHABET[old] + "a" * (word_length - position - 1)
+		word2 = "a" * position + ALPHABET[new] + "a" * (word_length - position - 1)
+		assert cost == pytest.approx(model.edge_cost(word1, word2))
+		assert cost == pytest.approx(model.edge_cost(word1, word2, position))
+	assert list(encode_letters(["abz", "zya"]).ravel()) == [0, 1, 25, 25, 24, 0]
+
+def test_standard_costs_follow_the_letter_and_position_terms(graph):
+	for word in graph.words[:20]:
+		for other in graph.neighbor_words(word):
+			position = next(i for i, (a, b) in enumerate(zip(word, other)) if a != b)
+			expected = position_cost(3, position) + letter_transition_cost(word[position], other[position])
+			assert graph.edge_cost(word, other) == pytest.approx(expected)
+
+# Implicit graph
+
+def test_implicit_graph_matches_csr_graph(graph, words):
+	implicit = ImplicitWordGraph(words)
+	assert list(implicit.words) == list(graph.words)
+	assert list(implicit.offsets) == list(graph.offsets)
+	for node in range(len(graph)):
+		assert sorted(implicit.neighbor_ids(node)) == sorted(graph.neighbor_ids(node))
+		assert sorted(implicit.edges(node)) == pytest.approx(sorted(graph.edges(node)))
+	assert list(implicit.components) == list(graph.components)
+
+def test_implicit_graph_holds_long_words():
+	# Pattern keys are the words' own bytes, so no length overflows them
+	words = ["abcdefghijklmno", "abcdefghijklmnz", "zbcdefghijklmnz", "abcdefghijklmnp", "qqqqqqqqqqqqqqq"]
+	implicit = ImplicitWordGraph(words)
+	explicit = ladder_graph(words, landmark_count=0)
+	for word in explicit.words:
+		assert sorted(implicit.neighbor_words(word)) == sorted(explicit.neighbor_words(word))
+	assert implicit.edge_count == explicit.edge_count == 4
+	assert len(ImplicitWordGraph([])) == 0
+
+def test_load_indexes_word_lists(words, tmp_path):
+	path = tmp_path / "3_letter.txt"
+	path.write_text("\n".join(reversed(words)) + "\n")
+	loaded = WordGraph.load(str(path))
+	assert isinstance(loaded, ImplicitWordGraph)
+	assert list(loaded.words) == words
+
+# Vectorized BFS
+
+def test_vector_bfs_matches_bfs(graph):
+	engine = VectorBFS(graph)
+	for source in range(len(graph)):
+		depths, parents = engine.single_source(source)
+		expected = bfs_depths(graph, source)
+		assert depths.tolist() == expected.tolist()
+		# Every parent is a neighbour one level up
+		for node in np.flatnonzero(depths > 0).tolist():
+			parent = int(parents[node])
+			assert depths[parent] == depths[node] - 1
+			assert node in list(graph.neighbor_ids(parent))
+		assert (parents[depths < 0] == UNVISITED).all()
+
+def test_vector_bfs_single_pair_and_limits(graph, pairs):
+	engine = VectorBFS(graph)
+	for start, end in pairs:
+		source, target = graph.id_of(start), graph.id_of(end)
+		path, _ = engine.single_pair(source, target)
+		depth = bfs_depths(graph, source)[target]
+		if depth < 0:
+			assert path is None
+		else:
+			assert len(path) - 1 == depth
+			assert path[0] == source and path[-1] == target
+		limited, _ = engine.single_source(source, max_depth=2)
+		full = bfs_depths(graph, source)
+		assert limited.tolist() == np.where(full <= 2, full, -1).tolist()
+
+def test_vector_bfs_multi_source(graph):
+	engine = VectorBFS(graph)
+	sources = [0, graph.id_of("qqq"), len(graph) // 2]
+	depths, _ = engine.multi_source(sources)
+	# Depth to the nearest source, -1 where none reaches
+	single = np.array([bfs_depths(graph, source) for source in sources], dtype=np.int64)
+	nearest = np.where(single < 0, len(graph), single).min(axis=0)
+	assert depths.tolist() == np.where(nearest == len(graph), -1, nearest).tolist()
+	assert engine.reachable([graph.id_of("xyz")]).sum() == 1
+
+def test_vector_bfs_over_an_implicit_graph(graph, words):
+	engine = VectorBFS(ImplicitWordGraph(words))
+	for source in (0, graph.id_of("qqq"), len(graph) // 2):
+		assert engine.single_source(source)[0].tolist() == bfs_depths(graph, source).tolist()